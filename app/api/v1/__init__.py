@@ -6,6 +6,9 @@ from .manager_projects import router as manager_projects_router
 from .manager_tasks import router as manager_tasks_router
 from .manager_users import router as manager_users_router
 from .manager_reports import router as manager_reports_router
+from .manager_dashboard import router as manager_dashboard_router
+from .search import router as search_router
+from .monitoring import router as monitoring_router
 
 
 routers = [
@@ -16,5 +19,8 @@ routers = [
     manager_users_router,
     manager_projects_router,
     manager_tasks_router,
-    manager_reports_router
+    manager_reports_router,
+    manager_dashboard_router,
+    search_router,
+    monitoring_router
 ]
\ No newline at end of file
@@ -28,6 +28,10 @@ router = APIRouter(
         401: {
             "model": ErrorResponse,
             "description": "Неверный логин или пароль"
+        },
+        503: {
+            "model": ErrorResponse,
+            "description": "Очередь проверки паролей переполнена"
         }
     }
 )
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends
+from app.core.security import Security
+
+# Сервисы
+from app.domains.manager.dashboard.services import ManagerDashboardService
+
+# Схемы
+from app.base.schemas import ErrorResponse
+from app.domains.users.schemas import UserDB
+from app.domains.manager.dashboard.schemas import DashboardResponse
+
+router = APIRouter(
+    prefix="/manager/dashboard",
+    tags=["Сводка менеджера"]
+)
+
+
+@router.get(
+    path="",
+    summary="Сводка по задачам, проектам и исполнителям",
+    responses={
+        200: {
+            "model": DashboardResponse,
+            "description": "Сводка получена успешно"
+        },
+        401: {
+            "model": ErrorResponse,
+            "description": "Токен авторизации неверен или истек"
+        },
+        403: {
+            "model": ErrorResponse,
+            "description": "Пользователь не является менеджером"
+        }
+    }
+)
+async def get_dashboard(
+    current_user: UserDB = Depends(Security.get_current_user)
+) -> DashboardResponse:
+    """
+    Число задач по статусам и приоритетам, просроченные задачи, прогресс проектов
+    и незавершенные задачи исполнителей. Данные кэшируются на DASHBOARD_CACHE_TTL секунд
+    """
+    return await ManagerDashboardService.get_dashboard(current_user)
@@ -1,17 +1,20 @@
-from fastapi import APIRouter, Depends, status
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, status
 from app.core.security import Security
 
 # Сервисы
 from app.domains.manager.projects.services import ManagerProjectService
 
 # Схемы
-from app.base.schemas import MessageResponse, ErrorResponse
+from app.base.schemas import MessageResponse, ErrorResponse, Page, UserIdsRequest, BulkResponse, BULK_MAX_ITEMS
 from app.domains.users.schemas import UserDB, UserResponse
 from app.domains.tasks.schemas import TaskResponse
 from app.domains.projects.schemas import (
-    ProjectResponse,
+    ProjectProgressResponse,
     ProjectCreate,
-    ProjectUpdate
+    ProjectUpdate,
+    ProjectListParams
 )
 
 router = APIRouter(
@@ -25,9 +28,13 @@ router = APIRouter(
     summary="Получение списка проектов",
     responses={
         200: {
-            "model": list[ProjectResponse],
+            "model": Page[ProjectProgressResponse],
             "description": "Список проектов получен успешно"
         },
+        400: {
+            "model": ErrorResponse,
+            "description": "Некорректный курсор"
+        },
         401: {
             "model": ErrorResponse,
             "description": "Токен авторизации неверен или истек"
@@ -39,10 +46,11 @@ router = APIRouter(
     }
 )
 async def get_projects(
+        params: Annotated[ProjectListParams, Query()],
         current_user: UserDB = Depends(Security.get_current_user)
-):
-    """Получение списка всех проектов"""
-    return await ManagerProjectService.get_projects(current_user)
+) -> Page[ProjectProgressResponse]:
+    """Получение списка проектов с фильтрами, сортировкой и постраничным выводом по курсору"""
+    return await ManagerProjectService.get_projects(params, current_user)
 
 
 @router.get(
@@ -50,7 +58,7 @@ async def get_projects(
     summary="Получение проекта",
     responses={
         200: {
-            "model": ProjectResponse,
+            "model": ProjectProgressResponse,
             "description": "Проект получен успешно"
         },
         401: {
@@ -70,7 +78,7 @@ async def get_projects(
 async def get_project(
         project_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> ProjectProgressResponse:
     """Получение проекта по ID"""
     return await ManagerProjectService.get_project(project_id, current_user)
 
@@ -97,7 +105,7 @@ async def get_project(
 async def create_project(
         project_data: ProjectCreate,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> MessageResponse:
     """Создание нового проекта"""
     return await ManagerProjectService.create_project(project_data, current_user)
 
@@ -128,7 +136,7 @@ async def update_project(
         project_id: int,
         project_data: ProjectUpdate,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> MessageResponse:
     """Обновление информации о проекте"""
     return await ManagerProjectService.update_project(project_id, project_data, current_user)
 
@@ -158,7 +166,7 @@ async def update_project(
 async def delete_project(
         project_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> MessageResponse:
     """Удаление проекта"""
     return await ManagerProjectService.delete_project(project_id, current_user)
 
@@ -189,7 +197,7 @@ async def delete_project(
 async def get_project_members(
         project_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> list[UserResponse]:
     """Получение списка сотрудников на проекте"""
     return await ManagerProjectService.get_project_members(project_id, current_user)
 
@@ -221,7 +229,7 @@ async def add_project_member(
         project_id: int,
         user_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> MessageResponse:
     """Назначение сотрудника на проект"""
     return await ManagerProjectService.add_project_member(project_id, user_id, current_user)
 
@@ -252,7 +260,7 @@ async def remove_project_member(
         project_id: int,
         user_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> MessageResponse:
     """Удаление сотрудника с проекта"""
     return await ManagerProjectService.remove_project_member(project_id, user_id, current_user)
 
@@ -282,6 +290,67 @@ async def remove_project_member(
 async def get_project_tasks(
         project_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> list[TaskResponse]:
     """Получение списка задач на проекте"""
-    return await ManagerProjectService.get_project_tasks(project_id, current_user)
\ No newline at end of file
+    return await ManagerProjectService.get_project_tasks(project_id, current_user)
+
+@router.post(
+    path="/{project_id}/members/bulk",
+    summary="Массовое добавление сотрудников в проект",
+    responses={
+        200: {
+            "model": BulkResponse,
+            "description": "Сотрудники добавлены в проект"
+        },
+        401: {
+            "model": ErrorResponse,
+            "description": "Токен авторизации неверен или истек"
+        },
+        403: {
+            "model": ErrorResponse,
+            "description": "Пользователь не является менеджером"
+        },
+        404: {
+            "model": ErrorResponse,
+            "description": "Проект или сотрудники не найдены"
+        }
+    }
+)
+async def add_project_members(
+    project_id: int,
+    data: UserIdsRequest,
+    current_user: UserDB = Depends(Security.get_current_user)
+) -> BulkResponse:
+    """Массовое добавление сотрудников в проект: уже состоящие в проекте пользователи возвращаются в skipped"""
+    return await ManagerProjectService.add_project_members(project_id, data, current_user)
+
+
+@router.delete(
+    path="/{project_id}/members",
+    summary="Массовое удаление сотрудников из проекта",
+    responses={
+        200: {
+            "model": BulkResponse,
+            "description": "Сотрудники удалены из проекта"
+        },
+        401: {
+            "model": ErrorResponse,
+            "description": "Токен авторизации неверен или истек"
+        },
+        403: {
+            "model": ErrorResponse,
+            "description": "Пользователь не является менеджером"
+        },
+        404: {
+            "model": ErrorResponse,
+            "description": "Проект или сотрудники не найдены"
+        }
+    }
+)
+async def remove_project_members(
+    project_id: int,
+    user_ids: Annotated[list[int], Query(min_length=1, max_length=BULK_MAX_ITEMS)],
+    current_user: UserDB = Depends(Security.get_current_user)
+) -> BulkResponse:
+    """Массовое удаление сотрудников из проекта: не состоящие в проекте пользователи возвращаются в skipped"""
+    return await ManagerProjectService.remove_project_members(project_id, user_ids, current_user)
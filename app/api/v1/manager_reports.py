@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Request, status
 from app.core.security import Security
 
 # Сервисы
@@ -7,6 +9,7 @@ from app.domains.manager.reports.services import ReportsService
 # Схемы
 from app.base.schemas import ErrorResponse
 from app.domains.users.schemas import UserDB
+from app.domains.manager.reports.schemas import ReportJob, ReportJobCreate, ReportExportParams
 
 router = APIRouter(
     prefix="/manager/reports",
@@ -22,6 +25,9 @@ router = APIRouter(
             "model": None,
             "description": "Отчёт скачан успешно",
         },
+        304: {
+            "description": "Данные не изменились с версии отчёта из If-None-Match"
+        },
         401: {
             "model": ErrorResponse,
             "description": "Токен авторизации неверен или истек"
@@ -38,10 +44,11 @@ router = APIRouter(
 )
 async def create_report_by_task(
         task_id: int,
+        request: Request,
         current_user: UserDB = Depends(Security.get_current_user),
 ):
     """Создание отчёта по задаче"""
-    return await ReportsService.create_report_by_task(task_id, current_user)
+    return await ReportsService.create_report_by_task(task_id, request, current_user)
 
 
 @router.get(
@@ -52,6 +59,9 @@ async def create_report_by_task(
             "model": None,
             "description": "Отчёт скачан успешно",
         },
+        304: {
+            "description": "Данные не изменились с версии отчёта из If-None-Match"
+        },
         401: {
             "model": ErrorResponse,
             "description": "Токен авторизации неверен или истек"
@@ -68,10 +78,11 @@ async def create_report_by_task(
 )
 async def create_report_by_project(
         project_id: int,
+        request: Request,
         current_user: UserDB = Depends(Security.get_current_user),
 ):
     """Создание отчёта по проекту"""
-    return await ReportsService.create_report_by_project(project_id, current_user)
+    return await ReportsService.create_report_by_project(project_id, request, current_user)
 
 
 @router.get(
@@ -82,6 +93,9 @@ async def create_report_by_project(
             "model": None,
             "description": "Отчёт скачан успешно",
         },
+        304: {
+            "description": "Данные не изменились с версии отчёта из If-None-Match"
+        },
         401: {
             "model": ErrorResponse,
             "description": "Токен авторизации неверен или истек"
@@ -98,7 +112,133 @@ async def create_report_by_project(
 )
 async def create_report_by_user(
         user_id: int,
+        request: Request,
         current_user: UserDB = Depends(Security.get_current_user),
 ):
     """Создание отчёта по пользователю"""
-    return await ReportsService.create_report_by_user(user_id, current_user)
+    return await ReportsService.create_report_by_user(user_id, request, current_user)
+
+
+@router.post(
+    path="/jobs",
+    summary="Постановка отчёта в очередь",
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        202: {
+            "model": ReportJob,
+            "description": "Задание создано, либо найдено задание на тот же отчёт по тем же данным"
+        },
+        401: {
+            "model": ErrorResponse,
+            "description": "Токен авторизации неверен или истек"
+        },
+        403: {
+            "model": ErrorResponse,
+            "description": "Пользователь не является менеджером"
+        },
+        404: {
+            "model": ErrorResponse,
+            "description": "Задача, пользователь или проект не найден"
+        },
+    }
+)
+async def create_report_job(
+        job_data: ReportJobCreate,
+        current_user: UserDB = Depends(Security.get_current_user),
+) -> ReportJob:
+    """Фоновое формирование отчёта: состояние задания проверяется по его ID, готовый файл скачивается отдельно"""
+    return await ReportsService.create_report_job(job_data, current_user)
+
+
+@router.get(
+    path="/jobs/{job_id}",
+    summary="Состояние задания на отчёт",
+    responses={
+        200: {
+            "model": ReportJob,
+            "description": "Состояние задания получено успешно"
+        },
+        401: {
+            "model": ErrorResponse,
+            "description": "Токен авторизации неверен или истек"
+        },
+        403: {
+            "model": ErrorResponse,
+            "description": "Пользователь не является менеджером"
+        },
+        404: {
+            "model": ErrorResponse,
+            "description": "Задание не найдено или срок хранения отчёта истек"
+        },
+    }
+)
+async def get_report_job(
+        job_id: str,
+        current_user: UserDB = Depends(Security.get_current_user),
+) -> ReportJob:
+    """Состояние задания на отчёт"""
+    return await ReportsService.get_report_job(job_id, current_user)
+
+
+@router.get(
+    path="/jobs/{job_id}/file",
+    summary="Скачивание готового отчёта",
+    responses={
+        200: {
+            "model": None,
+            "description": "Отчёт скачан успешно",
+        },
+        401: {
+            "model": ErrorResponse,
+            "description": "Токен авторизации неверен или истек"
+        },
+        403: {
+            "model": ErrorResponse,
+            "description": "Пользователь не является менеджером"
+        },
+        404: {
+            "model": ErrorResponse,
+            "description": "Задание не найдено или срок хранения отчёта истек"
+        },
+        409: {
+            "model": ErrorResponse,
+            "description": "Отчёт ещё формируется или не сформирован"
+        },
+    }
+)
+async def download_report_job(
+        job_id: str,
+        current_user: UserDB = Depends(Security.get_current_user),
+):
+    """Скачивание отчёта, сформированного в фоне"""
+    return await ReportsService.download_report_job(job_id, current_user)
+
+
+@router.get(
+    path="/export",
+    summary="Массовая выгрузка отчётов",
+    responses={
+        200: {
+            "model": None,
+            "description": "Выгрузка скачана успешно",
+        },
+        401: {
+            "model": ErrorResponse,
+            "description": "Токен авторизации неверен или истек"
+        },
+        403: {
+            "model": ErrorResponse,
+            "description": "Пользователь не является менеджером"
+        },
+        404: {
+            "model": ErrorResponse,
+            "description": "Статус проекта не найден"
+        },
+    }
+)
+async def export_reports(
+        params: Annotated[ReportExportParams, Query()],
+        current_user: UserDB = Depends(Security.get_current_user),
+):
+    """Отчёты по всем проектам (или проектам со статусом) либо по всем пользователям: ZIP архив или одна книга"""
+    return await ReportsService.export_reports(params, current_user)
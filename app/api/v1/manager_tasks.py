@@ -1,16 +1,20 @@
-from fastapi import APIRouter, Depends, status
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, UploadFile, status
 from app.core.security import Security
 
 # Сервисы
 from app.domains.manager.tasks.services import ManagerTaskService
 
 # Схемы
-from app.base.schemas import MessageResponse, ErrorResponse
+from app.base.schemas import MessageResponse, ErrorResponse, Page, UserIdsRequest, BulkResponse, BULK_MAX_ITEMS
 from app.domains.users.schemas import UserDB, UserResponse
 from app.domains.tasks.schemas import (
     TaskResponseWithProject,
     TaskCreate,
-    TaskUpdate
+    TaskUpdate,
+    TaskListParams,
+    TaskImportResult
 )
 
 router = APIRouter(
@@ -23,9 +27,13 @@ router = APIRouter(
     summary="Получение списка задач",
     responses={
         200: {
-            "model": list[TaskResponseWithProject],
+            "model": Page[TaskResponseWithProject],
             "description": "Список задач получен успешно"
         },
+        400: {
+            "model": ErrorResponse,
+            "description": "Некорректный курсор"
+        },
         401: {
             "model": ErrorResponse,
             "description": "Токен авторизации неверен или истек"
@@ -37,10 +45,11 @@ router = APIRouter(
     }
 )
 async def get_tasks(
+    params: Annotated[TaskListParams, Query()],
     current_user: UserDB = Depends(Security.get_current_user)
-):
-    """Получение списка всех задач"""
-    return await ManagerTaskService.get_tasks(current_user)
+) -> Page[TaskResponseWithProject]:
+    """Получение списка задач с фильтрами, сортировкой и постраничным выводом по курсору"""
+    return await ManagerTaskService.get_tasks(params, current_user)
 
 
 @router.get(
@@ -68,7 +77,7 @@ async def get_tasks(
 async def get_task(
     task_id: int,
     current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> TaskResponseWithProject:
     """Получение задачи по ID"""
     return await ManagerTaskService.get_task(task_id, current_user)
 
@@ -95,11 +104,50 @@ async def get_task(
 async def create_task(
     task_data: TaskCreate,
     current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> MessageResponse:
     """Создание новой задачи"""
     return await ManagerTaskService.create_task(task_data, current_user)
 
 
+@router.post(
+    path="/import",
+    summary="Импорт задач из файла",
+    responses={
+        200: {
+            "model": TaskImportResult,
+            "description": "Файл обработан: число созданных задач и ошибки по строкам"
+        },
+        400: {
+            "model": ErrorResponse,
+            "description": "Формат файла не поддерживается или файл не удалось прочитать"
+        },
+        401: {
+            "model": ErrorResponse,
+            "description": "Токен авторизации неверен или истек"
+        },
+        403: {
+            "model": ErrorResponse,
+            "description": "Пользователь не является менеджером"
+        },
+        404: {
+            "model": ErrorResponse,
+            "description": "Проект не найден"
+        }
+    }
+)
+async def import_tasks(
+    file: UploadFile,
+    project_id: int | None = None,
+    current_user: UserDB = Depends(Security.get_current_user)
+) -> TaskImportResult:
+    """
+    Импорт задач из CSV или XLSX (первый лист). Первая строка - колонки title, description,
+    start_date, due_date, status, priority; статус и приоритет - названия из справочников.
+    Строки с ошибками пропускаются и возвращаются в отчёте, остальные задачи создаются
+    """
+    return await ManagerTaskService.import_tasks(file, project_id, current_user)
+
+
 @router.put(
     path="/{task_id}",
     summary="Обновление задачи",
@@ -126,7 +174,7 @@ async def update_task(
     task_id: int,
     task_data: TaskUpdate,
     current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> MessageResponse:
     """Обновление информации о задаче"""
     return await ManagerTaskService.update_task(task_id, task_data, current_user)
 
@@ -156,7 +204,7 @@ async def update_task(
 async def delete_task(
     task_id: int,
     current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> MessageResponse:
     """Удаление задачи"""
     return await ManagerTaskService.delete_task(task_id, current_user)
 
@@ -186,7 +234,7 @@ async def delete_task(
 async def get_task_assignments(
     task_id: int,
     current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> list[UserResponse]:
     """Получение списка сотрудников на задаче"""
     return await ManagerTaskService.get_task_assignments(task_id, current_user)
 
@@ -200,6 +248,10 @@ async def get_task_assignments(
             "model": MessageResponse,
             "description": "Сотрудник успешно назначен на задачу"
         },
+        400: {
+            "model": ErrorResponse,
+            "description": "Сотрудник уже назначен на задачу"
+        },
         401: {
             "model": ErrorResponse,
             "description": "Токен авторизации неверен или истек"
@@ -218,7 +270,7 @@ async def add_task_assignment(
     task_id: int,
     user_id: int,
     current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> MessageResponse:
     """Назначение сотрудника на задачу"""
     return await ManagerTaskService.add_task_assignment(task_id, user_id, current_user)
 
@@ -249,6 +301,67 @@ async def remove_task_assignment(
     task_id: int,
     user_id: int,
     current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> MessageResponse:
     """Удаление сотрудника с задачи"""
     return await ManagerTaskService.remove_task_assignment(task_id, user_id, current_user)
+
+@router.post(
+    path="/{task_id}/assignments/bulk",
+    summary="Массовое назначение сотрудников на задачу",
+    responses={
+        200: {
+            "model": BulkResponse,
+            "description": "Сотрудники назначены на задачу"
+        },
+        401: {
+            "model": ErrorResponse,
+            "description": "Токен авторизации неверен или истек"
+        },
+        403: {
+            "model": ErrorResponse,
+            "description": "Пользователь не является менеджером"
+        },
+        404: {
+            "model": ErrorResponse,
+            "description": "Задача или сотрудники не найдены"
+        }
+    }
+)
+async def add_task_assignments(
+    task_id: int,
+    data: UserIdsRequest,
+    current_user: UserDB = Depends(Security.get_current_user)
+) -> BulkResponse:
+    """Массовое назначение сотрудников на задачу: уже назначенные пользователи возвращаются в skipped"""
+    return await ManagerTaskService.add_task_assignments(task_id, data, current_user)
+
+
+@router.delete(
+    path="/{task_id}/assignments",
+    summary="Массовое снятие сотрудников с задачи",
+    responses={
+        200: {
+            "model": BulkResponse,
+            "description": "Сотрудники сняты с задачи"
+        },
+        401: {
+            "model": ErrorResponse,
+            "description": "Токен авторизации неверен или истек"
+        },
+        403: {
+            "model": ErrorResponse,
+            "description": "Пользователь не является менеджером"
+        },
+        404: {
+            "model": ErrorResponse,
+            "description": "Задача или сотрудники не найдены"
+        }
+    }
+)
+async def remove_task_assignments(
+    task_id: int,
+    user_ids: Annotated[list[int], Query(min_length=1, max_length=BULK_MAX_ITEMS)],
+    current_user: UserDB = Depends(Security.get_current_user)
+) -> BulkResponse:
+    """Массовое снятие сотрудников с задачи: не назначенные пользователи возвращаются в skipped"""
+    return await ManagerTaskService.remove_task_assignments(task_id, user_ids, current_user)
@@ -1,16 +1,19 @@
-from fastapi import APIRouter, Depends, status
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, status
 from app.core.security import Security
 
 # Сервисы
 from app.domains.manager.users.services import ManagerUserService
 
 # Схемы
-from app.base.schemas import MessageResponse, ErrorResponse
+from app.base.schemas import MessageResponse, ErrorResponse, Page
 from app.domains.users.schemas import (
     UserDB,
     UserResponse,
     UserCreate,
-    UserUpdate
+    UserUpdate,
+    UserListParams
 )
 from app.domains.projects.schemas import ProjectResponse
 from app.domains.tasks.schemas import TaskResponseWithProject
@@ -26,9 +29,13 @@ router = APIRouter(
     summary="Получение списка сотрудников",
     responses={
         200: {
-            "model": list[UserResponse],
+            "model": Page[UserResponse],
             "description": "Список сотрудников получен успешно"
         },
+        400: {
+            "model": ErrorResponse,
+            "description": "Некорректный курсор"
+        },
         401: {
             "model": ErrorResponse,
             "description": "Токен авторизации неверен или истек"
@@ -40,10 +47,11 @@ router = APIRouter(
     }
 )
 async def get_users(
+        params: Annotated[UserListParams, Query()],
         current_user: UserDB = Depends(Security.get_current_user)
-):
-    """Получение списка всех сотрудников"""
-    return await ManagerUserService.get_users(current_user)
+) -> Page[UserResponse]:
+    """Получение списка сотрудников с фильтрами, сортировкой и постраничным выводом по курсору"""
+    return await ManagerUserService.get_users(params, current_user)
 
 
 @router.get(
@@ -71,7 +79,7 @@ async def get_users(
 async def get_user(
         user_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> UserResponse:
     """Получение сотрудника по ID"""
     return await ManagerUserService.get_user(user_id, current_user)
 
@@ -106,7 +114,7 @@ async def get_user(
 async def create_user(
         user_data: UserCreate,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> MessageResponse:
     """Создание нового сотрудника"""
     return await ManagerUserService.create_user(user_data, current_user)
 
@@ -137,7 +145,7 @@ async def update_user(
         user_id: int,
         user_data: UserUpdate,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> MessageResponse:
     """Обновление информации о сотруднике"""
     return await ManagerUserService.update_user(user_id, user_data, current_user)
 
@@ -167,7 +175,7 @@ async def update_user(
 async def delete_user(
         user_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> MessageResponse:
     """Удаление сотрудника"""
     return await ManagerUserService.delete_user(user_id, current_user)
 
@@ -197,7 +205,7 @@ async def delete_user(
 async def get_user_tasks(
         user_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> list[TaskResponseWithProject]:
     """Получение списка задач сотрудника"""
     return await ManagerUserService.get_user_tasks(user_id, current_user)
 
@@ -227,6 +235,6 @@ async def get_user_tasks(
 async def get_user_projects(
         user_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> list[ProjectResponse]:
     """Получение списка проектов сотрудника"""
     return await ManagerUserService.get_user_projects(user_id, current_user)
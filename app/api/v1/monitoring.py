@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from app.core.security import Security
+
+# Сервисы
+from app.domains.monitoring.services import MonitoringService
+
+# Схемы
+from app.base.schemas import ErrorResponse
+from app.domains.users.schemas import UserDB
+from app.domains.monitoring.schemas import PoolStatsResponse, ReportStatsResponse
+
+router = APIRouter(
+    prefix="/monitoring",
+    tags=["Мониторинг"]
+)
+
+# Метрики для Prometheus: вне /api/v1, без авторизации и сессии БД
+metrics_router = APIRouter(
+    tags=["Мониторинг"]
+)
+
+
+@metrics_router.get(
+    path="/metrics",
+    summary="Метрики в формате Prometheus",
+    response_class=PlainTextResponse,
+)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Гистограммы времени обработки, числа SQL запросов, времени в БД и ожидания пула
+    по маршрутам, счетчик медленных запросов, загрузка пула и очереди отчётов текущего процесса
+    """
+    return PlainTextResponse(
+        await MonitoringService.get_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@router.get(
+    path="/db-pool",
+    summary="Загрузка пула соединений БД",
+    responses={
+        200: {
+            "model": PoolStatsResponse,
+            "description": "Состояние пула соединений получено успешно"
+        },
+        401: {
+            "model": ErrorResponse,
+            "description": "Токен авторизации неверен или истек"
+        },
+        403: {
+            "model": ErrorResponse,
+            "description": "Пользователь не является менеджером"
+        }
+    }
+)
+async def get_pool_stats(
+        current_user: UserDB = Depends(Security.get_current_user)
+) -> PoolStatsResponse:
+    """Занятость пула соединений и время ожидания свободного соединения в текущем процессе"""
+    return await MonitoringService.get_pool_stats(current_user)
+
+
+@router.get(
+    path="/reports",
+    summary="Очередь формирования отчётов",
+    responses={
+        200: {
+            "model": ReportStatsResponse,
+            "description": "Состояние очереди отчётов получено успешно"
+        },
+        401: {
+            "model": ErrorResponse,
+            "description": "Токен авторизации неверен или истек"
+        },
+        403: {
+            "model": ErrorResponse,
+            "description": "Пользователь не является менеджером"
+        }
+    }
+)
+async def get_report_stats(
+        current_user: UserDB = Depends(Security.get_current_user)
+) -> ReportStatsResponse:
+    """Число формируемых и ожидающих отчётов и суммарное время формирования в текущем процессе"""
+    return await MonitoringService.get_report_stats(current_user)
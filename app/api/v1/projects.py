@@ -31,7 +31,7 @@ router = APIRouter(
 )
 async def get_user_projects(
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> list[ProjectResponse]:
     """Получение списка проектов текущего пользователя"""
     return await ProjectService.get_user_projects(current_user)
 
@@ -61,7 +61,7 @@ async def get_user_projects(
 async def get_project(
         project_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> ProjectResponse:
     """Получение проекта по ID с проверкой доступа пользователя"""
     return await ProjectService.get_project(project_id, current_user)
 
@@ -91,7 +91,7 @@ async def get_project(
 async def get_project_tasks(
         project_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> list[TaskResponse]:
     """Получение списка задач для конкретного проекта"""
     return await ProjectService.get_project_tasks(project_id, current_user)
 
@@ -121,6 +121,6 @@ async def get_project_tasks(
 async def get_project_members(
         project_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> list[UserResponse]:
     """Получение списка участников проекта"""
     return await ProjectService.get_project_members(project_id, current_user)
\ No newline at end of file
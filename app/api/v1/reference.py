@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 
+from app.base.responses import cached_json_response
+from app.core.config import settings
 from app.core.security import Security
 
 # Сервисы
@@ -28,6 +30,9 @@ router = APIRouter(
             "description": "Список должностей получен успешно",
             "model": list[PositionResponse]
         },
+        304: {
+            "description": "Справочник не изменился"
+        },
         401: {
             "model": ErrorResponse,
             "description": "Токен авторизации неверен или истек"
@@ -35,10 +40,12 @@ router = APIRouter(
     }
 )
 async def get_positions(
+    request: Request,
     current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> Response:
     """Получение списка всех должностей в компании"""
-    return await UserService.get_all_positions()
+    entry = await UserService.get_all_positions()
+    return cached_json_response(request, entry.body, entry.etag, settings.REFERENCE_CACHE_TTL)
 
 
 @router.get(
@@ -49,6 +56,9 @@ async def get_positions(
             "description": "Список ролей получен успешно",
             "model": list[RoleResponse]
         },
+        304: {
+            "description": "Справочник не изменился"
+        },
         401: {
             "model": ErrorResponse,
             "description": "Токен авторизации неверен или истек"
@@ -56,10 +66,12 @@ async def get_positions(
     }
 )
 async def get_roles(
+    request: Request,
     current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> Response:
     """Получение списка всех ролей в компании"""
-    return await UserService.get_all_roles()
+    entry = await UserService.get_all_roles()
+    return cached_json_response(request, entry.body, entry.etag, settings.REFERENCE_CACHE_TTL)
 
 
 @router.get(
@@ -70,6 +82,9 @@ async def get_roles(
             "description": "Список статусов задач получен успешно",
             "model": list[StatusTaskResponse]
         },
+        304: {
+            "description": "Справочник не изменился"
+        },
         401: {
             "model": ErrorResponse,
             "description": "Токен авторизации неверен или истек"
@@ -77,10 +92,12 @@ async def get_roles(
     }
 )
 async def get_task_statuses(
+    request: Request,
     current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> Response:
     """Получение списка всех статусов задач"""
-    return await TaskService.get_all_statuses()
+    entry = await TaskService.get_all_statuses()
+    return cached_json_response(request, entry.body, entry.etag, settings.REFERENCE_CACHE_TTL)
 
 
 @router.get(
@@ -91,6 +108,9 @@ async def get_task_statuses(
             "description": "Список приоритетов задач получен успешно",
             "model": list[PriorityResponse]
         },
+        304: {
+            "description": "Справочник не изменился"
+        },
         401: {
             "model": ErrorResponse,
             "description": "Токен авторизации неверен или истек"
@@ -98,10 +118,12 @@ async def get_task_statuses(
     }
 )
 async def get_task_priorities(
+    request: Request,
     current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> Response:
     """Получение списка всех приоритетов задач"""
-    return await TaskService.get_all_priorities()
+    entry = await TaskService.get_all_priorities()
+    return cached_json_response(request, entry.body, entry.etag, settings.REFERENCE_CACHE_TTL)
 
 
 @router.get(
@@ -112,6 +134,9 @@ async def get_task_priorities(
             "description": "Список статусов проектов получен успешно",
             "model": list[StatusProjectResponse]
         },
+        304: {
+            "description": "Справочник не изменился"
+        },
         401: {
             "model": ErrorResponse,
             "description": "Токен авторизации неверен или истек"
@@ -119,7 +144,9 @@ async def get_task_priorities(
     }
 )
 async def get_project_statuses(
+    request: Request,
     current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> Response:
     """Получение списка всех статусов проектов"""
-    return await ProjectService.get_all_statuses()
+    entry = await ProjectService.get_all_statuses()
+    return cached_json_response(request, entry.body, entry.etag, settings.REFERENCE_CACHE_TTL)
@@ -0,0 +1,46 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from app.core.security import Security
+
+# Сервисы
+from app.domains.search.services import SearchService
+
+# Схемы
+from app.base.schemas import ErrorResponse, Page
+from app.domains.users.schemas import UserDB
+from app.domains.search.schemas import SearchParams, SearchResult
+
+router = APIRouter(
+    prefix="/search",
+    tags=["Поиск"]
+)
+
+
+@router.get(
+    path="",
+    summary="Поиск задач и проектов",
+    responses={
+        200: {
+            "model": Page[SearchResult],
+            "description": "Результаты поиска получены успешно"
+        },
+        400: {
+            "model": ErrorResponse,
+            "description": "Некорректный курсор"
+        },
+        401: {
+            "model": ErrorResponse,
+            "description": "Токен авторизации неверен или истек"
+        }
+    }
+)
+async def search(
+        params: Annotated[SearchParams, Query()],
+        current_user: UserDB = Depends(Security.get_current_user)
+) -> Page[SearchResult]:
+    """
+    Полнотекстовый поиск по названию и описанию с ранжированием по релевантности.
+    Сотрудник находит только свои задачи и проекты, менеджер - все
+    """
+    return await SearchService.search(params, current_user)
@@ -30,7 +30,7 @@ router = APIRouter(
 )
 async def get_user_tasks(
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> list[TaskResponseWithProject]:
     """Получение списка задач текущего пользователя"""
     return await TaskService.get_user_tasks(current_user)
 
@@ -60,7 +60,7 @@ async def get_user_tasks(
 async def get_task(
         task_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> TaskResponseWithProject:
     """Получение конкретной задачи"""
     return await TaskService.get_task(task_id, current_user)
 
@@ -90,7 +90,7 @@ async def get_task(
 async def get_task_assignments(
         task_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> list[UserResponse]:
     """Получение списка сотрудников, назначенных на конкретную задачу"""
     return await TaskService.get_task_assignments(task_id, current_user)
 
@@ -125,6 +125,6 @@ async def change_task_status(
         task_id: int,
         status_id: int,
         current_user: UserDB = Depends(Security.get_current_user)
-):
+) -> MessageResponse:
     """Изменение статуса задачи"""
     return await TaskService.change_task_status(task_id, status_id, current_user)
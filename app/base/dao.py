@@ -1,17 +1,95 @@
-from sqlalchemy import select, insert, update, delete
+from contextlib import asynccontextmanager
 
-from app.core.database import async_session_maker
+from sqlalchemy import ARRAY, select, insert, update, delete, func, any_, literal
+from sqlalchemy.orm import raiseload
+
+from app.core.cache import DataVersions
+from app.core.config import settings
+from app.core.database import async_session_maker, read_session_maker
+from app.core.uow import UnitOfWork
+
+
+def change_mark(id_column, updated_column, *criteria):
+    """
+    Метка изменений набора строк для версии данных: число строк, сумма id и время последнего
+    обновления. Меняется при добавлении, удалении и изменении любой строки набора
+    """
+    return (
+        select(func.concat_ws(":", func.count(id_column), func.sum(id_column), func.max(updated_column)))
+        .where(*criteria)
+        .scalar_subquery()
+    )
+
+
+def any_of(column, values: list):
+    """Условие column = ANY(:values): один параметр-массив вместо IN со списком параметров"""
+    return column == any_(literal(values, ARRAY(column.type)))
 
 
 class BaseDAO:
     """Базовый DAO, поддерживающий CRUD операции"""
     model = None
 
+    # Профили загрузки связей: сценарий использования -> опции загрузки (см. _load)
+    load_profiles: dict[str, tuple] = {}
+
+    # Загрузка связей
+    @classmethod
+    def _load(cls, profile: str) -> tuple:
+        """
+        Опции загрузки связей для сценария. При DB_RAISE_ON_LAZY_LOAD связи вне профиля
+        (в том числе lazy="joined" по умолчанию) не загружаются, а обращение к ним вызывает ошибку
+        """
+        options = cls.load_profiles[profile]
+        if settings.DB_RAISE_ON_LAZY_LOAD:
+            options += (raiseload("*"),)
+        return options
+
+    # Сессия
+    @classmethod
+    @asynccontextmanager
+    async def _session(cls, write: bool = False):
+        """
+        Сессия для запроса к БД: сессия текущего HTTP запроса (UnitOfWork),
+        либо собственная сессия с коммитом вне запроса (скрипты, фоновые задачи).
+        Чтение идет через реплику, если она настроена (см. UnitOfWork.read_session).
+        При записи таблица модели отмечается как измененная для инвалидации кэшей
+        """
+        table = cls.model.__tablename__
+        session = UnitOfWork.current_session() if write else UnitOfWork.read_session()
+        if session is not None:
+            if write:
+                UnitOfWork.touch(table)
+            yield session
+            return
+        if write or UnitOfWork.reads_from_primary():
+            session_maker = async_session_maker
+        else:
+            session_maker = read_session_maker()
+        async with session_maker() as session:
+            yield session
+            await session.commit()
+        if write:
+            DataVersions.bump(table)
+
+    @classmethod
+    async def _stream(cls, query, batch_size: int, primary: bool = False):
+        """
+        Чтение выборки порциями через серверный курсор в собственной сессии: потоковый ответ
+        формируется уже после закрытия сессии запроса. Источник выбирается вызывающим заранее,
+        пока известен контекст запроса: primary - основная БД, иначе реплика, если она настроена
+        """
+        session_maker = async_session_maker if primary else read_session_maker()
+        async with session_maker() as session:
+            result = await session.stream(query.execution_options(yield_per=batch_size))
+            async for partition in result.scalars().partitions():
+                yield partition
+
     # Чтение
     @classmethod
     async def find_all(cls, **filters):
         """Поиск всех записей по фильтру"""
-        async with async_session_maker() as session:
+        async with cls._session() as session:
             query = select(cls.model).filter_by(**filters)
             result = await session.execute(query)
             return result.scalars().all()
@@ -19,7 +97,7 @@ class BaseDAO:
     @classmethod
     async def find_one_or_none(cls, **filters):
         """Поиск одной записи по фильтру"""
-        async with async_session_maker() as session:
+        async with cls._session() as session:
             query = select(cls.model).filter_by(**filters)
             result = await session.execute(query)
             return result.scalar_one_or_none()
@@ -27,60 +105,71 @@ class BaseDAO:
     @classmethod
     async def find_by_id(cls, model_id: int):
         """Поиск одной записи по id"""
-        async with async_session_maker() as session:
+        async with cls._session() as session:
             query = select(cls.model).where(cls.model.id == model_id)
             result = await session.execute(query)
             return result.scalar_one_or_none()
 
+    @classmethod
+    async def find_existing_ids(cls, model_ids: list[int]) -> set[int]:
+        """id из списка, для которых есть записи, одним запросом"""
+        async with cls._session() as session:
+            query = select(cls.model.id).where(any_of(cls.model.id, model_ids))
+            result = await session.execute(query)
+            return set(result.scalars().all())
+
     # Запись
     @classmethod
     async def create(cls, **data):
         """Создание записи"""
-        async with async_session_maker() as session:
+        async with cls._session(write=True) as session:
             query = insert(cls.model).values(**data)
             await session.execute(query)
-            await session.commit()
+
+    @classmethod
+    async def create_many(cls, rows: list[dict]) -> None:
+        """Создание записей порцией: многострочные INSERT без загрузки объектов"""
+        async with cls._session(write=True) as session:
+            await session.execute(insert(cls.model), rows)
 
     @classmethod
     async def create_and_return_id(cls, **data):
         """Создание и возврат id созданной записи"""
-        async with async_session_maker() as session:
+        async with cls._session(write=True) as session:
             query = insert(cls.model).values(**data).returning(cls.model.id)
             result = await session.execute(query)
-            await session.commit()
             return result.scalar_one_or_none()
 
     @classmethod
     async def create_and_return_all(cls, **data):
         """Создание и возврат созданной записи"""
-        async with async_session_maker() as session:
+        async with cls._session(write=True) as session:
             query = insert(cls.model).values(**data).returning(cls.model)
             result = await session.execute(query)
-            await session.commit()
             return result.scalars().all()
 
     # Обновление
     @classmethod
-    async def update(cls, model_id: int, **data):
-        """Обновление записи по id"""
-        async with async_session_maker() as session:
-            query = update(cls.model).where(cls.model.id == model_id).values(**data)
-            await session.execute(query)
-            await session.commit()
+    async def update(cls, model_id: int, **data) -> bool:
+        """Обновление записи по id одним UPDATE ... RETURNING; False, если записи нет"""
+        async with cls._session(write=True) as session:
+            query = update(cls.model).where(cls.model.id == model_id).values(**data).returning(cls.model.id)
+            result = await session.execute(query)
+            return result.scalar_one_or_none() is not None
 
     # Удаление
     @classmethod
-    async def delete(cls, model_id: int):
-        """Удаление записи по id"""
-        async with async_session_maker() as session:
-            query = delete(cls.model).where(cls.model.id == model_id)
-            await session.execute(query)
-            await session.commit()
+    async def delete(cls, model_id: int) -> bool:
+        """Удаление записи по id одним DELETE ... RETURNING; False, если записи нет"""
+        async with cls._session(write=True) as session:
+            query = delete(cls.model).where(cls.model.id == model_id).returning(cls.model.id)
+            result = await session.execute(query)
+            return result.scalar_one_or_none() is not None
 
     @classmethod
-    async def delete_by_filter(cls, **filters):
-        """Удаление записей по фильтру"""
-        async with async_session_maker() as session:
-            query = delete(cls.model).filter_by(**filters)
-            await session.execute(query)
-            await session.commit()
+    async def delete_by_filter(cls, **filters) -> int:
+        """Удаление записей по фильтру; возврат числа удаленных"""
+        async with cls._session(write=True) as session:
+            query = delete(cls.model).filter_by(**filters).returning(cls.model.id)
+            result = await session.execute(query)
+            return len(result.scalars().all())
@@ -0,0 +1,40 @@
+from contextlib import contextmanager
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+
+
+# SQLSTATE нарушений ограничений
+FOREIGN_KEY_VIOLATION = "23503"
+UNIQUE_VIOLATION = "23505"
+
+# Ответ по SQLSTATE, если ограничение не описано в сервисе
+DEFAULT_ERRORS = {
+    FOREIGN_KEY_VIOLATION: (status.HTTP_404_NOT_FOUND, "Связанная запись не найдена"),
+    UNIQUE_VIOLATION: (status.HTTP_400_BAD_REQUEST, "Запись уже существует"),
+}
+
+
+def constraint_name(error: IntegrityError) -> str | None:
+    """Имя нарушенного ограничения из исключения драйвера (asyncpg)"""
+    for source in (error.orig, getattr(error.orig, "__cause__", None)):
+        name = getattr(source, "constraint_name", None)
+        if name:
+            return name
+    return None
+
+
+@contextmanager
+def integrity_errors(constraints: dict[str, tuple[int, str]]):
+    """
+    Перевод нарушений ограничений БД в HTTPException: по имени ограничения,
+    иначе по SQLSTATE. Транзакция запроса после ошибки откатывается UnitOfWork
+    """
+    try:
+        yield
+    except IntegrityError as error:
+        response = constraints.get(constraint_name(error)) or DEFAULT_ERRORS.get(getattr(error.orig, "sqlstate", None))
+        if response is None:
+            raise
+        status_code, detail = response
+        raise HTTPException(status_code=status_code, detail=detail) from error
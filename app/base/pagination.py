@@ -0,0 +1,92 @@
+import base64
+import json
+from datetime import date, datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, or_, tuple_
+
+
+def pack_cursor(values: list) -> str:
+    """Непрозрачный курсор из значений ключа: JSON в base64 без выравнивания"""
+    raw = json.dumps(values, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def unpack_cursor(cursor: str) -> list:
+    """Значения ключа из курсора; ValueError, если курсор поврежден"""
+    values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    if not isinstance(values, list):
+        raise ValueError
+    return values
+
+
+def invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Некорректный курсор"
+    )
+
+
+def encode_cursor(sort: str, value, model_id: int) -> str:
+    """Курсор на запись: сортировка, значение ключа сортировки и id"""
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    return pack_cursor([sort, value, model_id])
+
+
+def decode_cursor(cursor: str, sort: str, column) -> tuple:
+    """Значение ключа сортировки и id из курсора"""
+    try:
+        cursor_sort, value, model_id = unpack_cursor(cursor)
+        if cursor_sort != sort or not isinstance(model_id, int) or isinstance(model_id, bool):
+            raise ValueError
+        python_type = column.type.python_type
+        if value is not None and python_type in (date, datetime):
+            value = python_type.fromisoformat(value)
+        # Значение другого типа дошло бы до БД и вызвало бы ошибку драйвера вместо 400
+        if value is not None and (not isinstance(value, python_type) or isinstance(value, bool)):
+            raise ValueError
+        return value, model_id
+    except (ValueError, TypeError):
+        raise invalid_cursor()
+
+
+def _after_cursor(column, id_column, value, model_id: int, descending: bool):
+    """Условие "после курсора" с пустыми значениями в конце выборки"""
+    if column is id_column:
+        return id_column < model_id if descending else id_column > model_id
+    if value is None:
+        return and_(column.is_(None), id_column < model_id if descending else id_column > model_id)
+    key, last = tuple_(column, id_column), tuple_(value, model_id)
+    condition = key < last if descending else key > last
+    if column.expression.nullable:
+        condition = or_(condition, column.is_(None))
+    return condition
+
+
+def paginate(query: Select, sort_fields: dict, id_column, sort: str, cursor: str | None, limit: int) -> Select:
+    """
+    Keyset пагинация: сортировка по полю и id, условие после курсора и limit + 1
+    (лишняя запись показывает, что есть следующая страница)
+    """
+    descending = sort.startswith("-")
+    column = sort_fields[sort.lstrip("-")]
+    if cursor is not None:
+        value, model_id = decode_cursor(cursor, sort, column)
+        query = query.where(_after_cursor(column, id_column, value, model_id, descending))
+    if column is id_column:
+        order = [id_column.desc() if descending else id_column.asc()]
+    elif descending:
+        order = [column.desc().nulls_last(), id_column.desc()]
+    else:
+        order = [column.asc().nulls_last(), id_column.asc()]
+    return query.order_by(*order).limit(limit + 1)
+
+
+def split_page(rows: list, sort: str, limit: int) -> tuple[list, str | None]:
+    """Записи страницы и курсор следующей страницы"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort, getattr(last, sort.lstrip("-")), last.id)
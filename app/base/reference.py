@@ -0,0 +1,89 @@
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+
+import orjson
+
+from app.core.cache import DataVersions
+from app.core.config import settings
+from app.core.uow import UnitOfWork
+from app.domains.users.dao import RoleDAO, PositionDAO
+from app.domains.tasks.dao import TaskPriorityDAO, TaskStatusDAO
+from app.domains.projects.dao import ProjectStatusDAO
+
+
+@dataclass(frozen=True)
+class ReferenceEntry:
+    """Загруженный справочник"""
+    items: list[dict]
+    names: dict[int, str]
+    version: int
+    loaded_at: float
+    body: bytes
+    etag: str
+
+
+class ReferenceCache:
+    """
+    Кэш справочников в памяти процесса.
+    Загружается при старте приложения, перечитывается после записи в справочник
+    этим процессом и по истечении TTL (изменения из других процессов)
+    """
+    daos = (RoleDAO, PositionDAO, TaskPriorityDAO, TaskStatusDAO, ProjectStatusDAO)
+
+    _entries: dict[type, ReferenceEntry] = {}
+    _lock = asyncio.Lock()
+
+    @classmethod
+    async def load(cls) -> None:
+        """Загрузка всех справочников"""
+        for dao in cls.daos:
+            await cls._load(dao)
+
+    @classmethod
+    async def get(cls, dao) -> ReferenceEntry:
+        """Справочник, перечитанный из БД, если он устарел"""
+        entry = cls._entries.get(dao)
+        if entry is None or cls._is_stale(dao, entry):
+            async with cls._lock:
+                entry = cls._entries.get(dao)
+                if entry is None or cls._is_stale(dao, entry):
+                    entry = await cls._load(dao)
+        return entry
+
+    @classmethod
+    async def get_all(cls, dao) -> list[dict]:
+        """Все записи справочника"""
+        return (await cls.get(dao)).items
+
+    @classmethod
+    async def exists(cls, dao, model_id: int) -> bool:
+        """Проверка наличия записи справочника по id"""
+        return model_id in (await cls.get(dao)).names
+
+    @classmethod
+    def _is_stale(cls, dao, entry: ReferenceEntry) -> bool:
+        return (
+            entry.version != DataVersions.get(dao.model.__tablename__)
+            or time.monotonic() - entry.loaded_at > settings.REFERENCE_CACHE_TTL
+        )
+
+    @classmethod
+    async def _load(cls, dao) -> ReferenceEntry:
+        version = DataVersions.get(dao.model.__tablename__)
+        # Из основной БД: после записи версия уже новая, а реплика может отставать
+        with UnitOfWork.primary_reads():
+            rows = await dao.find_all()
+        items = sorted(({"id": row.id, "name": row.name} for row in rows), key=lambda item: item["id"])
+        body = orjson.dumps(items)
+        entry = ReferenceEntry(
+            items=items,
+            names={item["id"]: item["name"] for item in items},
+            version=version,
+            loaded_at=time.monotonic(),
+            body=body,
+            etag=f'"{hashlib.sha1(body).hexdigest()}"',
+        )
+        cls._entries[dao] = entry
+        return entry
@@ -0,0 +1,21 @@
+from fastapi import Request, Response, status
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Проверка заголовка If-None-Match на совпадение с ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def cached_json_response(request: Request, body: bytes, etag: str, max_age: int) -> Response:
+    """Ответ с готовым JSON, ETag и Cache-Control; 304 при совпадении If-None-Match"""
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={max_age}",
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,4 +1,8 @@
-from pydantic import BaseModel
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
 
 
 class MessageResponse(BaseModel):
@@ -9,3 +13,31 @@ class MessageResponse(BaseModel):
 class ErrorResponse(BaseModel):
     """Ответ с ошибкой"""
     detail: str = "Информация об ошибке"
+
+
+# Наибольшее число записей в одной массовой операции
+BULK_MAX_ITEMS = 500
+
+
+class UserIdsRequest(BaseModel):
+    """Пользователи для массовой операции"""
+    user_ids: list[int] = Field(min_length=1, max_length=BULK_MAX_ITEMS, description="ID пользователей")
+
+
+class BulkResponse(BaseModel):
+    """Ответ массовой операции"""
+    message: str
+    processed: list[int] = Field(description="ID пользователей, для которых операция выполнена")
+    skipped: list[int] = Field(description="ID пользователей, для которых изменений не потребовалось")
+
+
+class PageParams(BaseModel):
+    """Параметры постраничного вывода"""
+    limit: int = Field(50, ge=1, le=500, description="Количество записей на странице")
+    cursor: str | None = Field(None, description="Курсор следующей страницы из предыдущего ответа")
+
+
+class Page(BaseModel, Generic[T]):
+    """Страница списка"""
+    items: list[T]
+    next_cursor: str | None = None
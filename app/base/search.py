@@ -0,0 +1,25 @@
+from sqlalchemy import func, literal_column
+
+# Конфигурация текстового поиска PostgreSQL
+SEARCH_CONFIG = "russian"
+
+# Документ поиска по названию (вес A) и описанию (вес B) для сгенерированной колонки search_vector
+SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
+
+def search_query(text: str):
+    """Запрос в синтаксисе поисковиков: слова, "фраза", or, -исключение"""
+    return func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), text)
+
+
+def matches(vector_column, query):
+    """Условие совпадения документа с запросом (использует GIN индекс колонки)"""
+    return vector_column.op("@@")(query)
+
+
+def rank(vector_column, query):
+    """Релевантность документа запросу с учетом весов"""
+    return func.ts_rank(vector_column, query)
@@ -0,0 +1,128 @@
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class DataVersions:
+    """
+    Счетчики изменений таблиц в текущем процессе.
+    Увеличиваются после фиксации записи, по ним кэши понимают, что данные устарели.
+    """
+    _versions: dict[str, int] = {}
+
+    @classmethod
+    def get(cls, table: str) -> int:
+        """Текущая версия таблицы"""
+        return cls._versions.get(table, 0)
+
+    @classmethod
+    def bump(cls, *tables: str) -> None:
+        """Отметка об изменении таблиц"""
+        for table in tables:
+            cls._versions[table] = cls._versions.get(table, 0) + 1
+
+
+class TTLCache:
+    """LRU кэш ограниченного размера с временем жизни записей"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Значение по ключу, если оно есть и не устарело"""
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Сохранение значения с вытеснением самых старых записей"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Удаление значения по ключу"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очистка кэша"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SizedLRUCache:
+    """LRU кэш с ограничением суммарного размера значений в байтах"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data: OrderedDict[Hashable, tuple[int, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Значение по ключу"""
+        item = self._data.get(key)
+        if item is None:
+            return default
+        self._data.move_to_end(key)
+        return item[1]
+
+    def set(self, key: Hashable, value: Any, size: int) -> bool:
+        """Сохранение значения размером size с вытеснением самых старых; False, если не помещается"""
+        if size > self.max_bytes:
+            return False
+        self.pop(key)
+        self._data[key] = (size, value)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (evicted, _) = self._data.popitem(last=False)
+            self.size -= evicted
+        return True
+
+    def pop(self, key: Hashable) -> None:
+        """Удаление значения по ключу"""
+        item = self._data.pop(key, None)
+        if item is not None:
+            self.size -= item[0]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class BloomFilter:
+    """
+    Фильтр Блума: проверка отсутствия ключа в множестве без обращения к хранилищу.
+    Ложноотрицательных ответов не бывает, ложноположительные - с вероятностью error_rate
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str) -> None:
+        """Добавление ключа"""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
@@ -12,6 +12,74 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASS: str
 
+    # Пул соединений БД (на один процесс uvicorn)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    # asyncpg: размер кэша подготовленных запросов (0 - для pgbouncer в режиме transaction)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Таймаут выполнения запроса в секундах (клиент asyncpg и statement_timeout сервера)
+    DB_COMMAND_TIMEOUT: float = 60
+    # Ошибка при обращении к связи, не загруженной профилем DAO (N+1), - для тестов и разработки
+    DB_RAISE_ON_LAZY_LOAD: bool = False
+    # Реплики для чтения: URL SQLAlchemy (postgresql+asyncpg://...), JSON список; пусто - все через основную БД
+    DB_REPLICA_URLS: list[str] = []
+    # Чтение из основной БД после записи: окно в секундах для клиента, записавшего данные (cookie rw_until)
+    DB_READ_YOUR_WRITES_SECONDS: float = 5
+    # Запросы дольше порога (секунды) пишутся в журнал вместе с маршрутом
+    DB_SLOW_QUERY_SECONDS: float = 0.5
+
+    # Метрики запросов в формате Prometheus (GET /metrics, без авторизации)
+    METRICS_ENABLED: bool = True
+
+    # Кэш справочников (роли, должности, статусы, приоритеты), секунды
+    REFERENCE_CACHE_TTL: int = 300
+
+    # Кэш аутентификации: пользователи по id и статус отзыва токенов.
+    # TTL ограничивает задержку применения изменений, сделанных другими процессами
+    AUTH_USER_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_TTL: int = 60
+    AUTH_TOKEN_CACHE_SIZE: int = 50000
+    AUTH_TOKEN_CACHE_TTL: int = 60
+    # BlackList: интервал очистки истекших записей и синхронизации отзывов между процессами
+    REVOCATION_REFRESH_INTERVAL: int = 60
+    REVOCATION_FILTER_CAPACITY: int = 100000
+
+    # Argon2: параметры стоимости хеширования паролей (по умолчанию - как у passlib: m=65536, t=3, p=4)
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    # Пул потоков для хеширования: число потоков и очередь ожидающих запросов сверх них
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+
+    # Отчёты: число строк, читаемых из курсора БД за одну порцию
+    REPORT_STREAM_BATCH_SIZE: int = 1000
+    # Число отчётов, формируемых одновременно (потоки вне event loop); остальные ждут в очереди
+    REPORT_RENDER_WORKERS: int = 2
+    # Фоновые задания на отчёты: каталог готовых файлов, срок их хранения в секундах, число обработчиков
+    REPORT_JOBS_DIR: str = "storage/reports"
+    REPORT_JOB_TTL: int = 3600
+    REPORT_JOB_WORKERS: int = 2
+    # Кэш готовых отчётов в памяти процесса: общий объем и наибольший кэшируемый отчёт, байты
+    REPORT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    REPORT_CACHE_MAX_ITEM_BYTES: int = 8 * 1024 * 1024
+    # Массовая выгрузка: число процессов формирования листов и сущностей в одной порции запросов
+    REPORT_EXPORT_PROCESSES: int = 2
+    REPORT_EXPORT_BATCH_SIZE: int = 50
+
+    # Импорт задач из файлов: строк в одной порции вставки и наибольшее число строк с ошибками в ответе
+    TASK_IMPORT_BATCH_SIZE: int = 500
+    TASK_IMPORT_MAX_ERRORS: int = 1000
+
+    # Сводка менеджера: время жизни кэша в секундах (сбрасывается и при записи в задачи и проекты)
+    DASHBOARD_CACHE_TTL: int = 30
+
+    # Счетчики задач проектов: интервал пересчета просроченных задач в секундах
+    PROJECT_STATS_REFRESH_INTERVAL: int = 3600
+
     # JWT
     JWT_SECRET: str
     JWT_ALGORITHM: str
@@ -21,7 +89,7 @@ class Settings(BaseSettings):
     SERVER_PORT: int
 
     class Config:
-        # Настройки для .env
+        # Настройки для .env
         env_file = ".env"
         env_file_encoding = "utf-8"
 
@@ -1,14 +1,100 @@
+import itertools
+import time
+
+from sqlalchemy import event, exc
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.core.metrics import RequestMetrics
 
 
 # Database URL
 DB_URL = f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASS}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
 
-# Database Engine
-engine = create_async_engine(DB_URL, echo=False, future=True)
+
+class PoolMetrics:
+    """Метрики ожидания соединения из пула"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe_wait(self, seconds: float) -> None:
+        """Учет времени ожидания одного соединения"""
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений с замером времени ожидания свободного соединения; метрики у каждого пула свои"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        # Пул пересоздается при dispose(): метрики с запуска процесса сохраняются
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.metrics.observe_wait(waited)
+            RequestMetrics.observe_pool_wait(waited)
+
+
+# Время SQL запросов: счетчики текущего HTTP запроса и журнал медленных запросов.
+# Начало хранится в контексте выполнения: при ошибке запроса after_cursor_execute не вызывается,
+# и отметка уходит вместе с контекстом, а не копится в соединении пула
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    RequestMetrics.observe_statement(time.perf_counter() - context._query_started, statement)
+
+
+def make_engine(url: str):
+    """Engine с пулом и таймаутами из настроек и замером времени запросов"""
+    db_engine = create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=MeteredQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "command_timeout": settings.DB_COMMAND_TIMEOUT,
+            "server_settings": {
+                "statement_timeout": str(int(settings.DB_COMMAND_TIMEOUT * 1000)),
+            },
+        },
+    )
+    event.listen(db_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(db_engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    return db_engine
+
+
+# Database Engine: основная БД (запись и чтение после записи) и реплики для чтения
+engine = make_engine(DB_URL)
+replica_engines = [make_engine(url) for url in settings.DB_REPLICA_URLS]
 
 # Database session maker
 async_session_maker = sessionmaker(
@@ -16,6 +102,44 @@ async_session_maker = sessionmaker(
     class_=AsyncSession,
     expire_on_commit=False
 )
+replica_session_makers = [
+    sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False)
+    for replica_engine in replica_engines
+]
+_replicas = itertools.cycle(replica_session_makers)
+
+
+def read_session_maker() -> sessionmaker:
+    """Фабрика сессий для чтения: следующая реплика по кругу, без реплик - основная БД"""
+    return next(_replicas) if replica_session_makers else async_session_maker
+
+
+def _pool_stats(db_engine) -> dict:
+    pool = db_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checkouts": pool.metrics.checkouts,
+        "timeouts": pool.metrics.timeouts,
+        "wait_seconds_total": pool.metrics.wait_seconds_total,
+        "wait_seconds_max": pool.metrics.wait_seconds_max,
+    }
+
+
+def get_pool_stats() -> dict:
+    """Текущая загрузка пула соединений основной БД и время ожидания соединений"""
+    return _pool_stats(engine)
+
+
+def get_pools_stats() -> dict[str, dict]:
+    """Статистика пулов по engine: primary - основная БД, replica_N - реплики в порядке DB_REPLICA_URLS"""
+    stats = {"primary": _pool_stats(engine)}
+    for index, replica_engine in enumerate(replica_engines):
+        stats[f"replica_{index}"] = _pool_stats(replica_engine)
+    return stats
 
 
 # Database base class
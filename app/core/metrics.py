@@ -0,0 +1,199 @@
+import bisect
+import logging
+import time
+from contextvars import ContextVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Границы корзин гистограмм
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+# Наибольшая длина текста запроса в журнале медленных запросов
+SLOW_STATEMENT_MAX_CHARS = 2000
+
+
+class RequestStats:
+    """Счетчики БД одного HTTP запроса: число запросов, время в БД и ожидание соединения из пула"""
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        """Шаблон пути маршрута (известен после маршрутизации), а не фактический путь"""
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+
+# Счетчики текущего запроса
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    """Гистограмма Prometheus с метками: накопленные корзины, сумма и число наблюдений"""
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *label_values) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def totals(self, *label_values) -> tuple[int, float]:
+        """Число наблюдений и их сумма для набора меток"""
+        series = self._series.get(label_values)
+        if series is None:
+            return 0, 0.0
+        return sum(series[0]), series[1]
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total) in self._series.items():
+            labels = _labels(self.labels, label_values)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Счетчик Prometheus с метками"""
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...]):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._series: dict[tuple, float] = {}
+
+    def inc(self, *label_values, value: float = 1) -> None:
+        self._series[label_values] = self._series.get(label_values, 0) + value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for label_values, value in self._series.items():
+            lines.append(f"{self.name}{{{_labels(self.labels, label_values)}}} {value}")
+        return lines
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+
+class RequestMetrics:
+    """Метрики HTTP запросов и запросов к БД текущего процесса"""
+    duration = Histogram(
+        "http_request_duration_seconds", "Время обработки HTTP запроса",
+        ("method", "route", "status"), LATENCY_BUCKETS,
+    )
+    statements = Histogram(
+        "http_request_db_statements", "Число SQL запросов на HTTP запрос",
+        ("method", "route"), STATEMENT_BUCKETS,
+    )
+    db_time = Histogram(
+        "http_request_db_seconds", "Суммарное время SQL запросов на HTTP запрос",
+        ("method", "route"), LATENCY_BUCKETS,
+    )
+    pool_wait = Histogram(
+        "http_request_db_pool_wait_seconds", "Ожидание соединения из пула на HTTP запрос",
+        ("method", "route"), LATENCY_BUCKETS,
+    )
+    slow_statements = Counter(
+        "db_slow_statements_total", "SQL запросы дольше DB_SLOW_QUERY_SECONDS",
+        ("route",),
+    )
+
+    @classmethod
+    def observe_request(cls, method: str, status: int, seconds: float, stats: RequestStats) -> None:
+        route = stats.route
+        cls.duration.observe(seconds, method, route, status)
+        cls.statements.observe(stats.statements, method, route)
+        cls.db_time.observe(stats.db_seconds, method, route)
+        cls.pool_wait.observe(stats.pool_wait_seconds, method, route)
+
+    @classmethod
+    def observe_statement(cls, seconds: float, statement: str) -> None:
+        """Учет SQL запроса в счетчиках текущего HTTP запроса; запись в журнал, если он медленный"""
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += seconds
+        if seconds >= settings.DB_SLOW_QUERY_SECONDS:
+            route = f"{stats.scope['method']} {stats.route}" if stats is not None else "вне запроса"
+            cls.slow_statements.inc(stats.route if stats is not None else "")
+            logger.warning(
+                "Медленный запрос %.3f с, %s: %s",
+                seconds, route, statement[:SLOW_STATEMENT_MAX_CHARS],
+            )
+
+    @classmethod
+    def observe_pool_wait(cls, seconds: float) -> None:
+        """Учет ожидания соединения из пула в счетчиках текущего HTTP запроса"""
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.pool_wait_seconds += seconds
+
+    @classmethod
+    def render(cls, gauges: dict[str, tuple], counters: dict[str, tuple] | None = None) -> str:
+        """
+        Метрики в текстовом формате Prometheus; gauges - текущие значения, counters - монотонно
+        растущие с запуска процесса (для rate/increase). Имя -> (описание, значение), либо
+        (описание, {значение метки: значение}, имя метки) для серий с меткой
+        """
+        lines = []
+        for metric in (cls.duration, cls.statements, cls.db_time, cls.pool_wait, cls.slow_statements):
+            lines += metric.render()
+        for kind, values in (("gauge", gauges), ("counter", counters or {})):
+            for name, (description, value, *label) in values.items():
+                lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+                if label:
+                    lines += [f"{name}{{{_labels(tuple(label), (key,))}}} {item}" for key, item in value.items()]
+                else:
+                    lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware: время обработки, число SQL запросов, время в БД и ожидание пула
+    для каждого HTTP запроса. Счетчики БД пополняются событиями engine через contextvar
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_stats.reset(token)
+            RequestMetrics.observe_request(scope["method"], status_code, time.perf_counter() - started, stats)
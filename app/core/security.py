@@ -1,15 +1,26 @@
+import asyncio
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 from jose import jwt, JWTError
 from datetime import datetime, timedelta, timezone
+from sqlalchemy.exc import SQLAlchemyError
 
+from app.core.cache import TTLCache, BloomFilter
 from app.core.config import settings
+from app.core.uow import UnitOfWork
 from app.domains.auth.dao import BlackListTokenDAO
 from app.domains.users.dao import UserDAO
 
 from app.domains.users.schemas import UserDB
 
+logger = logging.getLogger(__name__)
+
 
 class Security:
     """
@@ -19,18 +30,45 @@ class Security:
     # OAuth
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"api/v1/auth/login")
     # Хеширование
-    pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+    pwd_context = CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__time_cost=settings.ARGON2_TIME_COST,
+        argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+        argon2__parallelism=settings.ARGON2_PARALLELISM,
+    )
+    # Argon2 блокирует поток на десятки миллисекунд: выполняется вне event loop
+    _hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="argon2")
+    _hash_slots = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE)
+    # Кэш аутентификации
+    _user_cache = TTLCache(maxsize=settings.AUTH_USER_CACHE_SIZE, ttl=settings.AUTH_USER_CACHE_TTL)
+    _token_cache = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE, ttl=settings.AUTH_TOKEN_CACHE_TTL)
+    # Фильтр отозванных токенов: None, пока он не загружен из БД
+    _revoked_filter: BloomFilter | None = None
 
     # Пароль
     @classmethod
-    def get_hashed_password(cls, password: str) -> str:
+    async def _run_hashing(cls, func, *args):
+        """Выполнение хеширования в пуле потоков; при переполненной очереди - 503"""
+        if cls._hash_slots.locked():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Сервер перегружен, повторите попытку позже",
+                headers={"Retry-After": "1"},
+            )
+        async with cls._hash_slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(cls._hash_executor, func, *args)
+
+    @classmethod
+    async def get_hashed_password(cls, password: str) -> str:
         """Хеширование пароля"""
-        return cls.pwd_context.hash(password)
+        return await cls._run_hashing(cls.pwd_context.hash, password)
 
     @classmethod
-    def verify_password(cls, plain_password: str, hashed_password: str) -> bool:
+    async def verify_password(cls, plain_password: str, hashed_password: str) -> bool:
         """Проверка пароля"""
-        return cls.pwd_context.verify(plain_password, hashed_password)
+        return await cls._run_hashing(cls.pwd_context.verify, plain_password, hashed_password)
 
     # JWT
     @classmethod
@@ -38,7 +76,7 @@ class Security:
         """Создание access токена"""
         to_encode = data.copy()
         expire = datetime.now(timezone.utc) + timedelta(days=365)
-        to_encode.update({"exp": expire})
+        to_encode.update({"exp": expire, "jti": uuid4().hex})
         encoded_jwt = jwt.encode(
             claims=to_encode,
             key=settings.JWT_SECRET,
@@ -69,12 +107,76 @@ class Security:
             )
         return payload
 
+    @staticmethod
+    def get_token_jti(token: str, payload: dict) -> str:
+        """Идентификатор токена для BlackList: jti, либо sha256 токена, выданного без jti"""
+        return payload.get("jti") or hashlib.sha256(token.encode("utf-8")).hexdigest()
+
     @classmethod
     async def disability_token(cls, token: str) -> None:
         """Добавление токена в BlackList"""
         token_data = cls.verify_and_decode_token(token)
+        jti = cls.get_token_jti(token, token_data)
         expires_at = datetime.fromtimestamp(token_data.get("exp"), tz=timezone.utc)
-        await BlackListTokenDAO.create(token=token, expires_at=expires_at)
+        await BlackListTokenDAO.create(jti=jti, expires_at=expires_at)
+        if cls._revoked_filter is not None:
+            cls._revoked_filter.add(jti)
+        cls._token_cache.set(jti, True)
+
+    @classmethod
+    async def is_token_revoked(cls, jti: str) -> bool:
+        """
+        Проверка токена по BlackList: сначала кэш, затем фильтр (токены, которых в нем нет,
+        не отзывались и проверяются без обращения к БД), затем индекс по jti
+        """
+        revoked = cls._token_cache.get(jti)
+        if revoked is not None:
+            return revoked
+        if cls._revoked_filter is not None and jti not in cls._revoked_filter:
+            return False
+        revoked = await BlackListTokenDAO.find_one_or_none(jti=jti) is not None
+        cls._token_cache.set(jti, revoked)
+        return revoked
+
+    @classmethod
+    async def refresh_revoked_tokens(cls) -> None:
+        """Удаление истекших записей BlackList и пересборка фильтра отозванных токенов"""
+        await BlackListTokenDAO.delete_expired()
+        jtis = await BlackListTokenDAO.get_active_jtis()
+        revoked_filter = BloomFilter(capacity=max(settings.REVOCATION_FILTER_CAPACITY, 2 * len(jtis)))
+        for jti in jtis:
+            revoked_filter.add(jti)
+        cls._revoked_filter = revoked_filter
+
+    @classmethod
+    async def run_revocation_maintenance(cls) -> None:
+        """Фоновая задача: периодическое обновление BlackList (отзывы из других процессов, очистка)"""
+        while True:
+            try:
+                await cls.refresh_revoked_tokens()
+            except (SQLAlchemyError, OSError):
+                logger.warning("Не удалось обновить список отозванных токенов", exc_info=True)
+            await asyncio.sleep(settings.REVOCATION_REFRESH_INTERVAL)
+
+    # Пользователи
+    @classmethod
+    async def get_user(cls, user_id: int) -> UserDB | None:
+        """Получение пользователя по id с кэшированием"""
+        user = cls._user_cache.get(user_id)
+        if user is None:
+            # Из основной БД: кэш сбрасывается после изменения пользователя, реплика может отставать
+            with UnitOfWork.primary_reads():
+                user = await UserDAO.find_by_id(user_id)
+            if not user:
+                return None
+            user = UserDB.model_validate(user, from_attributes=True)
+            cls._user_cache.set(user_id, user)
+        return user
+
+    @classmethod
+    def invalidate_user(cls, user_id: int) -> None:
+        """Сброс пользователя из кэша после фиксации изменений"""
+        UnitOfWork.on_commit(lambda: cls._user_cache.pop(user_id))
 
     # Аутентификация
     @classmethod
@@ -88,7 +190,7 @@ class Security:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        if not cls.verify_password(password, user.hashed_password):
+        if not await cls.verify_password(password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Не верный логин или пароль",
@@ -99,15 +201,15 @@ class Security:
     @classmethod
     async def get_current_user(cls, token: str = Depends(oauth2_scheme)) -> UserDB:
         """Получение текущего пользователя"""
-        if await BlackListTokenDAO.find_one_or_none(token=token):
+        payload = cls.verify_and_decode_token(token)
+        if await cls.is_token_revoked(cls.get_token_jti(token, payload)):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Не валидиный токен",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        payload = cls.verify_and_decode_token(token)
         payload["sub"] = int(payload["sub"])
-        user = await UserDAO.find_by_id(payload.get("sub"))
+        user = await cls.get_user(payload.get("sub"))
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,166 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import DataVersions
+from app.core.config import settings
+from app.core.database import async_session_maker, read_session_maker, replica_session_makers
+
+
+# Сессия текущего запроса
+_current_session: ContextVar[AsyncSession | None] = ContextVar("current_session", default=None)
+# Сессия чтения с реплики текущего запроса (открывается при первом чтении)
+_read_sessions: ContextVar[list[AsyncSession] | None] = ContextVar("read_sessions", default=None)
+# Чтение только из основной БД (клиент недавно записывал данные, загрузка кэшей)
+_primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
+# Таблицы, измененные в текущем запросе
+_touched_tables: ContextVar[set[str] | None] = ContextVar("touched_tables", default=None)
+# Действия после коммита текущего запроса
+_commit_callbacks: ContextVar[list[Callable[[], None]] | None] = ContextVar("commit_callbacks", default=None)
+
+# Окно чтения из основной БД после записи передается клиенту (cookie и заголовок ответа) и возвращается
+# им в следующих запросах: любой процесс приложения видит, что клиент недавно записывал данные
+READ_YOUR_WRITES_COOKIE = "rw_until"
+READ_YOUR_WRITES_HEADER = "x-read-your-writes-until"
+# Ключ ASGI scope: запрос зафиксировал запись, окно выдается в ответе
+_SCOPE_WROTE = "uow.wrote_until"
+
+
+def _reads_own_writes(request: Request) -> bool:
+    """Клиент записывал данные в последние DB_READ_YOUR_WRITES_SECONDS (по cookie или заголовку)"""
+    value = request.cookies.get(READ_YOUR_WRITES_COOKIE) or request.headers.get(READ_YOUR_WRITES_HEADER)
+    try:
+        until = float(value)
+    except (TypeError, ValueError):
+        return False
+    now = time.time()
+    # Значение от клиента: окно не может быть длиннее настроенного
+    return now < until <= now + settings.DB_READ_YOUR_WRITES_SECONDS
+
+
+class UnitOfWork:
+    """
+    Единица работы на время HTTP запроса: одна сессия, одна транзакция и один коммит.
+    Все DAO внутри запроса используют эту сессию вместо открытия собственной.
+    При настроенных репликах чтение до первой записи идет через отдельную сессию реплики
+    """
+
+    @classmethod
+    def current_session(cls) -> AsyncSession | None:
+        """Сессия текущего запроса, если она открыта"""
+        return _current_session.get()
+
+    @classmethod
+    def read_session(cls) -> AsyncSession | None:
+        """
+        Сессия для чтения в запросе: реплика, пока запрос ничего не записал и клиент
+        не записывал данные в последние DB_READ_YOUR_WRITES_SECONDS (окно приходит от клиента
+        в cookie или заголовке, см. ReadYourWritesMiddleware), иначе сессия запроса
+        """
+        session = _current_session.get()
+        read_sessions = _read_sessions.get()
+        if session is None or read_sessions is None or _primary_reads.get() or _touched_tables.get():
+            return session
+        if not read_sessions:
+            read_sessions.append(read_session_maker()())
+        return read_sessions[0]
+
+    @classmethod
+    def reads_from_primary(cls) -> bool:
+        """Чтение вне запроса идет из основной БД (внутри primary_reads)"""
+        return _primary_reads.get()
+
+    @classmethod
+    @contextmanager
+    def primary_reads(cls):
+        """Чтение из основной БД внутри блока: загрузка кэшей, версия которых меняется при записи"""
+        token = _primary_reads.set(True)
+        try:
+            yield
+        finally:
+            _primary_reads.reset(token)
+
+    @classmethod
+    def touch(cls, table: str) -> None:
+        """Отметка об изменении таблицы, версия увеличится после коммита"""
+        touched = _touched_tables.get()
+        if touched is None:
+            DataVersions.bump(table)
+        else:
+            touched.add(table)
+
+    @classmethod
+    def on_commit(cls, callback: Callable[[], None]) -> None:
+        """Выполнение действия после коммита запроса (сразу, если запроса нет)"""
+        callbacks = _commit_callbacks.get()
+        if callbacks is None:
+            callback()
+        else:
+            callbacks.append(callback)
+
+    @classmethod
+    async def begin(cls, request: Request):
+        """Зависимость FastAPI: открывает сессию на запрос, фиксирует или откатывает транзакцию"""
+        async with async_session_maker() as session:
+            touched = set()
+            callbacks = []
+            read_sessions = [] if replica_session_makers else None
+            _current_session.set(session)
+            _read_sessions.set(read_sessions)
+            _primary_reads.set(_reads_own_writes(request))
+            _touched_tables.set(touched)
+            _commit_callbacks.set(callbacks)
+            try:
+                yield session
+                await session.commit()
+                DataVersions.bump(*touched)
+                if touched:
+                    # Ответ еще не отправлен: окно добавит ReadYourWritesMiddleware
+                    request.scope[_SCOPE_WROTE] = time.time() + settings.DB_READ_YOUR_WRITES_SECONDS
+                for callback in callbacks:
+                    callback()
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                for read_session in read_sessions or ():
+                    await read_session.close()
+                _current_session.set(None)
+                _read_sessions.set(None)
+                _primary_reads.set(False)
+                _touched_tables.set(None)
+                _commit_callbacks.set(None)
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware: после запроса с зафиксированной записью отдает клиенту окно чтения из основной БД
+    (cookie и заголовок с временем окончания). Окно хранится у клиента, поэтому действует
+    для любого процесса приложения, на который попадет следующий запрос
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_window(message):
+            until = scope.get(_SCOPE_WROTE)
+            if message["type"] == "http.response.start" and until is not None:
+                value = f"{until:.3f}"
+                max_age = int(settings.DB_READ_YOUR_WRITES_SECONDS) + 1
+                cookie = f"{READ_YOUR_WRITES_COOKIE}={value}; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.encode("latin-1")),
+                    (READ_YOUR_WRITES_HEADER.encode("latin-1"), value.encode("latin-1")),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_window)
@@ -1,6 +1,24 @@
+from sqlalchemy import select, delete, func
+
 from app.base.dao import BaseDAO
 from app.domains.auth.models import BlackListToken
 
 
 class BlackListTokenDAO(BaseDAO):
     model = BlackListToken
+
+    @classmethod
+    async def get_active_jtis(cls) -> list[str]:
+        """Идентификаторы отозванных токенов, срок действия которых не истек"""
+        async with cls._session() as session:
+            query = select(cls.model.jti).where(cls.model.expires_at > func.now())
+            result = await session.execute(query)
+            return result.scalars().all()
+
+    @classmethod
+    async def delete_expired(cls) -> int:
+        """Удаление записей об истекших токенах"""
+        async with cls._session(write=True) as session:
+            query = delete(cls.model).where(cls.model.expires_at <= func.now())
+            result = await session.execute(query)
+            return result.rowcount
@@ -10,5 +10,6 @@ class BlackListToken(Base):
 
     # Атрибуты
     id = Column(Integer, primary_key=True, autoincrement=True)
-    token = Column(String, nullable=False)
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    # jti токена, либо sha256 токена без jti
+    jti = Column(String(64), nullable=False, unique=True, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -43,7 +43,7 @@ class AuthService:
             )
         user_id = await UserDAO.create(
             username=register_data.username,
-            hashed_password=Security.get_hashed_password(register_data.password),
+            hashed_password=await Security.get_hashed_password(register_data.password),
             first_name=register_data.first_name,
             last_name=register_data.last_name,
             patronymic=register_data.patronymic,
@@ -0,0 +1,43 @@
+from datetime import date, datetime
+
+from pydantic import BaseModel, Field
+
+
+class DashboardCount(BaseModel):
+    """Число задач по значению справочника"""
+    id: int
+    name: str
+    tasks: int
+    overdue: int
+
+
+class DashboardProject(BaseModel):
+    """Прогресс проекта"""
+    id: int
+    title: str
+    status: str
+    due_date: date | None
+    tasks_total: int
+    tasks_done: int
+    tasks_overdue: int
+    progress: float = Field(description="Доля завершенных задач, 0..1")
+
+
+class DashboardUser(BaseModel):
+    """Незавершенные задачи исполнителя"""
+    id: int
+    first_name: str
+    last_name: str
+    open_tasks: int
+    overdue_tasks: int
+
+
+class DashboardResponse(BaseModel):
+    """Сводка менеджера по задачам, проектам и исполнителям"""
+    tasks_total: int
+    tasks_overdue: int
+    by_status: list[DashboardCount]
+    by_priority: list[DashboardCount]
+    projects: list[DashboardProject]
+    users: list[DashboardUser] = Field(description="Исполнители с незавершенными задачами, по убыванию их числа")
+    generated_at: datetime = Field(description="Время расчета; сводка кэшируется на DASHBOARD_CACHE_TTL секунд")
@@ -0,0 +1,99 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app.base.reference import ReferenceCache
+from app.core.cache import DataVersions, TTLCache
+from app.core.config import settings
+from app.core.uow import UnitOfWork
+from app.domains.manager.services import ManagerService
+from app.domains.tasks.models import TASK_STATUS_DONE
+
+# DAOs
+from app.domains.tasks.dao import TaskDAO, TaskAssignmentDAO, TaskStatusDAO, TaskPriorityDAO
+from app.domains.projects.dao import ProjectDAO, ProjectStatusDAO
+
+# Схемы
+from app.domains.users.schemas import UserDB
+from app.domains.manager.dashboard.schemas import (
+    DashboardCount,
+    DashboardProject,
+    DashboardUser,
+    DashboardResponse,
+)
+
+# Таблицы, запись в которые этим процессом сбрасывает кэш сводки
+DASHBOARD_TABLES = ("tasks", "task_assignments", "projects", "users")
+
+
+class ManagerDashboardService(ManagerService):
+    # Ключ - версии таблиц сводки: запись этим процессом дает новый ключ, записи других процессов - по TTL
+    _cache = TTLCache(maxsize=4, ttl=settings.DASHBOARD_CACHE_TTL)
+    _lock = asyncio.Lock()
+
+    @classmethod
+    async def get_dashboard(
+        cls,
+        current_user: UserDB
+    ) -> DashboardResponse:
+        cls._check_role(current_user.role.name)
+        key = tuple(DataVersions.get(table) for table in DASHBOARD_TABLES)
+        dashboard = cls._cache.get(key)
+        if dashboard is None:
+            # Одновременные запросы ждут одного расчета вместо параллельных агрегатов
+            async with cls._lock:
+                dashboard = cls._cache.get(key)
+                if dashboard is None:
+                    # Из основной БД: ключ - версии этого процесса, которые меняются сразу после записи,
+                    # а реплика может еще отдавать данные до нее
+                    with UnitOfWork.primary_reads():
+                        dashboard = await cls._build()
+                    cls._cache.set(key, dashboard)
+        return dashboard
+
+    @classmethod
+    async def _build(cls) -> DashboardResponse:
+        """Сводка из трех запросов с GROUP BY; названия статусов и приоритетов - из кэша справочников"""
+        task_statuses = (await ReferenceCache.get(TaskStatusDAO)).names
+        task_priorities = (await ReferenceCache.get(TaskPriorityDAO)).names
+        project_statuses = (await ReferenceCache.get(ProjectStatusDAO)).names
+        done = [status_id for status_id, name in task_statuses.items() if name == TASK_STATUS_DONE]
+
+        by_status = {status_id: [0, 0] for status_id in task_statuses}
+        by_priority = {priority_id: [0, 0] for priority_id in task_priorities}
+        for row in await TaskDAO.count_by_status_priority(done):
+            for counts in (by_status.setdefault(row.status_id, [0, 0]), by_priority.setdefault(row.priority_id, [0, 0])):
+                counts[0] += row.tasks
+                counts[1] += row.overdue
+
+        projects = [
+            DashboardProject(
+                id=row.id,
+                title=row.title,
+                status=project_statuses.get(row.status_id, ""),
+                due_date=row.due_date,
+                tasks_total=row.tasks_total,
+                tasks_done=row.tasks_done,
+                tasks_overdue=row.tasks_overdue,
+                progress=round(row.tasks_done / row.tasks_total, 4) if row.tasks_total else 0.0,
+            ) for row in await ProjectDAO.get_progress_rows(done)
+        ]
+        users = [
+            DashboardUser.model_validate(row, from_attributes=True)
+            for row in await TaskAssignmentDAO.count_open_by_user(done)
+        ]
+        return DashboardResponse(
+            tasks_total=sum(tasks for tasks, _ in by_status.values()),
+            tasks_overdue=sum(overdue for _, overdue in by_status.values()),
+            by_status=cls._counts(by_status, task_statuses),
+            by_priority=cls._counts(by_priority, task_priorities),
+            projects=projects,
+            users=users,
+            generated_at=datetime.now(timezone.utc),
+        )
+
+    @staticmethod
+    def _counts(counts: dict[int, list[int]], names: dict[int, str]) -> list[DashboardCount]:
+        return [
+            DashboardCount(id=item_id, name=names.get(item_id, ""), tasks=tasks, overdue=overdue)
+            for item_id, (tasks, overdue) in sorted(counts.items())
+        ]
@@ -1,47 +1,53 @@
 from fastapi import HTTPException, status
 
+from app.base.errors import integrity_errors
+from app.base.reference import ReferenceCache
 from app.domains.manager.services import ManagerService
+from app.domains.tasks.models import TASK_STATUS_DONE
 # DAOs
-from app.domains.projects.dao import ProjectDAO, ProjectMemberDAO, ProjectStatusDAO
+from app.domains.projects.dao import ProjectDAO, ProjectMemberDAO, ProjectStatsDAO
 from app.domains.users.dao import UserDAO
+from app.domains.tasks.dao import TaskDAO, TaskStatusDAO
 # Схемы
 from app.domains.users.schemas import UserDB, UserResponse
 from app.domains.tasks.schemas import TaskResponse
 from app.domains.projects.schemas import (
     # Ответы
-    ProjectResponse,
+    ProjectProgressResponse,
     # Запросы
     ProjectCreate,
-    ProjectUpdate
+    ProjectUpdate,
+    ProjectListParams
 )
-from app.base.schemas import MessageResponse
+from app.base.schemas import MessageResponse, Page, UserIdsRequest, BulkResponse
 
 
+# Ответы на нарушения ограничений при записи проектов и участников
+PROJECT_CONSTRAINTS = {
+    "projects_status_id_fkey": (status.HTTP_404_NOT_FOUND, "Статус не найден"),
+    "project_members_project_id_fkey": (status.HTTP_404_NOT_FOUND, "Проект не найден"),
+    "project_members_user_id_fkey": (status.HTTP_404_NOT_FOUND, "Пользователь не найден"),
+    "uq_project_members_project_id_user_id": (status.HTTP_400_BAD_REQUEST, "Пользователь уже добавлен в проект"),
+}
+
 class ManagerProjectService(ManagerService):
     @classmethod
     async def get_projects(
         cls,
+        params: ProjectListParams,
         current_user: UserDB
-    ):
+    ) -> Page[ProjectProgressResponse]:
         cls._check_role(current_user.role.name)
-        projects = await ProjectDAO.find_all()
-        return [
-            ProjectResponse(
-                id=project.id,
-                title=project.title,
-                description=project.description,
-                start_date=project.start_date,
-                due_date=project.due_date,
-                status=project.status.name
-            ) for project in projects
-        ]
+        projects, next_cursor = await ProjectDAO.get_projects(**params.model_dump())
+        items = await cls._with_progress(projects)
+        return Page[ProjectProgressResponse](items=items, next_cursor=next_cursor)
 
     @classmethod
     async def get_project(
         cls,
         project_id: int,
         current_user: UserDB
-    ) -> ProjectResponse:
+    ) -> ProjectProgressResponse:
         cls._check_role(current_user.role.name)
         project = await ProjectDAO.find_by_id(project_id)
         if not project:
@@ -49,14 +55,33 @@ class ManagerProjectService(ManagerService):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Проект не найден"
             )
-        return ProjectResponse(
-            id=project.id,
-            title=project.title,
-            description=project.description,
-            start_date=project.start_date,
-            due_date=project.due_date,
-            status=project.status.name
-        )
+        return (await cls._with_progress([project]))[0]
+
+    @classmethod
+    async def _with_progress(cls, projects: list) -> list[ProjectProgressResponse]:
+        """Проекты с прогрессом задач: один запрос к project_stats на страницу"""
+        if not projects:
+            return []
+        task_statuses = (await ReferenceCache.get(TaskStatusDAO)).names
+        done = [status_id for status_id, name in task_statuses.items() if name == TASK_STATUS_DONE]
+        progress = await ProjectStatsDAO.get_progress([project.id for project in projects], done)
+        items = []
+        for project in projects:
+            stats = progress.get(project.id)
+            items.append(ProjectProgressResponse(
+                id=project.id,
+                title=project.title,
+                description=project.description,
+                start_date=project.start_date,
+                due_date=project.due_date,
+                status=project.status.name,
+                tasks_total=stats.tasks_total if stats else 0,
+                tasks_done=stats.tasks_done if stats else 0,
+                tasks_overdue=stats.tasks_overdue if stats else 0,
+                progress=round(stats.tasks_done / stats.tasks_total, 4) if stats and stats.tasks_total else 0.0,
+                last_activity_at=stats.last_activity_at if stats else None,
+            ))
+        return items
     
     @classmethod
     async def create_project(
@@ -83,24 +108,20 @@ class ManagerProjectService(ManagerService):
         current_user: UserDB
     ) -> MessageResponse:
         cls._check_role(current_user.role.name)
-        if not await ProjectDAO.find_by_id(project_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Проект не найден"
+        with integrity_errors(PROJECT_CONSTRAINTS):
+            updated = await ProjectDAO.update(
+                model_id=project_id,
+                title=project_data.title,
+                description=project_data.description,
+                start_date=project_data.start_date,
+                due_date=project_data.due_date,
+                status_id=project_data.status_id
             )
-        if not await ProjectStatusDAO.find_by_id(project_data.status_id):
+        if not updated:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Статус не найден"
+                detail="Проект не найден"
             )
-        await ProjectDAO.update(
-            model_id=project_id,
-            title=project_data.title,
-            description=project_data.description,
-            start_date=project_data.start_date,
-            due_date=project_data.due_date,
-            status_id=project_data.status_id
-        )
         return MessageResponse(
             message="Проект успешно обновлен"
         )
@@ -112,12 +133,11 @@ class ManagerProjectService(ManagerService):
         current_user: UserDB
     ) -> MessageResponse:
         cls._check_role(current_user.role.name)
-        if not await ProjectDAO.find_by_id(project_id):
+        if not await ProjectDAO.delete(model_id=project_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Проект не найден"
             )
-        await ProjectDAO.delete(model_id=project_id)
         return MessageResponse(
             message="Проект успешно удален"
         )
@@ -149,62 +169,72 @@ class ManagerProjectService(ManagerService):
         current_user: UserDB
     ) -> MessageResponse:
         cls._check_role(current_user.role.name)
-        if not await UserDAO.find_by_id(user_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Пользователь не найден"
-            )
-        if not await ProjectDAO.find_by_id(project_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Проект не найден"
+        with integrity_errors(PROJECT_CONSTRAINTS):
+            await ProjectMemberDAO.create(
+                project_id=project_id,
+                user_id=user_id
             )
-        if await ProjectMemberDAO.find_one_or_none(
-            project_id=project_id,
-            user_id=user_id
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Пользователь уже добавлен в проект"
-            )
-        await ProjectMemberDAO.create(
-            project_id=project_id,
-            user_id=user_id
-        )
         return MessageResponse(
             message="Пользователь успешно добавлен в проект"
         )
 
     @classmethod
-    async def remove_project_member(
+    async def add_project_members(
         cls,
         project_id: int,
-        user_id: int,
+        data: UserIdsRequest,
         current_user: UserDB
-    ) -> MessageResponse:
+    ) -> BulkResponse:
         cls._check_role(current_user.role.name)
-        if not await UserDAO.find_by_id(user_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Пользователь не найден"
-            )
-        if not await ProjectDAO.find_by_id(project_id):
+        user_ids = await cls._check_users(data.user_ids)
+        with integrity_errors(PROJECT_CONSTRAINTS):
+            added = await ProjectMemberDAO.add_users(project_id, user_ids)
+        return cls._bulk_response("Пользователи добавлены в проект", user_ids, added)
+
+    @classmethod
+    async def remove_project_members(
+        cls,
+        project_id: int,
+        user_ids: list[int],
+        current_user: UserDB
+    ) -> BulkResponse:
+        cls._check_role(current_user.role.name)
+        user_ids = await cls._check_users(user_ids)
+        removed = await ProjectMemberDAO.remove_users(project_id, user_ids)
+        if not removed and not await ProjectDAO.find_by_id(project_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Проект не найден"
             )
-        if not await ProjectMemberDAO.find_one_or_none(
+        return cls._bulk_response("Пользователи удалены из проекта", user_ids, removed)
+
+    @classmethod
+    async def remove_project_member(
+        cls,
+        project_id: int,
+        user_id: int,
+        current_user: UserDB
+    ) -> MessageResponse:
+        cls._check_role(current_user.role.name)
+        if not await ProjectMemberDAO.delete_by_filter(
             project_id=project_id,
             user_id=user_id
         ):
+            # Причина уточняется только при неудаче, успешное удаление - один запрос
+            if not await UserDAO.find_by_id(user_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Пользователь не найден"
+                )
+            if not await ProjectDAO.find_by_id(project_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Проект не найден"
+                )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Пользователь не найден в проекте"
             )
-        await ProjectMemberDAO.delete_by_filter(
-            project_id=project_id,
-            user_id=user_id
-        )
         return MessageResponse(
             message="Пользователь успешно удален из проекта"
         )
@@ -221,17 +251,5 @@ class ManagerProjectService(ManagerService):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Проект не найден"
             )
-        tasks = await ProjectDAO.get_project_tasks(project_id=project_id)
-        tasks = tasks.tasks
-        return [
-            TaskResponse(
-                id=task.id,
-                title=task.title,
-                description=task.description,
-                start_date=task.start_date,
-                due_date=task.due_date,
-                status=task.status.name,
-                priority=task.priority.name
-            )
-            for task in tasks
-        ]
\ No newline at end of file
+        tasks = await TaskDAO.get_project_task_rows(project_id)
+        return [TaskResponse.model_validate(task, from_attributes=True) for task in tasks]
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""
+Формирование листов и файлов массовой выгрузки. Функции выполняются в пуле процессов:
+принимают готовые ячейки (см. layouts) и возвращают байты
+"""
+import re
+
+from app.domains.manager.reports import layouts
+from app.domains.manager.reports.xlsx import ChunkBuffer, SheetWriter, XlsxWriter
+
+_SHEETS = {
+    "projects": layouts.write_project_sheet,
+    "users": layouts.write_user_sheet,
+}
+
+_SHEET_TITLE_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+
+def sheet_title(entity_id: int, name: str) -> str:
+    """Название листа: уникально за счет id, без запрещенных в Excel символов"""
+    return _SHEET_TITLE_CHARS.sub(" ", f"{entity_id}. {name}")[:31]
+
+
+def render_sheet(scope: str, payload: tuple) -> bytes:
+    """XML листа сущности для общей книги"""
+    buffer = ChunkBuffer()
+    sheet = SheetWriter(buffer)
+    _SHEETS[scope](sheet, *payload)
+    sheet.close()
+    return buffer.drain()
+
+
+def render_workbook(scope: str, title: str, payload: tuple) -> bytes:
+    """Отдельный файл XLSX сущности"""
+    book = XlsxWriter()
+    _SHEETS[scope](book.add_sheet(title), *payload)
+    return book.close()
@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.domains.manager.reports.renderer import ReportRenderer
+from app.domains.manager.reports.schemas import ReportJob
+
+logger = logging.getLogger(__name__)
+
+# Интервал удаления файлов с истекшим сроком хранения, секунды
+CLEANUP_INTERVAL = 60
+
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ReportJobs:
+    """
+    Фоновое формирование отчётов: задание ставится в очередь процесса, обработчик формирует файл
+    и сохраняет его на диск на REPORT_JOB_TTL секунд. ID задания вычисляется из (вид, id, версия данных),
+    поэтому повторный запрос того же отчёта по неизменным данным возвращает существующее задание.
+    Состояние задания хранится рядом с файлом, его видят все процессы с общим каталогом
+    """
+
+    directory = Path(settings.REPORT_JOBS_DIR)
+    _queue: asyncio.Queue[ReportJob] = asyncio.Queue()
+    # Задания, которые ожидают или формируются в текущем процессе
+    _pending: dict[str, ReportJob] = {}
+
+    # Файлы
+    @classmethod
+    def _meta_path(cls, job_id: str) -> Path:
+        return cls.directory / f"{job_id}.json"
+
+    @classmethod
+    def artifact_path(cls, job: ReportJob) -> Path:
+        """Файл готового отчёта"""
+        return cls.directory / f"{job.id}.xlsx"
+
+    @classmethod
+    def _save(cls, job: ReportJob) -> None:
+        cls.directory.mkdir(parents=True, exist_ok=True)
+        path = cls._meta_path(job.id)
+        temporary = path.with_suffix(".json.tmp")
+        temporary.write_text(job.model_dump_json(), encoding="utf-8")
+        os.replace(temporary, path)
+
+    @classmethod
+    def _load(cls, job_id: str) -> ReportJob | None:
+        try:
+            return ReportJob.model_validate_json(cls._meta_path(job_id).read_text(encoding="utf-8"))
+        except (OSError, ValidationError):
+            return None
+
+    # Задания
+    @staticmethod
+    def job_id(kind: str, entity_id: int, version: str) -> str:
+        return hashlib.sha1(f"{kind}:{entity_id}:{version}".encode("utf-8")).hexdigest()[:32]
+
+    @classmethod
+    def get(cls, job_id: str) -> ReportJob | None:
+        """Задание по ID; None, если его нет или срок хранения истек"""
+        if not _JOB_ID.match(job_id):
+            return None
+        job = cls._pending.get(job_id) or cls._load(job_id)
+        if job is None or cls._is_expired(job):
+            return None
+        return job
+
+    @staticmethod
+    def _is_expired(job: ReportJob) -> bool:
+        now = datetime.now(timezone.utc)
+        if job.expires_at is not None:
+            return job.expires_at <= now
+        # Задание, не завершенное за срок хранения, считается потерянным (процесс был остановлен)
+        return job.created_at + timedelta(seconds=settings.REPORT_JOB_TTL) <= now
+
+    @classmethod
+    def submit(cls, kind: str, entity_id: int, version: str) -> ReportJob:
+        """Постановка отчёта в очередь, либо уже существующее задание по тем же данным"""
+        job_id = cls.job_id(kind, entity_id, version)
+        job = cls.get(job_id)
+        if job is not None and job.status != "failed":
+            return job
+        job = ReportJob(
+            id=job_id,
+            kind=kind,
+            entity_id=entity_id,
+            version=version,
+            created_at=datetime.now(timezone.utc),
+        )
+        cls._pending[job.id] = job
+        cls._save(job)
+        cls._queue.put_nowait(job)
+        return job
+
+    # Обработка
+    @classmethod
+    async def _render(cls, job: ReportJob) -> None:
+        # Импорт здесь: сервис отчётов использует очередь заданий
+        from app.domains.manager.reports.services import ReportsService
+
+        job.status = "running"
+        cls._save(job)
+        path = cls.artifact_path(job)
+        temporary = path.with_suffix(".xlsx.part")
+        try:
+            filename, body = await ReportsService.build_report(job.kind, job.entity_id)
+            with open(temporary, "wb") as output:
+                async for chunk in body:
+                    await ReportRenderer.run(output.write, chunk)
+            os.replace(temporary, path)
+            job.status = "done"
+            job.filename = filename
+        except HTTPException as error:
+            job.status, job.error = "failed", error.detail
+        except Exception:
+            logger.exception("Ошибка формирования отчёта %s %s", job.kind, job.entity_id)
+            job.status, job.error = "failed", "Ошибка формирования отчёта"
+        finally:
+            temporary.unlink(missing_ok=True)
+        job.finished_at = datetime.now(timezone.utc)
+        job.expires_at = job.finished_at + timedelta(seconds=settings.REPORT_JOB_TTL)
+        cls._save(job)
+
+    @classmethod
+    async def run_worker(cls) -> None:
+        """Фоновая задача: обработчик очереди заданий"""
+        while True:
+            job = await cls._queue.get()
+            try:
+                await cls._render(job)
+            except OSError:
+                logger.exception("Не удалось сохранить отчёт %s", job.id)
+            finally:
+                cls._pending.pop(job.id, None)
+                cls._queue.task_done()
+
+    @classmethod
+    def cleanup(cls) -> None:
+        """Удаление заданий и файлов с истекшим сроком хранения"""
+        if not cls.directory.exists():
+            return
+        for meta in cls.directory.glob("*.json"):
+            job_id = meta.stem
+            if job_id in cls._pending:
+                continue
+            job = cls._load(job_id)
+            if job is None or cls._is_expired(job):
+                for path in (meta, cls.directory / f"{job_id}.xlsx", cls.directory / f"{job_id}.xlsx.part"):
+                    path.unlink(missing_ok=True)
+
+    @classmethod
+    async def run_cleanup(cls) -> None:
+        """Фоновая задача: периодическое удаление устаревших отчётов"""
+        while True:
+            try:
+                cls.cleanup()
+            except OSError:
+                logger.warning("Не удалось удалить устаревшие отчёты", exc_info=True)
+            await asyncio.sleep(CLEANUP_INTERVAL)
@@ -0,0 +1,212 @@
+"""
+Разметка листов отчётов: данные сущностей в ячейках и расположение блоков на листе.
+Модуль не зависит от БД: листы по готовым ячейкам собираются в том числе в пуле процессов
+"""
+from datetime import date
+
+from app.domains.manager.reports.xlsx import SheetWriter, THIN, BOLD, BOLD_CENTER, THIN_CENTER
+
+# Ширина левой таблицы листа (участники проекта, задачи пользователя), за ней - пустая колонка
+TABLE_WIDTH = 4
+
+
+# Ячейки
+def title(text: str, width: int) -> list:
+    """Заголовок блока на width колонок"""
+    return [(text, BOLD_CENTER)] + [(None, BOLD)] * (width - 1)
+
+
+def message(text: str, width: int) -> list:
+    """Сообщение об отсутствии данных на width колонок"""
+    return [(text, THIN_CENTER)] + [(None, THIN)] * (width - 1)
+
+
+def header(*names: str) -> list:
+    return [(name, BOLD) for name in names]
+
+
+def values(*items) -> list:
+    return [(item, THIN) for item in items]
+
+
+def format_date(value: date | None) -> str:
+    return value.strftime("%d.%m.%Y") if value else "Не указана"
+
+
+def join(left: list, right: list, width: int = TABLE_WIDTH) -> list:
+    """Строка из двух таблиц с пустой колонкой между ними"""
+    return left + [None] * (width - len(left) + 1) + right
+
+
+MEMBER_HEADER = header("Имя", "Фамилия", "Отчество", "Должность")
+PROJECT_TASK_HEADER = header("Название", "Описание", "Статус", "Дата начала", "Дата завершения", "Приоритет")
+USER_TASK_HEADER = header("Название задачи", "Статус", "Дата начала", "Дата завершения")
+USER_PROJECT_HEADER = header("Название проекта", "Описание", "Дата начала", "Дата завершения")
+
+
+# Данные сущностей
+def task_data(task) -> list[tuple[str, str]]:
+    return [
+        ("Название задачи", task.title),
+        ("Описание", task.description or "Не указано"),
+        ("Дата начала", format_date(task.start_date)),
+        ("Дата завершения", format_date(task.due_date)),
+        ("Статус", task.status.name),
+        ("Приоритет", task.priority.name),
+    ]
+
+
+def project_data(project) -> list[tuple[str, str]]:
+    return [
+        ("Название проекта", project.title),
+        ("Описание", project.description or "Не указано"),
+        ("Дата начала", format_date(project.start_date)),
+        ("Дата завершения", format_date(project.due_date)),
+        ("Статус", project.status.name),
+    ]
+
+
+def user_data(user) -> list[tuple[str, str]]:
+    return [
+        ("Имя", user.first_name),
+        ("Фамилия", user.last_name),
+        ("Отчество", user.patronymic if user.patronymic else "-"),
+        ("Должность", user.position.name if user.position else "Не указана"),
+    ]
+
+
+def member_row(user) -> list:
+    return values(
+        user.first_name,
+        user.last_name,
+        user.patronymic if user.patronymic else "-",
+        user.position.name if user.position else "Не указана",
+    )
+
+
+def project_task_row(task) -> list:
+    return values(
+        task.title,
+        task.description or "Не указано",
+        task.status.name,
+        format_date(task.start_date),
+        format_date(task.due_date),
+        task.priority.name,
+    )
+
+
+def user_task_row(task) -> list:
+    return values(task.title, task.status.name, format_date(task.start_date), format_date(task.due_date))
+
+
+def user_project_row(project) -> list:
+    return values(
+        project.title,
+        project.description or "Не указано",
+        format_date(project.start_date),
+        format_date(project.due_date),
+    )
+
+
+# Таблицы, загружаемые целиком (короткие списки)
+def members_table(rows: list[list]) -> list[list]:
+    return [MEMBER_HEADER] + rows if rows else [message("Нет участников проекта", TABLE_WIDTH)]
+
+
+def user_projects_table(rows: list[list]) -> list[list]:
+    return [USER_PROJECT_HEADER] + rows if rows else [message("Нет проектов у пользователя", TABLE_WIDTH)]
+
+
+# Листы
+def write_task_sheet(ws: SheetWriter, task: list, project: list, user_rows: list[list]) -> None:
+    """Лист отчёта по задаче"""
+    # Информация о задаче и проекте
+    ws.merge('A1:B1')
+    ws.merge('D1:E1')
+    ws.append(title("Задача", 2) + [None] + title("Проект, в которой задача", 2))
+    if not project:
+        ws.merge('D2:E2')
+    for i, (name, value) in enumerate(task):
+        row = values(name, value)
+        if i < len(project):
+            row += [None] + values(*project[i])
+        elif i == 0:
+            row += [None] + message("Задача не привязана к проекту", 2)
+        ws.append(row)
+    ws.append()
+
+    # Информация о пользователях
+    ws.merge('A9:D9')
+    ws.append(title("Участники задачи", 4))
+    if user_rows:
+        ws.append(MEMBER_HEADER)
+        for row in user_rows:
+            ws.append(row)
+    else:
+        ws.merge('A10:D10')
+        ws.append(message("Нет участников задачи", 4))
+
+
+def write_user_head(ws: SheetWriter, user: list, has_projects: bool) -> None:
+    """Информация о пользователе и заголовки таблиц задач и проектов (строки 1-8)"""
+    ws.merge('A1:B1')
+    ws.append(title("Пользователь", 2))
+    for name, value in user:
+        ws.append(values(name, value))
+    ws.append()
+    ws.append()
+
+    ws.merge('A8:D8')
+    ws.merge('F8:I8')
+    ws.append(title("Задачи пользователя", 4) + [None] + title("Проекты пользователя", 4))
+    if not has_projects:
+        ws.merge('F9:I9')
+
+
+def user_tasks_empty(ws: SheetWriter) -> list[list]:
+    """Строки таблицы задач пользователя без задач (сообщение под шапкой)"""
+    ws.merge('A10:D10')
+    return [[], message("Нет задач у пользователя", TABLE_WIDTH)]
+
+
+def write_project_head(ws: SheetWriter, project: list, has_members: bool) -> None:
+    """Информация о проекте и заголовки таблиц участников и задач (строки 1-8)"""
+    ws.merge('A1:B1')
+    ws.append(title("Проект", 2))
+    for name, value in project:
+        ws.append(values(name, value))
+    ws.append()
+
+    ws.merge('A8:D8')
+    ws.merge('F8:K8')
+    ws.append(title("Участники задачи", 4) + [None] + title("Задачи проекта", 6))
+    if not has_members:
+        ws.merge('A9:D9')
+
+
+def project_tasks_empty(ws: SheetWriter) -> list[list]:
+    """Строки таблицы задач проекта без задач"""
+    ws.merge('F9:K9')
+    return [message("Нет задач внутри проекта", 6)]
+
+
+def _write_alongside(ws: SheetWriter, left: list[list], right: list[list]) -> None:
+    for index in range(max(len(left), len(right))):
+        ws.append(join(
+            left[index] if index < len(left) else [],
+            right[index] if index < len(right) else [],
+        ))
+
+
+def write_user_sheet(ws: SheetWriter, user: list, task_rows: list[list], project_rows: list[list]) -> None:
+    """Лист отчёта по пользователю по загруженным данным"""
+    write_user_head(ws, user, has_projects=bool(project_rows))
+    tasks = [USER_TASK_HEADER] + task_rows if task_rows else user_tasks_empty(ws)
+    _write_alongside(ws, tasks, user_projects_table(project_rows))
+
+
+def write_project_sheet(ws: SheetWriter, project: list, member_rows: list[list], task_rows: list[list]) -> None:
+    """Лист отчёта по проекту по загруженным данным"""
+    write_project_head(ws, project, has_members=bool(member_rows))
+    tasks = [PROJECT_TASK_HEADER] + task_rows if task_rows else project_tasks_empty(ws)
+    _write_alongside(ws, members_table(member_rows), tasks)
@@ -0,0 +1,99 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from app.core.config import settings
+
+
+class ReportMetrics:
+    """Метрики формирования отчётов: очередь, активные отчёты и время формирования"""
+
+    def __init__(self):
+        self.queued = 0
+        self.queued_max = 0
+        self.active = 0
+        self.completed = 0
+        self.render_seconds_total = 0.0
+        self.queue_wait_seconds_max = 0.0
+
+
+class ReportRenderer:
+    """
+    Формирование отчётов вне event loop: сборка строк и сжатие XLSX выполняются в пуле потоков,
+    число одновременно формируемых отчётов ограничено, остальные ожидают своей очереди
+    """
+
+    _executor = ThreadPoolExecutor(max_workers=settings.REPORT_RENDER_WORKERS, thread_name_prefix="report")
+    # Пул процессов массовой выгрузки: создается при первом обращении
+    _process_executor: ProcessPoolExecutor | None = None
+    _slots = asyncio.Semaphore(settings.REPORT_RENDER_WORKERS)
+    metrics = ReportMetrics()
+
+    @classmethod
+    @asynccontextmanager
+    async def slot(cls):
+        """Слот на формирование одного отчёта"""
+        metrics = cls.metrics
+        metrics.queued += 1
+        metrics.queued_max = max(metrics.queued_max, metrics.queued)
+        started = time.perf_counter()
+        try:
+            await cls._slots.acquire()
+        finally:
+            metrics.queued -= 1
+        metrics.queue_wait_seconds_max = max(metrics.queue_wait_seconds_max, time.perf_counter() - started)
+        metrics.active += 1
+        try:
+            yield
+        finally:
+            metrics.active -= 1
+            metrics.completed += 1
+            cls._slots.release()
+
+    @classmethod
+    async def run(cls, func, *args):
+        """Выполнение части формирования отчёта в пуле потоков"""
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(cls._executor, func, *args)
+        finally:
+            cls.metrics.render_seconds_total += time.perf_counter() - started
+
+    @classmethod
+    async def run_in_process(cls, func, *args):
+        """Выполнение в пуле процессов: func и аргументы должны сериализоваться pickle"""
+        if cls._process_executor is None:
+            cls._process_executor = ProcessPoolExecutor(
+                max_workers=settings.REPORT_EXPORT_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(cls._process_executor, func, *args)
+        finally:
+            cls.metrics.render_seconds_total += time.perf_counter() - started
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Остановка пула процессов"""
+        if cls._process_executor is not None:
+            cls._process_executor.shutdown(cancel_futures=True)
+            cls._process_executor = None
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """Текущая очередь и загрузка пула отчётов"""
+        metrics = cls.metrics
+        return {
+            "workers": settings.REPORT_RENDER_WORKERS,
+            "active": metrics.active,
+            "queued": metrics.queued,
+            "queued_max": metrics.queued_max,
+            "completed": metrics.completed,
+            "render_seconds_total": round(metrics.render_seconds_total, 3),
+            "queue_wait_seconds_max": round(metrics.queue_wait_seconds_max, 3),
+        }
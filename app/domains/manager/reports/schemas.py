@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+ReportKind = Literal["task", "user", "project"]
+
+
+class ReportJobCreate(BaseModel):
+    """Задание на формирование отчёта"""
+    kind: ReportKind = Field(description="Вид отчёта: по задаче, пользователю или проекту")
+    entity_id: int = Field(description="ID задачи, пользователя или проекта")
+
+
+class ReportJob(BaseModel):
+    """Задание на формирование отчёта и его состояние"""
+    id: str
+    kind: ReportKind
+    entity_id: int
+    version: str = Field(description="Версия данных, по которым формируется отчёт")
+    status: Literal["queued", "running", "done", "failed"] = "queued"
+    filename: str | None = None
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+    expires_at: datetime | None = Field(None, description="Время удаления готового файла")
+
+
+class ReportExportParams(BaseModel):
+    """Параметры массовой выгрузки отчётов"""
+    scope: Literal["projects", "users"] = Field(description="Все проекты (с фильтром по статусу) или все пользователи")
+    status_id: int | None = Field(None, description="Статус проектов, только для scope=projects")
+    format: Literal["zip", "xlsx"] = Field(
+        "zip",
+        description="ZIP архив с файлом на каждую сущность, либо одна книга с листом на каждую сущность"
+    )
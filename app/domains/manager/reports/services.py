@@ -1,47 +1,120 @@
-from fastapi import HTTPException, status
-from fastapi.responses import StreamingResponse
-from openpyxl import Workbook
-from openpyxl.styles import Border, Alignment, Side
+import asyncio
+import zipfile
+from collections import defaultdict
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
 from datetime import date
-from io import BytesIO
+from typing import AsyncIterator
+from itertools import chain
 from urllib.parse import quote
 
+from app.base.reference import ReferenceCache
+from app.base.responses import etag_matches
+from app.core.cache import SizedLRUCache
+from app.core.config import settings
+from app.core.uow import UnitOfWork
+from app.domains.manager.reports.jobs import ReportJobs
+from app.domains.manager.reports.renderer import ReportRenderer
+from app.domains.manager.reports import export, layouts
+from app.domains.manager.reports.xlsx import ChunkBuffer, XlsxWriter, SheetWriter
+
 # DAOs
 from app.domains.tasks.dao import TaskDAO, TaskAssignmentDAO
-from app.domains.projects.dao import ProjectDAO, ProjectMemberDAO
+from app.domains.projects.dao import ProjectDAO, ProjectMemberDAO, ProjectStatusDAO
 from app.domains.users.dao import UserDAO
 
 # Схемы
 from app.domains.users.schemas import UserDB
+from app.domains.manager.reports.schemas import ReportJob, ReportJobCreate, ReportExportParams
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+ZIP_MEDIA_TYPE = "application/zip"
+
+
+async def _table(batches, header: list, to_row, empty):
+    """
+    Строки таблицы из порций курсора: шапка и записи, либо строки empty() при их отсутствии.
+    Записи преобразуются в ячейки лениво, уже в потоке формирования отчёта
+    """
+    first = True
+    async for batch in batches:
+        rows = map(to_row, batch)
+        if first:
+            rows = chain([header], rows)
+            first = False
+        yield rows
+    if first:
+        yield empty()
+
+
+async def _alongside(book: XlsxWriter, sheet: SheetWriter, streamed, fixed: list[list], streamed_left: bool):
+    """
+    Две таблицы рядом: порции из курсора и заранее загруженный короткий список.
+    Каждая порция записывается в пуле потоков, после нее отдаются готовые части файла
+    """
+    index = 0
+
+    def write(rows) -> bytes:
+        nonlocal index
+        for row in rows:
+            other = fixed[index] if index < len(fixed) else []
+            sheet.append(layouts.join(row, other) if streamed_left else layouts.join(other, row))
+            index += 1
+        return book.read()
 
-THIN_BORDER = Border(
-    left=Side(border_style="thin"),
-    right=Side(border_style="thin"),
-    top=Side(border_style="thin"),
-    bottom=Side(border_style="thin")
-)
+    def finish() -> bytes:
+        for other in fixed[index:]:
+            sheet.append(layouts.join([], other) if streamed_left else other)
+        return book.close()
 
-BOLD_BORDER = Border(
-    left=Side(border_style="thick"),
-    right=Side(border_style="thick"),
-    top=Side(border_style="thick"),
-    bottom=Side(border_style="thick")
-)
+    async for rows in streamed:
+        chunk = await ReportRenderer.run(write, rows)
+        if chunk:
+            yield chunk
+    yield await ReportRenderer.run(finish)
 
-ALIGN_CENTER = Alignment(horizontal="center", vertical="center")
+
+async def _in_slot(body):
+    """Формирование отчёта в очереди пула отчётов"""
+    async with ReportRenderer.slot():
+        async for chunk in body:
+            yield chunk
+
+
+def _filename(name: str) -> str:
+    return f"{name}_{date.today().isoformat()}"
+
+
+def attachment_headers(filename: str) -> dict:
+    """Заголовок скачивания файла отчёта"""
+    return {"Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}"}
+
+
+def _report_headers(filename: str, etag: str) -> dict:
+    """Заголовки отчёта: скачивание и ETag версии данных (браузер перепроверяет отчёт при каждом запросе)"""
+    return {**attachment_headers(filename), "ETag": etag, "Cache-Control": "private, no-cache"}
 
 
 class ReportsService:
+    """
+    Отчёты в XLSX. Файл формируется потоком: крупные выборки читаются из курсора БД порциями,
+    части файла отдаются клиенту по мере готовности, память не зависит от размера отчёта
+    """
+
+    # Готовые отчёты: ключ содержит версию данных, поэтому измененные данные в кэш не попадают
+    _cache = SizedLRUCache(max_bytes=settings.REPORT_CACHE_MAX_BYTES)
+
     @staticmethod
-    async def create_report_by_task(
-            task_id: int,
-            current_user: UserDB
-    ):
+    def _check_role(current_user: UserDB) -> None:
         if current_user.role.name != "Менеджер":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Пользователь не является менеджером"
             )
+
+    @staticmethod
+    async def _build_task_report(task_id: int):
         task = await TaskDAO.get_task_with_project(task_id)
         if not task:
             raise HTTPException(
@@ -49,379 +122,335 @@ class ReportsService:
                 detail="Задача не найдена"
             )
         users = await TaskAssignmentDAO.get_task_assignments(task_id)
-        wb = Workbook()
-        ws = wb.active
-        ws.title = f"Отчёт по задаче"
-
-        # Информация о задаче
-        ws.merge_cells('A1:B1')
-        ws['A1'].border = BOLD_BORDER
-        ws['A1'].alignment = ALIGN_CENTER
-        ws['B1'].border = BOLD_BORDER
-        ws['A1'] = "Задача"
-        task_data = [
-            ("Название задачи", task.title),
-            ("Описание", task.description or "Не указано"),
-            ("Дата начала", task.start_date.strftime("%d.%m.%Y")),
-            ("Дата завершения", task.due_date.strftime("%d.%m.%Y")),
-            ("Статус", task.status.name),
-            ("Приоритет", task.priority.name),
-        ]
-        for i, (header, value) in enumerate(task_data):
-            ws.cell(row=i + 2, column=1).value = header
-            ws.cell(row=i + 2, column=1).border = THIN_BORDER
-            ws.cell(row=i + 2, column=2).value = value
-            ws.cell(row=i + 2, column=2).border = THIN_BORDER
-
-        # Информация о проекте
-        ws.merge_cells('D1:E1')
-        ws['D1'] = "Проект, в которой задача"
-        ws['D1'].border = BOLD_BORDER
-        ws['E1'].border = BOLD_BORDER
-        ws['D1'].alignment = ALIGN_CENTER
-        if task.project:
-            project_data = [
-                ("Название проекта", task.project.title),
-                ("Описание", task.project.description or "Не указано"),
-                ("Дата начала", task.project.start_date.strftime("%d.%m.%Y")),
-                ("Дата завершения", task.project.due_date.strftime("%d.%m.%Y")),
-                ("Статус", task.project.status.name),
-            ]
-            for i, (header, value) in enumerate(project_data):
-                ws.cell(row=i + 2, column=4).value = header
-                ws.cell(row=i + 2, column=4).border = THIN_BORDER
-                ws.cell(row=i + 2, column=5).value = value
-                ws.cell(row=i + 2, column=5).border = THIN_BORDER
-        else:
-            ws.merge_cells('D2:E2')
-            ws['D2'] = "Задача не привязана к проекту"
-            ws['D2'].alignment = ALIGN_CENTER
-            ws['D2'].border = THIN_BORDER
-            ws['E2'].border = THIN_BORDER
-
-        # Информация о пользователях
-        ws.merge_cells('A9:D9')
-        ws['A9'] = "Участники задачи"
-        ws['A9'].border = BOLD_BORDER
-        ws['B9'].border = BOLD_BORDER
-        ws['C9'].border = BOLD_BORDER
-        ws['D9'].border = BOLD_BORDER
-        ws['A9'].alignment = ALIGN_CENTER
-        if users:
-            ws['A10'] = "Имя"
-            ws['A10'].border = BOLD_BORDER
-            ws['B10'] = "Фамилия"
-            ws['B10'].border = BOLD_BORDER
-            ws['C10'] = "Отчество"
-            ws['C10'].border = BOLD_BORDER
-            ws['D10'] = "Должность"
-            ws['D10'].border = BOLD_BORDER
-            row = 11
-            for user in users:
-                user_data = [
-                    user.user.first_name,
-                    user.user.last_name,
-                    user.user.patronymic if user.user.patronymic else "-",
-                    user.user.position.name if user.user.position else "Не указана",
-                ]
-                for i, value in enumerate(user_data):
-                    ws.cell(row=row, column=i + 1).value = value
-                    ws.cell(row=row, column=i + 1).border = THIN_BORDER
-                row += 1
-        else:
-            ws.merge_cells('A9:D9')
-            ws['A9'] = "Нет участников задачи"
-            ws['A9'].border = THIN_BORDER
-            ws['B9'].border = THIN_BORDER
-            ws['C9'].border = THIN_BORDER
-            ws['D9'].border = THIN_BORDER
-            ws['A9'].alignment = ALIGN_CENTER
-
-        # Сохранение отчёта
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        # Имя файла
-        filename = f"Report_task_{task.title}_{date.today().isoformat()}"
-        encoded_file_name = quote(filename)
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename*=UTF-8''{encoded_file_name}"}
-        )
+
+        task_data = layouts.task_data(task)
+        project_data = layouts.project_data(task.project) if task.project else []
+        user_rows = [layouts.member_row(user.user) for user in users]
+
+        def render():
+            book = XlsxWriter()
+            layouts.write_task_sheet(book.add_sheet("Отчёт по задаче"), task_data, project_data, user_rows)
+            return book.close()
+
+        async def body():
+            yield await ReportRenderer.run(render)
+
+        return f"Report_task_{task.title}", _in_slot(body())
 
     @staticmethod
-    async def create_report_by_user(
-            user_id: int,
-            current_user: UserDB
-    ):
-        if current_user.role.name != "Менеджер":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Пользователь не является менеджером"
-            )
+    async def _build_user_report(user_id: int):
         user = await UserDAO.find_by_id(user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Пользователь не найден"
             )
-        tasks = await TaskAssignmentDAO.get_user_tasks(user_id)
-
         projects = await ProjectMemberDAO.get_user_projects(user_id)
+        # Курсор читается после выхода из запроса: источник фиксируется сейчас
+        primary = UnitOfWork.reads_from_primary()
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = f"Отчёт по пользователю"
-
-        # Информация о пользователе
-        ws.merge_cells('A1:B1')
-        ws['A1'] = "Пользователь"
-        ws['A1'].border = BOLD_BORDER
-        ws['B1'].border = BOLD_BORDER
-        ws['A1'].alignment = ALIGN_CENTER
-        user_data = [
-            ("Имя", user.first_name),
-            ("Фамилия", user.last_name),
-            ("Отчество", user.patronymic if user.patronymic else "-"),
-            ("Должность", user.position.name if user.position else "Не указана"),
-        ]
-        for i, (header, value) in enumerate(user_data):
-            ws.cell(row=i + 2, column=1).value = header
-            ws.cell(row=i + 2, column=1).border = THIN_BORDER
-            ws.cell(row=i + 2, column=2).value = value
-            ws.cell(row=i + 2, column=2).border = THIN_BORDER
-
-        # Задачи пользователя
-        ws.merge_cells('A8:D8')
-        ws['A8'] = "Задачи пользователя"
-        ws['A8'].border = BOLD_BORDER
-        ws['B8'].border = BOLD_BORDER
-        ws['C8'].border = BOLD_BORDER
-        ws['D8'].border = BOLD_BORDER
-        ws['A8'].alignment = ALIGN_CENTER
-        if tasks:
-            ws['A9'] = "Название задачи"
-            ws['A9'].border = BOLD_BORDER
-            ws['B9'] = "Статус"
-            ws['B9'].border = BOLD_BORDER
-            ws['C9'] = "Дата начала"
-            ws['C9'].border = BOLD_BORDER
-            ws['D9'] = "Дата завершения"
-            ws['D9'].border = BOLD_BORDER
-            row = 10
-            for task in tasks:
-                task_data = [
-                    task.task.title,
-                    task.task.status.name,
-                    task.task.start_date.strftime("%d.%m.%Y"),
-                    task.task.due_date.strftime("%d.%m.%Y"),
-                ]
-                for i, value in enumerate(task_data):
-                    ws.cell(row=row, column=i + 1).value = value
-                    ws.cell(row=row, column=i + 1).border = THIN_BORDER
-                row += 1
-        else:
-            ws.merge_cells('A10:D10')
-            ws['A10'] = "Нет задач у пользователя"
-            ws['A10'].border = THIN_BORDER
-            ws['B10'].border = THIN_BORDER
-            ws['C10'].border = THIN_BORDER
-            ws['D10'].border = THIN_BORDER
-            ws['A10'].alignment = ALIGN_CENTER
-
-        # Проекты пользователя
-        ws.merge_cells('F8:I8')
-        ws['F8'] = "Проекты пользователя"
-        ws['F8'].border = BOLD_BORDER
-        ws['G8'].border = BOLD_BORDER
-        ws['H8'].border = BOLD_BORDER
-        ws['I8'].border = BOLD_BORDER
-        ws['F8'].alignment = ALIGN_CENTER
-        if projects:
-            ws['F9'] = "Название проекта"
-            ws['F9'].border = BOLD_BORDER
-            ws['G9'] = "Описание"
-            ws['G9'].border = BOLD_BORDER
-            ws['H9'] = "Дата начала"
-            ws['H9'].border = BOLD_BORDER
-            ws['I9'] = "Дата завершения"
-            ws['I9'].border = BOLD_BORDER
-            row = 10
-            for project in projects:
-                project_data = [
-                    project.project.title,
-                    project.project.description or "Не указано",
-                    project.project.start_date.strftime("%d.%m.%Y"),
-                    project.project.due_date.strftime("%d.%m.%Y"),
-                ]
-                for i, value in enumerate(project_data):
-                    ws.cell(row=row, column=i + 6).value = value
-                    ws.cell(row=row, column=i + 6).border = THIN_BORDER
-                row += 1
-        else:
-            ws.merge_cells('F9:I9')
-            ws['F9'] = "Нет проектов у пользователя"
-            ws['F9'].border = THIN_BORDER
-            ws['G9'].border = THIN_BORDER
-            ws['H9'].border = THIN_BORDER
-            ws['I9'].border = THIN_BORDER
-            ws['F9'].alignment = ALIGN_CENTER
-
-        # Сохранение отчёта
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        # Имя файла
-        filename = f"Report_user_{user.first_name}_{user.last_name}_{date.today().isoformat()}"
-        encoded_file_name = quote(filename)
+        user_data = layouts.user_data(user)
+        project_rows = layouts.user_projects_table([layouts.user_project_row(member.project) for member in projects])
+
+        async def body():
+            book = XlsxWriter()
+            ws = book.add_sheet("Отчёт по пользователю")
+            layouts.write_user_head(ws, user_data, has_projects=bool(projects))
+            # Задачи пользователя читаются из курсора
+            tasks = _table(
+                TaskDAO.stream_user_tasks(user_id, primary=primary),
+                header=layouts.USER_TASK_HEADER,
+                to_row=layouts.user_task_row,
+                empty=lambda: layouts.user_tasks_empty(ws),
+            )
+            async for chunk in _alongside(book, ws, tasks, project_rows, streamed_left=True):
+                yield chunk
+
+        return f"Report_user_{user.first_name}_{user.last_name}", _in_slot(body())
+
+    @staticmethod
+    async def _build_project_report(project_id: int):
+        project = await ProjectDAO.find_by_id(project_id)
+        if not project:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Проект не найден"
+            )
+        users = await ProjectMemberDAO.get_project_members(project_id)
+        # Курсор читается после выхода из запроса: источник фиксируется сейчас
+        primary = UnitOfWork.reads_from_primary()
+
+        project_data = layouts.project_data(project)
+        member_rows = layouts.members_table([layouts.member_row(member.user) for member in users])
+
+        async def body():
+            book = XlsxWriter()
+            ws = book.add_sheet("Отчёт по проекту")
+            layouts.write_project_head(ws, project_data, has_members=bool(users))
+            # Задачи проекта читаются из курсора
+            tasks = _table(
+                TaskDAO.stream_project_tasks(project_id, primary=primary),
+                header=layouts.PROJECT_TASK_HEADER,
+                to_row=layouts.project_task_row,
+                empty=lambda: layouts.project_tasks_empty(ws),
+            )
+            async for chunk in _alongside(book, ws, tasks, member_rows, streamed_left=False):
+                yield chunk
+
+        return f"Report_project_{project.title}", _in_slot(body())
+
+    # Построение отчёта: имя файла и части файла (формируются при чтении)
+    @staticmethod
+    async def _build(kind: str, entity_id: int) -> tuple[str, AsyncIterator[bytes]]:
+        """
+        Отчёт читается из основной БД, как и его версия (get_report_version): содержимое
+        с отстающей реплики попало бы в кэш и ETag под более новой версией
+        """
+        builders = {
+            "task": ReportsService._build_task_report,
+            "user": ReportsService._build_user_report,
+            "project": ReportsService._build_project_report,
+        }
+        with UnitOfWork.primary_reads():
+            return await builders[kind](entity_id)
+
+    @staticmethod
+    async def build_report(kind: str, entity_id: int) -> tuple[str, AsyncIterator[bytes]]:
+        name, body = await ReportsService._build(kind, entity_id)
+        return _filename(name), body
+
+    @staticmethod
+    async def get_report_version(kind: str, entity_id: int) -> str:
+        """Версия данных отчёта из основной БД (из нее же читается отчёт); 404, если сущности нет"""
+        with UnitOfWork.primary_reads():
+            if kind == "task":
+                version, detail = await TaskDAO.get_report_version(entity_id), "Задача не найдена"
+            elif kind == "user":
+                version, detail = await UserDAO.get_report_version(entity_id), "Пользователь не найден"
+            else:
+                version, detail = await ProjectDAO.get_report_version(entity_id), "Проект не найден"
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=detail
+            )
+        return version
+
+    @staticmethod
+    async def _cache_body(key: tuple, name: str, body: AsyncIterator[bytes]):
+        """Отдача частей отчёта клиенту и сохранение отчёта в кэш, если он не больше лимита"""
+        chunks, size = [], 0
+        async for chunk in body:
+            yield chunk
+            if chunks is not None:
+                size += len(chunk)
+                if size <= settings.REPORT_CACHE_MAX_ITEM_BYTES:
+                    chunks.append(chunk)
+                else:
+                    chunks = None
+        if chunks is not None:
+            ReportsService._cache.set(key, (name, b"".join(chunks)), size)
+
+    @staticmethod
+    async def _stream_report(kind: str, entity_id: int, request: Request, current_user: UserDB) -> Response:
+        """
+        Отчёт с ETag по версии данных: 304, если у клиента актуальная версия, готовый файл из кэша,
+        либо формирование потоком с сохранением в кэш
+        """
+        ReportsService._check_role(current_user)
+        version = await ReportsService.get_report_version(kind, entity_id)
+        etag = f'"{kind}-{entity_id}-{version}"'
+        if etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+        key = (kind, entity_id, version)
+        cached = ReportsService._cache.get(key)
+        if cached is not None:
+            name, content = cached
+            return Response(content=content, media_type=XLSX_MEDIA_TYPE, headers=_report_headers(_filename(name), etag))
+        name, body = await ReportsService._build(kind, entity_id)
         return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename*=UTF-8''{encoded_file_name}"}
+            ReportsService._cache_body(key, name, body),
+            media_type=XLSX_MEDIA_TYPE,
+            headers=_report_headers(_filename(name), etag)
         )
 
+    @staticmethod
+    async def create_report_by_task(
+            task_id: int,
+            request: Request,
+            current_user: UserDB
+    ):
+        return await ReportsService._stream_report("task", task_id, request, current_user)
+
+    @staticmethod
+    async def create_report_by_user(
+            user_id: int,
+            request: Request,
+            current_user: UserDB
+    ):
+        return await ReportsService._stream_report("user", user_id, request, current_user)
+
     @staticmethod
     async def create_report_by_project(
             project_id: int,
+            request: Request,
             current_user: UserDB
     ):
-        if current_user.role.name != "Менеджер":
+        return await ReportsService._stream_report("project", project_id, request, current_user)
+
+    # Фоновые задания
+    @staticmethod
+    async def create_report_job(
+            job_data: ReportJobCreate,
+            current_user: UserDB
+    ) -> ReportJob:
+        ReportsService._check_role(current_user)
+        version = await ReportsService.get_report_version(job_data.kind, job_data.entity_id)
+        return ReportJobs.submit(job_data.kind, job_data.entity_id, version)
+
+    @staticmethod
+    async def get_report_job(
+            job_id: str,
+            current_user: UserDB
+    ) -> ReportJob:
+        ReportsService._check_role(current_user)
+        job = ReportJobs.get(job_id)
+        if not job:
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Пользователь не является менеджером"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Задание на отчёт не найдено"
             )
-        project = await ProjectDAO.find_by_id(project_id)
-        if not project:
+        return job
+
+    @staticmethod
+    async def download_report_job(
+            job_id: str,
+            current_user: UserDB
+    ) -> FileResponse:
+        job = await ReportsService.get_report_job(job_id, current_user)
+        if job.status == "failed":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Отчёт не сформирован: {job.error}"
+            )
+        if job.status != "done":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Отчёт ещё формируется"
+            )
+        path = ReportJobs.artifact_path(job)
+        if not path.exists():
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Проект не найден"
+                detail="Задание на отчёт не найдено"
             )
-        users = await ProjectMemberDAO.get_project_members(project_id)
-        tasks = await ProjectDAO.get_project_tasks(project_id)
-        tasks = tasks.tasks
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = f"Отчёт по проекту"
-
-        # Информация о проекте
-        ws.merge_cells('A1:B1')
-        ws['A1'] = "Проект"
-        ws['A1'].border = BOLD_BORDER
-        ws['B1'].border = BOLD_BORDER
-        ws['A1'].alignment = ALIGN_CENTER
-        project_data = [
-            ("Название проекта", project.title),
-            ("Описание", project.description or "Не указано"),
-            ("Дата начала", project.start_date.strftime("%d.%m.%Y")),
-            ("Дата завершения", project.due_date.strftime("%d.%m.%Y")),
-            ("Статус", project.status.name),
-        ]
-        for i, (header, value) in enumerate(project_data):
-            ws.cell(row=i + 2, column=1).value = header
-            ws.cell(row=i + 2, column=1).border = THIN_BORDER
-            ws.cell(row=i + 2, column=2).value = value
-            ws.cell(row=i + 2, column=2).border = THIN_BORDER
-
-        # Участники проекта
-        ws.merge_cells('A8:D8')
-        ws['A8'] = "Участники задачи"
-        ws['A8'].border = BOLD_BORDER
-        ws['B8'].border = BOLD_BORDER
-        ws['C8'].border = BOLD_BORDER
-        ws['D8'].border = BOLD_BORDER
-        ws['A8'].alignment = ALIGN_CENTER
-        if users:
-            ws['A9'] = "Имя"
-            ws['A9'].border = BOLD_BORDER
-            ws['B9'] = "Фамилия"
-            ws['B9'].border = BOLD_BORDER
-            ws['C9'] = "Отчество"
-            ws['C9'].border = BOLD_BORDER
-            ws['D9'] = "Должность"
-            ws['D9'].border = BOLD_BORDER
-            row = 10
-            for user in users:
-                user_data = [
-                    user.user.first_name,
-                    user.user.last_name,
-                    user.user.patronymic if user.user.patronymic else "-",
-                    user.user.position.name if user.user.position else "Не указана",
-                ]
-                for i, value in enumerate(user_data):
-                    ws.cell(row=row, column=i + 1).value = value
-                    ws.cell(row=row, column=i + 1).border = THIN_BORDER
-                row += 1
-        else:
-            ws.merge_cells('A9:D9')
-            ws['A9'] = "Нет участников проекта"
-            ws['A9'].border = THIN_BORDER
-            ws['B9'].border = THIN_BORDER
-            ws['C9'].border = THIN_BORDER
-            ws['D9'].border = THIN_BORDER
-            ws['A9'].alignment = ALIGN_CENTER
-
-        # Задачи проекта
-        ws.merge_cells('F8:K8')
-        ws['F8'] = "Задачи проекта"
-        ws['F8'].border = BOLD_BORDER
-        ws['G8'].border = BOLD_BORDER
-        ws['H8'].border = BOLD_BORDER
-        ws['I8'].border = BOLD_BORDER
-        ws['J8'].border = BOLD_BORDER
-        ws['K8'].border = BOLD_BORDER
-        ws['F8'].alignment = ALIGN_CENTER
-        if tasks:
-            ws['F9'] = "Название"
-            ws['F9'].border = BOLD_BORDER
-            ws['G9'] = "Описание"
-            ws['G9'].border = BOLD_BORDER
-            ws['H9'] = "Статус"
-            ws['H9'].border = BOLD_BORDER
-            ws['I9'] = "Дата начала"
-            ws['I9'].border = BOLD_BORDER
-            ws['J9'] = "Дата завершения"
-            ws['J9'].border = BOLD_BORDER
-            ws['K9'] = "Приоритет"
-            ws['K9'].border = BOLD_BORDER
-            row = 10
-            for task in tasks:
-                task_data = [
-                    task.title,
-                    task.description or "Не указано",
-                    task.status.name,
-                    task.start_date.strftime("%d.%m.%Y"),
-                    task.due_date.strftime("%d.%m.%Y"),
-                    task.priority.name,
-                ]
-                for i, value in enumerate(task_data):
-                    ws.cell(row=row, column=i + 6).value = value
-                    ws.cell(row=row, column=i + 6).border = THIN_BORDER
-                row += 1
+        return FileResponse(path, media_type=XLSX_MEDIA_TYPE, headers=attachment_headers(job.filename))
+
+    # Массовая выгрузка
+    @staticmethod
+    async def _export_batches(params: ReportExportParams):
+        """
+        Данные выгрузки порциями: на порцию сущностей - запрос страницы и по запросу на каждую
+        связанную таблицу. Элемент порции - (имя файла, название листа, ячейки листа)
+        """
+        cursor = None
+        while True:
+            batch = []
+            if params.scope == "projects":
+                projects, cursor = await ProjectDAO.get_projects(
+                    cursor=cursor, limit=settings.REPORT_EXPORT_BATCH_SIZE, status_id=params.status_id
+                )
+                ids = [project.id for project in projects]
+                if not ids:
+                    return
+                members, tasks = defaultdict(list), defaultdict(list)
+                for member in await ProjectMemberDAO.get_members_of_projects(ids):
+                    members[member.project_id].append(layouts.member_row(member.user))
+                for task in await TaskDAO.get_tasks_of_projects(ids):
+                    tasks[task.project_id].append(layouts.project_task_row(task))
+                for project in projects:
+                    batch.append((
+                        f"project_{project.id}",
+                        export.sheet_title(project.id, project.title),
+                        (layouts.project_data(project), members[project.id], tasks[project.id]),
+                    ))
+            else:
+                users, cursor = await UserDAO.get_users(cursor=cursor, limit=settings.REPORT_EXPORT_BATCH_SIZE)
+                ids = [user.id for user in users]
+                if not ids:
+                    return
+                tasks, projects = defaultdict(list), defaultdict(list)
+                for assignment in await TaskAssignmentDAO.get_tasks_of_users(ids):
+                    tasks[assignment.user_id].append(layouts.user_task_row(assignment.task))
+                for member in await ProjectMemberDAO.get_projects_of_users(ids):
+                    projects[member.user_id].append(layouts.user_project_row(member.project))
+                for user in users:
+                    batch.append((
+                        f"user_{user.id}",
+                        export.sheet_title(user.id, f"{user.last_name} {user.first_name}"),
+                        (layouts.user_data(user), tasks[user.id], projects[user.id]),
+                    ))
+            if batch:
+                yield batch
+            if cursor is None:
+                return
+
+    @staticmethod
+    async def _export_zip(params: ReportExportParams):
+        """ZIP архив с файлом XLSX на каждую сущность; файлы формируются параллельно в пуле процессов"""
+        buffer = ChunkBuffer()
+        # XLSX уже сжат, повторное сжатие не нужно
+        archive = zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED)
+        async for batch in ReportsService._export_batches(params):
+            files = await asyncio.gather(*(
+                ReportRenderer.run_in_process(export.render_workbook, params.scope, title, payload)
+                for _, title, payload in batch
+            ))
+            for (name, _, _), data in zip(batch, files):
+                archive.writestr(f"{name}.xlsx", data)
+            yield buffer.drain()
+        archive.close()
+        yield buffer.drain()
+
+    @staticmethod
+    async def _export_workbook(params: ReportExportParams):
+        """Одна книга с листом на каждую сущность; листы формируются параллельно в пуле процессов"""
+        book = XlsxWriter()
+        empty = True
+
+        def write(titles: list[str], sheets: list[bytes]) -> bytes:
+            for title, data in zip(titles, sheets):
+                book.add_sheet_xml(title, data)
+            return book.read()
+
+        def finish() -> bytes:
+            if empty:
+                book.add_sheet("Выгрузка").append(layouts.message("Нет данных для выгрузки", 4))
+            return book.close()
+
+        async for batch in ReportsService._export_batches(params):
+            empty = False
+            sheets = await asyncio.gather(*(
+                ReportRenderer.run_in_process(export.render_sheet, params.scope, payload)
+                for _, _, payload in batch
+            ))
+            yield await ReportRenderer.run(write, [title for _, title, _ in batch], sheets)
+        yield await ReportRenderer.run(finish)
+
+    @staticmethod
+    async def export_reports(
+            params: ReportExportParams,
+            current_user: UserDB
+    ) -> StreamingResponse:
+        ReportsService._check_role(current_user)
+        if params.status_id is not None and not await ReferenceCache.exists(ProjectStatusDAO, params.status_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Статус проекта не найден"
+            )
+        filename = _filename(f"Export_{params.scope}")
+        if params.format == "zip":
+            body, media_type, filename = ReportsService._export_zip(params), ZIP_MEDIA_TYPE, f"{filename}.zip"
         else:
-            ws.merge_cells('F9:K9')
-            ws['F9'] = "Нет задач внутри проекта"
-            ws['F9'].border = THIN_BORDER
-            ws['G9'].border = THIN_BORDER
-            ws['H9'].border = THIN_BORDER
-            ws['I9'].border = THIN_BORDER
-            ws['J9'].border = THIN_BORDER
-            ws['K9'].border = THIN_BORDER
-            ws['F9'].alignment = ALIGN_CENTER
-
-        # Сохранение отчёта
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        # Имя файла
-        filename = f"Report_project_{project.title}_{date.today().isoformat()}"
-        encoded_file_name = quote(filename)
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename*=UTF-8''{encoded_file_name}"}
-        )
+            body, media_type, filename = ReportsService._export_workbook(params), XLSX_MEDIA_TYPE, f"{filename}.xlsx"
+        return StreamingResponse(_in_slot(body), media_type=media_type, headers=attachment_headers(filename))
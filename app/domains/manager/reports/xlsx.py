@@ -0,0 +1,206 @@
+"""
+Потоковая запись XLSX: строки листа сразу сжимаются в zip архив,
+готовые части файла забираются через read() и отдаются клиенту
+"""
+import re
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+# Стили ячеек (индексы cellXfs в styles.xml)
+DEFAULT = 0
+THIN = 1
+BOLD = 2
+BOLD_CENTER = 3
+THIN_CENTER = 4
+
+# Ячейка: значение и стиль; None в строке - пропуск колонки
+Cell = tuple[object, int]
+
+_ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_STYLES = (
+    f'{_XML_HEADER}<styleSheet xmlns="{_MAIN_NS}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/><family val="2"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="3">'
+    '<border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border>'
+    '<border><left style="thick"/><right style="thick"/><top style="thick"/><bottom style="thick"/><diagonal/></border>'
+    '</borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="5">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="1" xfId="0" applyBorder="1"/>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="2" xfId="0" applyBorder="1"/>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="2" xfId="0" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="1" xfId="0" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+def column_letter(index: int) -> str:
+    """Буквенное обозначение колонки по номеру (с 1)"""
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+class ChunkBuffer:
+    """Файл только на запись для zipfile: накапливает байты до их выдачи клиенту"""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class SheetWriter:
+    """Лист, записываемый построчно; объединения ячеек пишутся при закрытии листа"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._row = 0
+        self._merges: list[str] = []
+        self._stream.write(f'{_XML_HEADER}<worksheet xmlns="{_MAIN_NS}"><sheetData>'.encode("utf-8"))
+
+    @property
+    def row(self) -> int:
+        """Номер последней записанной строки"""
+        return self._row
+
+    def append(self, cells: list[Cell | None] = ()) -> None:
+        """Запись следующей строки, ячейки начиная с колонки A"""
+        self._row += 1
+        parts = []
+        for column, cell in enumerate(cells, start=1):
+            if cell is None:
+                continue
+            value, style = cell
+            ref = f"{column_letter(column)}{self._row}"
+            if value is None:
+                parts.append(f'<c r="{ref}" s="{style}"/>')
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                parts.append(f'<c r="{ref}" s="{style}"><v>{value}</v></c>')
+            else:
+                text = escape(_ILLEGAL_XML_CHARS.sub("", str(value)))
+                parts.append(f'<c r="{ref}" s="{style}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+        if parts:
+            self._stream.write(f'<row r="{self._row}">{"".join(parts)}</row>'.encode("utf-8"))
+
+    def merge(self, ref: str) -> None:
+        """Объединение диапазона ячеек, например A1:B1"""
+        self._merges.append(ref)
+
+    def close(self) -> None:
+        tail = "</sheetData>"
+        if self._merges:
+            merges = "".join(f'<mergeCell ref="{ref}"/>' for ref in self._merges)
+            tail += f'<mergeCells count="{len(self._merges)}">{merges}</mergeCells>'
+        self._stream.write(f"{tail}</worksheet>".encode("utf-8"))
+        self._stream.close()
+
+
+class XlsxWriter:
+    """
+    Книга XLSX, формируемая потоком: листы пишутся по одному, память не зависит от числа строк.
+    Служебные части книги (workbook, стили, типы содержимого) дописываются при закрытии
+    """
+
+    def __init__(self):
+        self._buffer = ChunkBuffer()
+        self._zip = zipfile.ZipFile(self._buffer, mode="w", compression=zipfile.ZIP_DEFLATED)
+        self._titles: list[str] = []
+        self._sheet: SheetWriter | None = None
+
+    def add_sheet(self, title: str) -> SheetWriter:
+        """Новый лист; предыдущий лист закрывается"""
+        self._close_sheet()
+        self._titles.append(title[:31])
+        stream = self._zip.open(f"xl/worksheets/sheet{len(self._titles)}.xml", mode="w")
+        self._sheet = SheetWriter(stream)
+        return self._sheet
+
+    def add_sheet_xml(self, title: str, data: bytes) -> None:
+        """Лист, сформированный заранее: XML листа целиком (см. SheetWriter)"""
+        self._close_sheet()
+        self._titles.append(title[:31])
+        self._zip.writestr(f"xl/worksheets/sheet{len(self._titles)}.xml", data)
+
+    def read(self) -> bytes:
+        """Готовые части файла с прошлого вызова"""
+        return self._buffer.drain()
+
+    def close(self) -> bytes:
+        """Завершение книги и остаток файла"""
+        self._close_sheet()
+        sheets = range(1, len(self._titles) + 1)
+        self._zip.writestr("[Content_Types].xml", (
+            f'{_XML_HEADER}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{number}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for number in sheets
+            )
+            + "</Types>"
+        ))
+        self._zip.writestr("_rels/.rels", (
+            f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            "</Relationships>"
+        ))
+        self._zip.writestr("xl/workbook.xml", (
+            f'{_XML_HEADER}<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><sheets>'
+            + "".join(
+                f'<sheet name={quoteattr(title)} sheetId="{number}" r:id="rId{number}"/>'
+                for number, title in zip(sheets, self._titles)
+            )
+            + "</sheets></workbook>"
+        ))
+        self._zip.writestr("xl/_rels/workbook.xml.rels", (
+            f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">'
+            + "".join(
+                f'<Relationship Id="rId{number}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{number}.xml"/>'
+                for number in sheets
+            )
+            + f'<Relationship Id="rId{len(self._titles) + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+            "</Relationships>"
+        ))
+        self._zip.writestr("xl/styles.xml", _STYLES)
+        self._zip.close()
+        return self._buffer.drain()
+
+    def _close_sheet(self) -> None:
+        if self._sheet is not None:
+            self._sheet.close()
+            self._sheet = None
@@ -1,5 +1,10 @@
 from fastapi import status, HTTPException
 
+from app.base.schemas import BulkResponse
+
+# DAOs
+from app.domains.users.dao import UserDAO
+
 
 class ManagerService:
     @classmethod
@@ -9,3 +14,25 @@ class ManagerService:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Недостаточно прав"
             )
+
+    @classmethod
+    async def _check_users(cls, user_ids: list[int]) -> list[int]:
+        """Пользователи без повторов в исходном порядке; 404, если кого-то из них нет"""
+        user_ids = list(dict.fromkeys(user_ids))
+        existing = await UserDAO.find_existing_ids(user_ids)
+        missing = [user_id for user_id in user_ids if user_id not in existing]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Пользователи не найдены: {', '.join(map(str, missing))}"
+            )
+        return user_ids
+
+    @staticmethod
+    def _bulk_response(message: str, user_ids: list[int], processed: list[int]) -> BulkResponse:
+        done = set(processed)
+        return BulkResponse(
+            message=message,
+            processed=[user_id for user_id in user_ids if user_id in done],
+            skipped=[user_id for user_id in user_ids if user_id not in done],
+        )
@@ -0,0 +1,157 @@
+"""
+Импорт задач из файлов CSV и XLSX. Строки читаются из файла порциями, в памяти одна порция.
+Первая строка файла - названия колонок: title, description, start_date, due_date, status, priority.
+Обязательна только title; статус и приоритет задаются названиями из справочников
+"""
+import csv
+import io
+import zipfile
+from datetime import date, datetime
+from typing import Iterator
+
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+from pydantic import ValidationError
+
+from app.domains.tasks.models import Task
+from app.domains.tasks.schemas import TaskCreate
+
+COLUMNS = ("title", "description", "start_date", "due_date", "status", "priority")
+
+# Статус и приоритет строки без значения - значения по умолчанию модели задачи
+DEFAULT_STATUS_ID = Task.status_id.default.arg
+DEFAULT_PRIORITY_ID = Task.priority_id.default.arg
+
+# Ошибки чтения файла целиком (не отдельной строки)
+_FILE_ERRORS = (UnicodeDecodeError, csv.Error, zipfile.BadZipFile, InvalidFileException, KeyError, OSError)
+
+
+class ImportFileError(ValueError):
+    """Файл не удалось прочитать"""
+
+
+def _csv_rows(file) -> Iterator[list]:
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    sample = text.read(4096)
+    text.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    yield from csv.reader(text, dialect)
+
+
+def _xlsx_rows(file) -> Iterator[tuple]:
+    # read_only: строки листа разбираются из архива по мере чтения, без загрузки книги в память
+    book = load_workbook(file, read_only=True, data_only=True)
+    try:
+        yield from book.worksheets[0].iter_rows(values_only=True)
+    finally:
+        book.close()
+
+
+# Чтение строк файла по расширению
+READERS = {
+    ".csv": _csv_rows,
+    ".xlsx": _xlsx_rows,
+}
+
+
+def _text(value) -> str | None:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    value = _text(value)
+    if value is not None:
+        try:
+            return datetime.strptime(value, "%d.%m.%Y").date()
+        except ValueError:
+            # Прочие форматы (ISO 8601) проверяет схема
+            pass
+    return value
+
+
+class TaskRows:
+    """Строки файла импорта: проверка по TaskCreate и справочникам, значения для вставки"""
+
+    def __init__(self, rows: Iterator, statuses: dict[str, int], priorities: dict[str, int], project_id: int | None):
+        self._rows = rows
+        self._statuses = statuses
+        self._priorities = priorities
+        self._project_id = project_id
+        self._line = 1
+        try:
+            header = next(self._rows, None)
+        except _FILE_ERRORS as error:
+            raise ImportFileError("Не удалось прочитать файл") from error
+        if header is None:
+            raise ImportFileError("Файл пуст")
+        names = {str(name).strip().lower(): index for index, name in enumerate(header) if name is not None}
+        if "title" not in names:
+            raise ImportFileError("В файле нет колонки title")
+        self._columns = {column: names.get(column) for column in COLUMNS}
+
+    def _cell(self, values, column: str):
+        index = self._columns[column]
+        return values[index] if index is not None and index < len(values) else None
+
+    def _parse(self, values) -> tuple[dict | None, list[str]]:
+        errors = []
+        try:
+            task = TaskCreate(
+                title=_text(self._cell(values, "title")),
+                description=_text(self._cell(values, "description")),
+                start_date=_date(self._cell(values, "start_date")),
+                due_date=_date(self._cell(values, "due_date")),
+            )
+        except ValidationError as error:
+            task = None
+            errors += [f"{'.'.join(map(str, item['loc']))}: {item['msg']}" for item in error.errors()]
+
+        status = _text(self._cell(values, "status"))
+        status_id = self._statuses.get(status.lower()) if status else DEFAULT_STATUS_ID
+        if status_id is None:
+            errors.append(f"status: статус «{status}» не найден")
+        priority = _text(self._cell(values, "priority"))
+        priority_id = self._priorities.get(priority.lower()) if priority else DEFAULT_PRIORITY_ID
+        if priority_id is None:
+            errors.append(f"priority: приоритет «{priority}» не найден")
+
+        if errors:
+            return None, errors
+        return {
+            **task.model_dump(),
+            "status_id": status_id,
+            "priority_id": priority_id,
+            "project_id": self._project_id,
+        }, errors
+
+    def read_batch(self, size: int) -> tuple[list[dict], list[tuple[int, list[str]]], bool]:
+        """
+        Следующие size строк файла: значения задач для вставки, ошибки (номер строки файла, ошибки)
+        и признак конца файла. Пустые строки пропускаются
+        """
+        tasks, errors = [], []
+        try:
+            for values in self._rows:
+                self._line += 1
+                if all(_text(value) is None for value in values):
+                    continue
+                task, row_errors = self._parse(values)
+                if row_errors:
+                    errors.append((self._line, row_errors))
+                else:
+                    tasks.append(task)
+                if len(tasks) + len(errors) >= size:
+                    return tasks, errors, False
+        except _FILE_ERRORS as error:
+            raise ImportFileError(f"Не удалось прочитать строку {self._line} файла") from error
+        return tasks, errors, True
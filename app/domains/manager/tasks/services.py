@@ -1,7 +1,14 @@
-from fastapi import HTTPException, status
+from pathlib import Path
 
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+
+from app.base.errors import integrity_errors
+from app.base.reference import ReferenceCache
+from app.core.config import settings
 from app.core.security import Security
 from app.domains.manager.services import ManagerService
+from app.domains.manager.tasks.importer import READERS, ImportFileError, TaskRows
 
 # DAOs
 from app.domains.tasks.dao import TaskDAO, TaskAssignmentDAO, TaskPriorityDAO, TaskStatusDAO
@@ -11,38 +18,40 @@ from app.domains.users.dao import UserDAO
 # Схемы
 from app.domains.users.schemas import UserDB, UserResponse
 from app.domains.projects.schemas import ProjectResponse
-from app.domains.tasks.schemas import TaskResponse, TaskResponseWithProject, TaskCreate, TaskUpdate
-from app.base.schemas import MessageResponse
+from app.domains.tasks.schemas import (
+    TaskResponse,
+    TaskResponseWithProject,
+    TaskCreate,
+    TaskUpdate,
+    TaskListParams,
+    TaskImportError,
+    TaskImportResult,
+)
+from app.base.schemas import MessageResponse, Page, UserIdsRequest, BulkResponse
+
 
+# Ответы на нарушения ограничений при записи задач и назначений
+TASK_CONSTRAINTS = {
+    "tasks_project_id_fkey": (status.HTTP_404_NOT_FOUND, "Проект не найден"),
+    "tasks_status_id_fkey": (status.HTTP_404_NOT_FOUND, "Статус задачи не найден"),
+    "tasks_priority_id_fkey": (status.HTTP_404_NOT_FOUND, "Приоритет задачи не найден"),
+    "task_assignments_task_id_fkey": (status.HTTP_404_NOT_FOUND, "Задача не найдена"),
+    "task_assignments_user_id_fkey": (status.HTTP_404_NOT_FOUND, "Пользователь не найден"),
+    "uq_task_assignments_task_id_user_id": (status.HTTP_400_BAD_REQUEST, "Пользователь уже назначен на задачу"),
+}
 
 class ManagerTaskService(ManagerService):
     @classmethod
     async def get_tasks(
         cls,
+        params: TaskListParams,
         current_user: UserDB,
-    ) -> list[TaskResponseWithProject]:
+    ) -> Page[TaskResponseWithProject]:
         cls._check_role(current_user.role.name)
 
-        tasks = await TaskDAO.get_tasks_with_project()
-        return [
-            TaskResponseWithProject(
-                id=task.id,
-                title=task.title,
-                description=task.description,
-                start_date=task.start_date,
-                due_date=task.due_date,
-                priority=task.priority.name,
-                status=task.status.name,
-                project=ProjectResponse(
-                    id=task.project.id,
-                    title=task.project.title,
-                    description=task.project.description,
-                    start_date=task.project.start_date,
-                    due_date=task.project.due_date,
-                    status=task.project.status.name,
-                ) if task.project else None
-            ) for task in tasks
-        ]
+        tasks, next_cursor = await TaskDAO.get_task_rows(**params.model_dump())
+        items = [TaskResponseWithProject.from_row(task) for task in tasks]
+        return Page[TaskResponseWithProject](items=items, next_cursor=next_cursor)
 
     @classmethod
     async def get_task(
@@ -93,43 +102,77 @@ class ManagerTaskService(ManagerService):
         )
 
     @classmethod
-    async def update_task(
+    async def import_tasks(
         cls,
-        task_id: int,
-        task: TaskUpdate,
+        file: UploadFile,
+        project_id: int | None,
         current_user: UserDB
-    ) -> MessageResponse:
+    ) -> TaskImportResult:
+        """
+        Импорт задач из CSV/XLSX: строки читаются и проверяются порциями в потоке,
+        корректные строки порции вставляются одним запросом. Ошибка чтения файла отменяет весь импорт
+        """
         cls._check_role(current_user.role.name)
-        if not await TaskDAO.find_by_id(task_id):
+        reader = READERS.get(Path(file.filename or "").suffix.lower())
+        if reader is None:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Задача не найдена"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Поддерживаются файлы CSV и XLSX"
             )
-        if not await TaskPriorityDAO.find_by_id(task.priority_id):
+        if project_id is not None and not await ProjectDAO.find_by_id(project_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Приоритет задачи не найден"
+                detail="Проект не найден"
             )
-        if not await TaskStatusDAO.find_by_id(task.status_id):
+        statuses = {item["name"].lower(): item["id"] for item in await ReferenceCache.get_all(TaskStatusDAO)}
+        priorities = {item["name"].lower(): item["id"] for item in await ReferenceCache.get_all(TaskPriorityDAO)}
+
+        result = TaskImportResult(created=0, failed=0, errors=[], errors_truncated=False)
+        try:
+            rows = await run_in_threadpool(TaskRows, reader(file.file), statuses, priorities, project_id)
+            finished = False
+            while not finished:
+                tasks, errors, finished = await run_in_threadpool(rows.read_batch, settings.TASK_IMPORT_BATCH_SIZE)
+                if tasks:
+                    await TaskDAO.create_many(tasks)
+                result.created += len(tasks)
+                result.failed += len(errors)
+                for line, messages in errors:
+                    if len(result.errors) < settings.TASK_IMPORT_MAX_ERRORS:
+                        result.errors.append(TaskImportError(row=line, errors=messages))
+                    else:
+                        result.errors_truncated = True
+        except ImportFileError as error:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Статус задачи не найден"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(error)
+            )
+        return result
+
+    @classmethod
+    async def update_task(
+        cls,
+        task_id: int,
+        task: TaskUpdate,
+        current_user: UserDB
+    ) -> MessageResponse:
+        cls._check_role(current_user.role.name)
+        with integrity_errors(TASK_CONSTRAINTS):
+            updated = await TaskDAO.update(
+                model_id=task_id,
+                title=task.title,
+                description=task.description,
+                start_date=task.start_date,
+                due_date=task.due_date,
+                priority_id=task.priority_id,
+                status_id=task.status_id,
+                project_id=task.project_id,
             )
-        if task.project_id and not await ProjectDAO.find_by_id(task.project_id):
+        if not updated:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Проект не найден"
+                detail="Задача не найдена"
             )
-        await TaskDAO.update(
-            model_id=task_id,
-            title=task.title,
-            description=task.description,
-            start_date=task.start_date,
-            due_date=task.due_date,
-            priority_id=task.priority_id,
-            status_id=task.status_id,
-            project_id=task.project_id,
-        )
         return MessageResponse(
             message="Задача успешно обновлена"
         )
@@ -141,12 +184,11 @@ class ManagerTaskService(ManagerService):
         current_user: UserDB
     ) -> MessageResponse:
         cls._check_role(current_user.role.name)
-        if not await TaskDAO.find_by_id(task_id):
+        if not await TaskDAO.delete(model_id=task_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Задача не найдена"
             )
-        await TaskDAO.delete(model_id=task_id)
         return MessageResponse(
             message="Задача успешно удалена"
         )
@@ -183,54 +225,72 @@ class ManagerTaskService(ManagerService):
         current_user: UserDB
     ):
         cls._check_role(current_user.role.name)
-        if not await TaskDAO.find_by_id(task_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Задача не найдена"
+        with integrity_errors(TASK_CONSTRAINTS):
+            await TaskAssignmentDAO.create(
+                task_id=task_id,
+                user_id=user_id
             )
-        if not await UserDAO.find_by_id(user_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Пользователь не найден"
-            )
-        await TaskAssignmentDAO.create(
-            task_id=task_id,
-            user_id=user_id
-        )
         return MessageResponse(
             message="Пользователь успешно назначен на задачу"
         )
 
     @classmethod
-    async def remove_task_assignment(
+    async def add_task_assignments(
         cls,
         task_id: int,
-        user_id: int,
+        data: UserIdsRequest,
         current_user: UserDB
-    ):
+    ) -> BulkResponse:
         cls._check_role(current_user.role.name)
-        if not await TaskDAO.find_by_id(task_id):
+        user_ids = await cls._check_users(data.user_ids)
+        with integrity_errors(TASK_CONSTRAINTS):
+            added = await TaskAssignmentDAO.add_users(task_id, user_ids)
+        return cls._bulk_response("Пользователи назначены на задачу", user_ids, added)
+
+    @classmethod
+    async def remove_task_assignments(
+        cls,
+        task_id: int,
+        user_ids: list[int],
+        current_user: UserDB
+    ) -> BulkResponse:
+        cls._check_role(current_user.role.name)
+        user_ids = await cls._check_users(user_ids)
+        removed = await TaskAssignmentDAO.remove_users(task_id, user_ids)
+        if not removed and not await TaskDAO.find_by_id(task_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Задача не найдена"
             )
-        if not await UserDAO.find_by_id(user_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Пользователь не найден"
-            )
-        if not await TaskAssignmentDAO.find_one_or_none(
+        return cls._bulk_response("Пользователи сняты с задачи", user_ids, removed)
+
+    @classmethod
+    async def remove_task_assignment(
+        cls,
+        task_id: int,
+        user_id: int,
+        current_user: UserDB
+    ):
+        cls._check_role(current_user.role.name)
+        if not await TaskAssignmentDAO.delete_by_filter(
             task_id=task_id,
             user_id=user_id
         ):
+            # Причина уточняется только при неудаче, успешное удаление - один запрос
+            if not await TaskDAO.find_by_id(task_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Задача не найдена"
+                )
+            if not await UserDAO.find_by_id(user_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Пользователь не найден"
+                )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Пользователь не назначен на задачу"
             )
-        await TaskAssignmentDAO.delete_by_filter(
-            task_id=task_id,
-            user_id=user_id
-        )
         return MessageResponse(
             message="Пользователь успешно удален из задачи"
         )
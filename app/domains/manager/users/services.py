@@ -1,12 +1,13 @@
 from fastapi import HTTPException, status
 
+from app.base.errors import integrity_errors
 from app.core.security import Security
 from app.domains.manager.services import ManagerService
 
 # DAOs
-from app.domains.users.dao import UserDAO, PositionDAO, RoleDAO
+from app.domains.users.dao import UserDAO
 from app.domains.projects.dao import ProjectMemberDAO
-from app.domains.tasks.dao import TaskAssignmentDAO
+from app.domains.tasks.dao import TaskDAO
 
 # Схемы
 from app.domains.users.schemas import (
@@ -17,21 +18,30 @@ from app.domains.users.schemas import (
     # Запросы
     UserCreate,
     UserUpdate,
+    UserListParams,
 )
 from app.domains.projects.schemas import ProjectResponse
 from app.domains.tasks.schemas import TaskResponseWithProject
-from app.base.schemas import MessageResponse
+from app.base.schemas import MessageResponse, Page
 
 
+# Ответы на нарушения ограничений при записи пользователей
+USER_CONSTRAINTS = {
+    "users_username_key": (status.HTTP_400_BAD_REQUEST, "Пользователь с таким логином уже существует"),
+    "users_role_id_fkey": (status.HTTP_404_NOT_FOUND, "Роль не найдена"),
+    "users_position_id_fkey": (status.HTTP_404_NOT_FOUND, "Должность не найдена"),
+}
+
 class ManagerUserService(ManagerService):
     @classmethod
     async def get_users(
             cls,
+            params: UserListParams,
             current_user: UserDB
-    ) -> list[UserResponse]:
+    ) -> Page[UserResponse]:
         cls._check_role(current_user.role.name)
-        users = await UserDAO.find_all()
-        return [
+        users, next_cursor = await UserDAO.get_users(**params.model_dump())
+        items = [
             UserResponse(
                 id=user.id,
                 first_name=user.first_name,
@@ -41,6 +51,7 @@ class ManagerUserService(ManagerService):
                 position=user.position.name if user.position else None
             ) for user in users
         ]
+        return Page[UserResponse](items=items, next_cursor=next_cursor)
 
     @classmethod
     async def get_user(
@@ -71,24 +82,16 @@ class ManagerUserService(ManagerService):
             current_user: UserDB
     ) -> MessageResponse:
         cls._check_role(current_user.role.name)
-        if await UserDAO.find_one_or_none(username=user_data.username):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Пользователь с таким логином уже существует"
+        hashed_password = await Security.get_hashed_password(user_data.password)
+        with integrity_errors(USER_CONSTRAINTS):
+            await UserDAO.create(
+                username=user_data.username,
+                hashed_password=hashed_password,
+                first_name=user_data.first_name,
+                last_name=user_data.last_name,
+                patronymic=user_data.patronymic,
+                position_id=user_data.position_id or None
             )
-        if user_data.position_id and not await PositionDAO.find_by_id(user_data.position_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Должность не найдена"
-            )
-        await UserDAO.create(
-            username=user_data.username,
-            hashed_password=Security.get_hashed_password(user_data.password),
-            first_name=user_data.first_name,
-            last_name=user_data.last_name,
-            patronymic=user_data.patronymic,
-            position_id=user_data.position_id
-        )
         return MessageResponse(
             message="Пользователь успешно создан"
         )
@@ -105,12 +108,12 @@ class ManagerUserService(ManagerService):
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Нельзя удалить самого себя"
             )
-        if not await UserDAO.find_by_id(user_id):
+        if not await UserDAO.delete(user_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Пользователь не найден"
             )
-        await UserDAO.delete(user_id)
+        Security.invalidate_user(user_id)
         return MessageResponse(
             message="Пользователь успешно удален"
         )
@@ -123,34 +126,26 @@ class ManagerUserService(ManagerService):
             current_user: UserDB
     ) -> MessageResponse:
         cls._check_role(current_user.role.name)
-        if not await UserDAO.find_by_id(user_id):
+        if current_user.id == user_id:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Пользователь не найден"
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Нельзя обновить самого себя"
             )
-        if user_data.position_id and not await PositionDAO.find_by_id(user_data.position_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Должность не найдена"
+        with integrity_errors(USER_CONSTRAINTS):
+            updated = await UserDAO.update(
+                user_id,
+                first_name=user_data.first_name,
+                last_name=user_data.last_name,
+                patronymic=user_data.patronymic,
+                role_id=user_data.role_id,
+                position_id=user_data.position_id or None
             )
-        if not await RoleDAO.find_by_id(user_data.role_id):
+        if not updated:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Роль не найдена"
-            )
-        if current_user.id == user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Нельзя обновить самого себя"
+                detail="Пользователь не найден"
             )
-        await UserDAO.update(
-            user_id,
-            first_name=user_data.first_name,
-            last_name=user_data.last_name,
-            patronymic=user_data.patronymic,
-            role_id=user_data.role_id,
-            position_id=user_data.position_id
-        )
+        Security.invalidate_user(user_id)
         return MessageResponse(
             message="Пользователь успешно обновлен"
         )
@@ -167,26 +162,8 @@ class ManagerUserService(ManagerService):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Пользователь не найден"
             )
-        tasks = await TaskAssignmentDAO.get_user_tasks(user_id)
-        return [
-            TaskResponseWithProject(
-                id=task.task.id,
-                title=task.task.title,
-                description=task.task.description,
-                status=task.task.status.name,
-                due_date=task.task.due_date,
-                priority=task.task.priority.name,
-                start_date=task.task.start_date,
-                project=ProjectResponse(
-                        id=task.task.project.id,
-                        title=task.task.project.title,
-                        description=task.task.project.description,
-                        start_date=task.task.project.start_date,
-                        due_date=task.task.project.due_date,
-                        status=task.task.project.status.name,
-                    ) if task.task.project else None,
-            ) for task in tasks
-        ]
+        tasks = await TaskDAO.get_user_task_rows(user_id)
+        return [TaskResponseWithProject.from_row(task) for task in tasks]
 
     @classmethod
     async def get_user_projects(
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+
+
+class PoolStatsResponse(BaseModel):
+    """Загрузка пула соединений БД текущего процесса"""
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class ReportStatsResponse(BaseModel):
+    """Очередь и загрузка пула формирования отчётов текущего процесса"""
+    workers: int
+    active: int
+    queued: int
+    queued_max: int
+    completed: int
+    render_seconds_total: float
+    queue_wait_seconds_max: float
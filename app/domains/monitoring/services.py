@@ -0,0 +1,47 @@
+from app.core.database import get_pool_stats, get_pools_stats
+from app.core.metrics import RequestMetrics
+from app.domains.manager.reports.renderer import ReportRenderer
+from app.domains.manager.services import ManagerService
+
+# Схемы
+from app.domains.users.schemas import UserDB
+from app.domains.monitoring.schemas import PoolStatsResponse, ReportStatsResponse
+
+
+class MonitoringService(ManagerService):
+    @classmethod
+    async def get_pool_stats(
+        cls,
+        current_user: UserDB
+    ) -> PoolStatsResponse:
+        cls._check_role(current_user.role.name)
+        return PoolStatsResponse(**get_pool_stats())
+
+    @classmethod
+    async def get_report_stats(
+        cls,
+        current_user: UserDB
+    ) -> ReportStatsResponse:
+        cls._check_role(current_user.role.name)
+        return ReportStatsResponse(**ReportRenderer.get_stats())
+
+    @classmethod
+    async def get_metrics(cls) -> str:
+        """Метрики запросов, пула соединений и очереди отчётов в формате Prometheus"""
+        pools = get_pools_stats()
+        reports = ReportRenderer.get_stats()
+
+        def by_engine(key: str) -> dict:
+            return {name: stats[key] for name, stats in pools.items()}
+
+        return RequestMetrics.render({
+            "db_pool_size": ("Размер пула соединений", by_engine("size"), "engine"),
+            "db_pool_checked_out": ("Занятые соединения пула", by_engine("checked_out"), "engine"),
+            "db_pool_overflow": ("Соединения сверх размера пула", by_engine("overflow"), "engine"),
+            "report_render_active": ("Формируемые отчёты", reports["active"]),
+            "report_render_queued": ("Отчёты в очереди", reports["queued"]),
+        }, counters={
+            "db_pool_checkouts_total": ("Выдачи соединений из пула", by_engine("checkouts"), "engine"),
+            "db_pool_timeouts_total": ("Таймауты ожидания соединения", by_engine("timeouts"), "engine"),
+            "db_pool_wait_seconds_total": ("Суммарное ожидание соединений", by_engine("wait_seconds_total"), "engine"),
+        })
@@ -1,25 +1,256 @@
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from datetime import date
 
-from app.core.database import async_session_maker
+from sqlalchemy import Row, Integer, Date, DateTime, select, update, delete, func, and_, cast, column, values, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, aliased
 
-
-from app.base.dao import BaseDAO
-from app.domains.projects.models import Project, ProjectStatus, ProjectMember
+from app.base.dao import BaseDAO, any_of, change_mark
+from app.base.pagination import paginate, split_page
+from app.domains.projects.models import Project, ProjectStatus, ProjectMember, ProjectTaskStats
+from app.domains.tasks.models import Task, TaskStatus, TASK_STATUS_DONE
+from app.domains.users.models import User
 
 
 class ProjectDAO(BaseDAO):
     model = Project
 
+    load_profiles = {
+        # Проект со статусом (списки проектов)
+        "detail": (joinedload(Project.status),),
+    }
+
+    sort_fields = {
+        "id": Project.id,
+        "created_at": Project.created_at,
+        "due_date": Project.due_date,
+    }
+
+    @classmethod
+    async def get_projects(
+        cls,
+        sort: str = "id",
+        cursor: str | None = None,
+        limit: int = 50,
+        status_id: int | None = None,
+        due_from: date | None = None,
+        due_to: date | None = None,
+    ) -> tuple[list[Project], str | None]:
+        """Страница проектов по фильтрам и курсор следующей страницы"""
+        async with cls._session() as session:
+            query = select(cls.model).options(*cls._load("detail"))
+            if status_id is not None:
+                query = query.where(cls.model.status_id == status_id)
+            if due_from is not None:
+                query = query.where(cls.model.due_date >= due_from)
+            if due_to is not None:
+                query = query.where(cls.model.due_date <= due_to)
+            query = paginate(query, cls.sort_fields, cls.model.id, sort, cursor, limit)
+            result = await session.execute(query)
+            return split_page(result.unique().scalars().all(), sort, limit)
+
+    @classmethod
+    async def get_progress_rows(cls, done_status_ids: list[int]) -> list[Row]:
+        """Прогресс всех проектов по счетчикам project_stats, без чтения задач"""
+        async with cls._session() as session:
+            stats = progress_query(done_status_ids).subquery()
+            query = (
+                select(
+                    cls.model.id,
+                    cls.model.title,
+                    cls.model.status_id,
+                    cls.model.due_date,
+                    func.coalesce(stats.c.tasks_total, 0).label("tasks_total"),
+                    func.coalesce(stats.c.tasks_done, 0).label("tasks_done"),
+                    func.coalesce(stats.c.tasks_overdue, 0).label("tasks_overdue"),
+                )
+                .outerjoin(stats, stats.c.project_id == cls.model.id)
+                .order_by(cls.model.id)
+            )
+            result = await session.execute(query)
+            return result.all()
+
+    @classmethod
+    async def get_report_version(cls, project_id: int) -> str | None:
+        """Версия данных отчёта по проекту: проект, его задачи и участники; None, если проекта нет"""
+        async with cls._session() as session:
+            query = select(func.md5(func.concat_ws(
+                "|",
+                cls.model.updated_at,
+                change_mark(Task.id, Task.updated_at, Task.project_id == project_id),
+                change_mark(
+                    ProjectMember.id, User.updated_at,
+                    ProjectMember.project_id == project_id, User.id == ProjectMember.user_id,
+                ),
+            ))).where(cls.model.id == project_id)
+            result = await session.execute(query)
+            return result.scalar_one_or_none()
+
+
+def done_statuses():
+    """id завершающих статусов задач подзапросом (для расчетов внутри БД)"""
+    return select(TaskStatus.id).where(TaskStatus.name == TASK_STATUS_DONE)
+
+
+def progress_query(done_status_ids: list[int]):
+    """Число задач, завершенных и просроченных задач и последняя активность по проектам из project_stats"""
+    return (
+        select(
+            ProjectTaskStats.project_id,
+            func.sum(ProjectTaskStats.tasks).label("tasks_total"),
+            func.coalesce(
+                func.sum(ProjectTaskStats.tasks).filter(any_of(ProjectTaskStats.status_id, done_status_ids)), 0
+            ).label("tasks_done"),
+            func.sum(ProjectTaskStats.overdue).label("tasks_overdue"),
+            func.max(ProjectTaskStats.last_activity_at).label("last_activity_at"),
+        )
+        .group_by(ProjectTaskStats.project_id)
+    )
+
+
+class ProjectStatsDAO(BaseDAO):
+    """
+    Счетчики задач проекта по статусам. Изменяются в транзакции записи задачи (TaskDAO),
+    при расхождении пересчитываются по таблице задач (rebuild)
+    """
+    model = ProjectTaskStats
+
     @classmethod
-    async def get_project_tasks(cls, project_id: int):
-        async with async_session_maker() as session:
-            project = await session.execute(
-                select(Project)
-                .where(Project.id == project_id)
-                .options(joinedload(Project.tasks))
+    async def get_progress(cls, project_ids: list[int], done_status_ids: list[int]) -> dict[int, Row]:
+        """Прогресс проектов одним запросом: project_id -> строка progress_query"""
+        async with cls._session() as session:
+            query = progress_query(done_status_ids).where(any_of(cls.model.project_id, project_ids))
+            result = await session.execute(query)
+            return {row.project_id: row for row in result.all()}
+
+    @classmethod
+    async def apply_changes(cls, session: AsyncSession, changes: list[tuple[int, int, date | None, int]]) -> None:
+        """
+        Применение изменений задач одним INSERT ... ON CONFLICT: (project_id, status_id, due_date, +1/-1).
+        Выполняется в сессии записи задач (TaskDAO), чтобы счетчики фиксировались и откатывались вместе с ними.
+        Строки блокируются в порядке ключа, чтобы параллельные записи задач не взаимоблокировались
+        """
+        if not changes:
+            return
+        rows = values(
+            column("project_id", Integer),
+            column("status_id", Integer),
+            column("due_date", Date),
+            column("delta", Integer),
+            name="changes",
+        ).data(changes)
+        # NULL в VALUES без типа: срок приводится к дате явно
+        overdue = and_(cast(rows.c.due_date, Date) < func.current_date(), rows.c.status_id.not_in(done_statuses()))
+        query = (
+            select(
+                rows.c.project_id,
+                rows.c.status_id,
+                func.sum(rows.c.delta),
+                func.coalesce(func.sum(rows.c.delta).filter(overdue), 0),
+                func.now(),
+            )
+            .group_by(rows.c.project_id, rows.c.status_id)
+            .order_by(rows.c.project_id, rows.c.status_id)
+        )
+        upsert = pg_insert(cls.model).from_select(
+            ["project_id", "status_id", "tasks", "overdue", "last_activity_at"], query
+        )
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[cls.model.project_id, cls.model.status_id],
+            set_={
+                "tasks": cls.model.tasks + upsert.excluded.tasks,
+                # Изменение считается по текущей дате, а счетчик - на момент прошлого пересчета:
+                # до пересчета после смены даты уменьшение может опередить учет задачи как просроченной
+                "overdue": func.greatest(cls.model.overdue + upsert.excluded.overdue, 0),
+                "last_activity_at": upsert.excluded.last_activity_at,
+            },
+        )
+        await session.execute(upsert)
+
+    @classmethod
+    async def rebuild(cls, project_ids: list[int] | None = None) -> int:
+        """
+        Пересчет счетчиков по таблице задач (всех проектов или из списка); возврат числа строк.
+        Таблица блокируется от параллельных изменений счетчиков до конца транзакции
+        """
+        async with cls._session(write=True) as session:
+            await session.execute(text("LOCK TABLE project_stats IN SHARE ROW EXCLUSIVE MODE"))
+            query = delete(cls.model)
+            if project_ids is not None:
+                query = query.where(any_of(cls.model.project_id, project_ids))
+            await session.execute(query)
+            query = (
+                select(
+                    Task.project_id,
+                    Task.status_id,
+                    func.count(),
+                    func.count().filter(Task.due_date < func.current_date(), Task.status_id.not_in(done_statuses())),
+                    func.max(Task.updated_at),
+                )
+                .where(Task.project_id.is_not(None))
+                .group_by(Task.project_id, Task.status_id)
+            )
+            if project_ids is not None:
+                query = query.where(any_of(Task.project_id, project_ids))
+            result = await session.execute(
+                pg_insert(cls.model)
+                .from_select(["project_id", "status_id", "tasks", "overdue", "last_activity_at"], query)
+                .returning(cls.model.project_id)
             )
-            return project.unique().scalar_one_or_none()
+            return len(result.all())
+
+    @classmethod
+    async def seconds_until_tomorrow(cls) -> float:
+        """Секунды до смены current_date в БД (часовой пояс сессии БД)"""
+        async with cls._session() as session:
+            result = await session.execute(select(
+                func.extract("epoch", cast(func.current_date() + 1, DateTime(timezone=True)) - func.now())
+            ))
+            return float(result.scalar_one())
+
+    @classmethod
+    async def refresh_overdue(cls) -> int:
+        """
+        Пересчет просроченных задач (срок истекает со сменой даты без записи задач) по всем строкам
+        счетчиков: у пар без незавершенных задач просроченных 0. Возврат числа измененных строк
+        """
+        async with cls._session(write=True) as session:
+            counts = (
+                select(
+                    Task.project_id,
+                    Task.status_id,
+                    func.count().filter(Task.due_date < func.current_date()).label("overdue"),
+                )
+                .where(Task.project_id.is_not(None), Task.status_id.not_in(done_statuses()))
+                .group_by(Task.project_id, Task.status_id)
+                .subquery("counts")
+            )
+            stats = aliased(cls.model, name="stats")
+            actual = (
+                select(
+                    stats.project_id,
+                    stats.status_id,
+                    func.coalesce(counts.c.overdue, 0).label("overdue"),
+                )
+                .outerjoin(
+                    counts,
+                    and_(counts.c.project_id == stats.project_id, counts.c.status_id == stats.status_id),
+                )
+                .subquery("actual")
+            )
+            query = (
+                update(cls.model)
+                .where(
+                    cls.model.project_id == actual.c.project_id,
+                    cls.model.status_id == actual.c.status_id,
+                    cls.model.overdue != actual.c.overdue,
+                )
+                .values(overdue=actual.c.overdue)
+                .returning(cls.model.project_id)
+            )
+            result = await session.execute(query)
+            return len(result.all())
+
 
 class ProjectStatusDAO(BaseDAO):
     model = ProjectStatus
@@ -27,22 +258,85 @@ class ProjectStatusDAO(BaseDAO):
 class ProjectMemberDAO(BaseDAO):
     model = ProjectMember
 
+    load_profiles = {
+        # Участники проекта: пользователь с ролью и должностью
+        "users": (
+            joinedload(ProjectMember.user, innerjoin=True).options(
+                joinedload(User.role),
+                joinedload(User.position),
+            ),
+        ),
+        # Проекты пользователя со статусом
+        "projects": (joinedload(ProjectMember.project, innerjoin=True).joinedload(Project.status),),
+    }
+
     @classmethod
     async def get_project_members(cls, project_id: int):
-        async with async_session_maker() as session:
+        async with cls._session() as session:
             project_members = await session.execute(
                 select(ProjectMember)
                 .where(ProjectMember.project_id == project_id)
-                .options(joinedload(ProjectMember.user))
+                .options(*cls._load("users"))
             )
             return project_members.unique().scalars().all()
 
     @classmethod
     async def get_user_projects(cls, user_id: int):
-        async with async_session_maker() as session:
+        async with cls._session() as session:
             project_members = await session.execute(
                 select(ProjectMember)
                 .where(ProjectMember.user_id == user_id)
-                .options(joinedload(ProjectMember.project))
+                .options(*cls._load("projects"))
             )
             return project_members.unique().scalars().all()
+
+    @classmethod
+    async def add_users(cls, project_id: int, user_ids: list[int]) -> list[int]:
+        """Добавление пользователей в проект одним INSERT; участники проекта пропускаются. Возврат добавленных"""
+        async with cls._session(write=True) as session:
+            query = (
+                pg_insert(cls.model)
+                .values([{"project_id": project_id, "user_id": user_id} for user_id in user_ids])
+                .on_conflict_do_nothing(constraint="uq_project_members_project_id_user_id")
+                .returning(cls.model.user_id)
+            )
+            result = await session.execute(query)
+            return result.scalars().all()
+
+    @classmethod
+    async def remove_users(cls, project_id: int, user_ids: list[int]) -> list[int]:
+        """Удаление пользователей из проекта одним DELETE. Возврат удаленных"""
+        async with cls._session(write=True) as session:
+            query = (
+                delete(cls.model)
+                .where(cls.model.project_id == project_id, any_of(cls.model.user_id, user_ids))
+                .returning(cls.model.user_id)
+            )
+            result = await session.execute(query)
+            return result.scalars().all()
+
+    @classmethod
+    async def get_members_of_projects(cls, project_ids: list[int]):
+        """Участники нескольких проектов одним запросом"""
+        async with cls._session() as session:
+            query = (
+                select(cls.model)
+                .where(cls.model.project_id.in_(project_ids))
+                .options(*cls._load("users"))
+                .order_by(cls.model.id)
+            )
+            result = await session.execute(query)
+            return result.unique().scalars().all()
+
+    @classmethod
+    async def get_projects_of_users(cls, user_ids: list[int]):
+        """Проекты нескольких пользователей одним запросом"""
+        async with cls._session() as session:
+            query = (
+                select(cls.model)
+                .where(cls.model.user_id.in_(user_ids))
+                .options(*cls._load("projects"))
+                .order_by(cls.model.id)
+            )
+            result = await session.execute(query)
+            return result.unique().scalars().all()
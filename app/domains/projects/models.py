@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Enum, Index, UniqueConstraint, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 
+from app.base.search import SEARCH_VECTOR
 from app.core.database import Base
 
 
@@ -27,26 +29,61 @@ class Project(Base):
     due_date = Column(Date, nullable=True)
     
     # Внешние ключи
-    status_id = Column(Integer, ForeignKey('project_statuses.id'), nullable=False, default=1)
+    status_id = Column(Integer, ForeignKey('project_statuses.id', name="projects_status_id_fkey"), nullable=False, default=1)
     
     # Связи
     tasks = relationship("Task", back_populates="project")
     status = relationship("ProjectStatus", back_populates="projects", lazy="joined")
     members = relationship("ProjectMember", back_populates="project")
     
+    # Документ полнотекстового поиска (app/base/search.py), поддерживается БД
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR, persisted=True), nullable=True))
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now(), nullable=False)
 
+    # Индексы фильтров и сортировок списка проектов (keyset пагинация по id)
+    __table_args__ = (
+        Index("ix_projects_status_id_id", "status_id", "id"),
+        Index("ix_projects_due_date_id", "due_date", "id"),
+        Index("ix_projects_created_at_id", "created_at", "id"),
+        Index("ix_projects_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
 
 class ProjectMember(Base):
     __tablename__ = "project_members"
 
     # Атрибуты
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete="CASCADE"), nullable=False)
-    project_id = Column(Integer, ForeignKey('projects.id', ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete="CASCADE", name="project_members_user_id_fkey"), nullable=False)
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete="CASCADE", name="project_members_project_id_fkey"), nullable=False)
 
     # Связи
     user = relationship("User", back_populates="assigned_projects")
     project = relationship("Project", back_populates="members")
+
+    # Уникальность участника; индекс по project_id - первая колонка ограничения
+    __table_args__ = (
+        UniqueConstraint("project_id", "user_id", name="uq_project_members_project_id_user_id"),
+        Index("ix_project_members_user_id_project_id", "user_id", "project_id"),
+    )
+
+
+class ProjectTaskStats(Base):
+    """
+    Счетчики задач проекта по статусам: поддерживаются TaskDAO в транзакции записи задачи,
+    пересчитываются командой app.domains.projects.stats
+    """
+    __tablename__ = "project_stats"
+
+    # Атрибуты
+    project_id = Column(
+        Integer, ForeignKey('projects.id', ondelete="CASCADE", name="project_stats_project_id_fkey"), primary_key=True
+    )
+    status_id = Column(Integer, primary_key=True)
+    tasks = Column(Integer, nullable=False, default=0)
+    # Незавершенные задачи с прошедшим сроком; смена даты учитывается периодическим пересчетом
+    overdue = Column(Integer, nullable=False, default=0)
+    last_activity_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
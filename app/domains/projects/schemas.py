@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from datetime import date
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+from typing import Literal
+from app.base.schemas import PageParams
 
 
 class StatusResponse(BaseModel):
@@ -16,6 +18,15 @@ class ProjectResponse(BaseModel):
     status: str
 
 
+class ProjectProgressResponse(ProjectResponse):
+    """Проект с прогрессом задач по счетчикам project_stats"""
+    tasks_total: int = 0
+    tasks_done: int = 0
+    tasks_overdue: int = 0
+    progress: float = Field(default=0.0, description="Доля завершенных задач, 0..1")
+    last_activity_at: datetime | None = None
+
+
 class ProjectCreate(BaseModel):
     title: str
     description: str | None
@@ -29,3 +40,11 @@ class ProjectUpdate(BaseModel):
     start_date: date | None
     due_date: date | None
     status_id: int
+
+
+class ProjectListParams(PageParams):
+    """Фильтры и сортировка списка проектов"""
+    sort: Literal["id", "-id", "created_at", "-created_at", "due_date", "-due_date"] = "id"
+    status_id: int | None = None
+    due_from: date | None = None
+    due_to: date | None = None
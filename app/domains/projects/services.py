@@ -1,7 +1,10 @@
 from fastapi import HTTPException, status
 
+from app.base.reference import ReferenceCache, ReferenceEntry
+
 # DAOs
 from app.domains.projects.dao import ProjectStatusDAO, ProjectDAO, ProjectMemberDAO
+from app.domains.tasks.dao import TaskDAO
 
 # Схемы
 from app.domains.users.schemas import UserDB, UserResponse
@@ -11,8 +14,8 @@ from app.domains.tasks.schemas import TaskResponse
 
 class ProjectService:
     @classmethod
-    async def get_all_statuses(cls):
-        return await ProjectStatusDAO.find_all()
+    async def get_all_statuses(cls) -> ReferenceEntry:
+        return await ReferenceCache.get(ProjectStatusDAO)
     
     @classmethod
     async def get_user_projects(cls, current_user: UserDB):
@@ -68,20 +71,8 @@ class ProjectService:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Вы не являетесь участником проекта"
             )
-        tasks = await ProjectDAO.get_project_tasks(project_id=project_id)
-        tasks = tasks.tasks
-        return [
-            TaskResponse(
-                id=task.id,
-                title=task.title,
-                description=task.description,
-                start_date=task.start_date,
-                due_date=task.due_date,
-                status=task.status.name,
-                priority=task.priority.name
-            )
-            for task in tasks
-        ]
+        tasks = await TaskDAO.get_project_task_rows(project_id)
+        return [TaskResponse.model_validate(task, from_attributes=True) for task in tasks]
         
     @classmethod
     async def get_project_members(cls, project_id: int, current_user: UserDB):
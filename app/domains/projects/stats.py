@@ -0,0 +1,48 @@
+"""
+Обслуживание счетчиков задач проектов (project_stats).
+
+Счетчики изменяются TaskDAO в транзакции записи задачи. Пересчет по таблице задач нужен после
+записи в tasks в обход TaskDAO (SQL, загрузка данных) и при подозрении на расхождение:
+
+    python -m app.domains.projects.stats
+    python -m app.domains.projects.stats --project-id 1 2
+"""
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.domains.projects.dao import ProjectStatsDAO
+
+logger = logging.getLogger(__name__)
+
+# Запас после полуночи БД, секунды: пересчет гарантированно видит новую дату
+ROLLOVER_MARGIN = 1
+
+
+async def run_overdue_refresh() -> None:
+    """
+    Фоновая задача: пересчет просроченных задач (срок истекает без записи задач) сразу после смены
+    даты в БД и не реже раза в PROJECT_STATS_REFRESH_INTERVAL секунд
+    """
+    while True:
+        delay = settings.PROJECT_STATS_REFRESH_INTERVAL
+        try:
+            await ProjectStatsDAO.refresh_overdue()
+            delay = min(delay, await ProjectStatsDAO.seconds_until_tomorrow() + ROLLOVER_MARGIN)
+        except (SQLAlchemyError, OSError):
+            logger.warning("Не удалось пересчитать просроченные задачи проектов", exc_info=True)
+        await asyncio.sleep(delay)
+
+
+async def rebuild(project_ids: list[int] | None = None) -> None:
+    rows = await ProjectStatsDAO.rebuild(project_ids)
+    print(f"Счетчики задач пересчитаны, строк: {rows}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--project-id", type=int, nargs="+", help="Только указанные проекты")
+    asyncio.run(rebuild(parser.parse_args().project_id))
@@ -0,0 +1,90 @@
+from sqlalchemy import Row, String, Float, select, literal, union_all, tuple_
+
+from app.base.dao import BaseDAO
+from app.base.pagination import pack_cursor, unpack_cursor, invalid_cursor
+from app.base.search import search_query, matches, rank
+from app.domains.projects.models import Project, ProjectMember
+from app.domains.tasks.models import Task, TaskAssignment
+
+
+def encode_search_cursor(q: str, row) -> str:
+    """Курсор на результат поиска: запрос, релевантность, вид и id"""
+    return pack_cursor([q, row.rank, row.kind, row.id])
+
+
+def decode_search_cursor(cursor: str, q: str) -> tuple[float, str, int]:
+    try:
+        cursor_q, row_rank, kind, model_id = unpack_cursor(cursor)
+        if cursor_q != q or not isinstance(row_rank, (int, float)) or not isinstance(model_id, int):
+            raise ValueError
+        return float(row_rank), str(kind), model_id
+    except (ValueError, TypeError):
+        raise invalid_cursor()
+
+
+class SearchDAO(BaseDAO):
+    """Полнотекстовый поиск по задачам и проектам (GIN индексы search_vector)"""
+    # Только чтение; модель нужна базовому DAO для сессии
+    model = Task
+
+    @classmethod
+    async def search(
+        cls,
+        q: str,
+        kind: str | None = None,
+        user_id: int | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+    ) -> tuple[list[Row], str | None]:
+        """
+        Страница результатов по убыванию релевантности и курсор следующей страницы.
+        При user_id - только задачи, на которые назначен пользователь, и проекты, в которых он участвует
+        """
+        query = search_query(q)
+        parts = []
+        if kind in (None, "task"):
+            tasks = (
+                select(
+                    literal("task", String).label("kind"),
+                    Task.id,
+                    Task.title,
+                    Task.description,
+                    rank(Task.search_vector, query).label("rank"),
+                )
+                .where(matches(Task.search_vector, query))
+            )
+            if user_id is not None:
+                tasks = tasks.where(Task.id.in_(select(TaskAssignment.task_id).where(TaskAssignment.user_id == user_id)))
+            parts.append(tasks)
+        if kind in (None, "project"):
+            projects = (
+                select(
+                    literal("project", String).label("kind"),
+                    Project.id,
+                    Project.title,
+                    Project.description,
+                    rank(Project.search_vector, query).label("rank"),
+                )
+                .where(matches(Project.search_vector, query))
+            )
+            if user_id is not None:
+                projects = projects.where(
+                    Project.id.in_(select(ProjectMember.project_id).where(ProjectMember.user_id == user_id))
+                )
+            parts.append(projects)
+
+        results = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery("results")
+        # Keyset по (rank, kind, id) в одном направлении: одинаковая релевантность не дает пропусков и повторов
+        key = tuple_(results.c.rank, results.c.kind, results.c.id)
+        page = select(results).order_by(results.c.rank.desc(), results.c.kind.desc(), results.c.id.desc())
+        if cursor is not None:
+            row_rank, row_kind, model_id = decode_search_cursor(cursor, q)
+            page = page.where(key < tuple_(literal(row_rank, Float), literal(row_kind, String), literal(model_id)))
+
+        async with cls._session() as session:
+            result = await session.execute(page.limit(limit + 1))
+            rows = result.all()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_search_cursor(q, rows[-1])
@@ -0,0 +1,24 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.base.schemas import PageParams
+
+
+class SearchParams(PageParams):
+    """Поисковый запрос и постраничный вывод по релевантности"""
+    q: str = Field(
+        min_length=1,
+        max_length=200,
+        description='Слова запроса; поддерживаются "фраза", or и -исключение',
+    )
+    kind: Literal["task", "project"] | None = Field(None, description="Только задачи или только проекты")
+
+
+class SearchResult(BaseModel):
+    """Найденная задача или проект"""
+    kind: Literal["task", "project"]
+    id: int
+    title: str
+    description: str | None
+    rank: float = Field(description="Релевантность: совпадения в названии весят больше, чем в описании")
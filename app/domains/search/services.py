@@ -0,0 +1,26 @@
+# DAOs
+from app.domains.search.dao import SearchDAO
+
+# Схемы
+from app.domains.users.schemas import UserDB
+from app.domains.search.schemas import SearchParams, SearchResult
+from app.base.schemas import Page
+
+
+class SearchService:
+    @classmethod
+    async def search(cls, params: SearchParams, current_user: UserDB) -> Page[SearchResult]:
+        """
+        Менеджер ищет по всем задачам и проектам; сотрудник - как в TaskService и ProjectService,
+        только по назначенным ему задачам и проектам, в которых он участвует
+        """
+        user_id = None if current_user.role.name == "Менеджер" else current_user.id
+        rows, next_cursor = await SearchDAO.search(
+            q=params.q,
+            kind=params.kind,
+            user_id=user_id,
+            cursor=params.cursor,
+            limit=params.limit,
+        )
+        items = [SearchResult.model_validate(row, from_attributes=True) for row in rows]
+        return Page[SearchResult](items=items, next_cursor=next_cursor)
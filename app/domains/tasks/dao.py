@@ -1,29 +1,271 @@
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from datetime import date
 
-from app.core.database import async_session_maker
+from sqlalchemy import Row, select, insert, update, delete, func, and_, not_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import joinedload, contains_eager
 
-from app.base.dao import BaseDAO
+from app.base.dao import BaseDAO, any_of, change_mark
+from app.base.pagination import paginate, split_page
+from app.core.config import settings
 from app.domains.tasks.models import Task, TaskStatus, TaskPriority, TaskAssignment
+from app.domains.projects.dao import ProjectStatsDAO
+from app.domains.projects.models import Project, ProjectStatus
+from app.domains.users.models import User
+
+
+# Проекции задач для списков: только колонки ответа и явные JOIN справочников, без ORM объектов
+TASK_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.start_date,
+    Task.due_date,
+    Task.created_at,
+    TaskStatus.name.label("status"),
+    TaskPriority.name.label("priority"),
+)
+# Колонки задачи, от которых зависят счетчики project_stats
+STATS_COLUMNS = (Task.project_id, Task.status_id, Task.due_date)
+# Колонки проекта задачи с префиксом project_; при задаче без проекта - NULL
+PROJECT_COLUMNS = (
+    Project.id.label("project_id"),
+    Project.title.label("project_title"),
+    Project.description.label("project_description"),
+    Project.start_date.label("project_start_date"),
+    Project.due_date.label("project_due_date"),
+    ProjectStatus.name.label("project_status"),
+)
+
+
+def is_overdue(done_status_ids: list[int]):
+    """Условие просроченной задачи: срок прошел, а статус не завершающий"""
+    return and_(Task.due_date < func.current_date(), not_(any_of(Task.status_id, done_status_ids)))
+
+
+def stats_changes(rows, delta: int) -> list[tuple]:
+    """Изменения счетчиков project_stats по строкам (project_id, status_id, due_date); задачи без проекта не учитываются"""
+    return [(project_id, status_id, due_date, delta) for project_id, status_id, due_date in rows if project_id is not None]
+
+
+def task_rows_query(with_project: bool = False):
+    """Выборка строк задач со статусом и приоритетом, при with_project - и с проектом"""
+    columns = TASK_COLUMNS + PROJECT_COLUMNS if with_project else TASK_COLUMNS
+    query = (
+        select(*columns)
+        .join(TaskStatus, TaskStatus.id == Task.status_id)
+        .join(TaskPriority, TaskPriority.id == Task.priority_id)
+    )
+    if with_project:
+        query = (
+            query
+            .outerjoin(Project, Project.id == Task.project_id)
+            .outerjoin(ProjectStatus, ProjectStatus.id == Project.status_id)
+        )
+    return query
 
 
 class TaskDAO(BaseDAO):
     model = Task
 
+    load_profiles = {
+        # Задача со статусом и приоритетом (списки задач проекта и пользователя, отчёты)
+        "detail": (joinedload(Task.status), joinedload(Task.priority)),
+        # Задача с проектом и статусом проекта
+        "with_project": (
+            joinedload(Task.status),
+            joinedload(Task.priority),
+            joinedload(Task.project).joinedload(Project.status),
+        ),
+    }
+
+    sort_fields = {
+        "id": Task.id,
+        "created_at": Task.created_at,
+        "due_date": Task.due_date,
+    }
+
+    # Запись: счетчики задач проектов изменяются в той же транзакции
+    @classmethod
+    async def create(cls, **data):
+        """Создание задачи и учет ее в счетчиках проекта"""
+        async with cls._session(write=True) as session:
+            result = await session.execute(insert(cls.model).values(**data).returning(*STATS_COLUMNS))
+            await ProjectStatsDAO.apply_changes(session, stats_changes(result.all(), 1))
+
+    @classmethod
+    async def create_many(cls, rows: list[dict]) -> None:
+        """Создание задач порцией и учет их в счетчиках проектов одним запросом"""
+        async with cls._session(write=True) as session:
+            result = await session.execute(insert(cls.model).returning(*STATS_COLUMNS), rows)
+            await ProjectStatsDAO.apply_changes(session, stats_changes(result.all(), 1))
+
+    @classmethod
+    async def update(cls, model_id: int, **data) -> bool:
+        """
+        Обновление задачи одним UPDATE ... FROM: прежние проект, статус и срок берутся из
+        заблокированной строки, счетчик прежнего статуса уменьшается, нового - увеличивается
+        """
+        async with cls._session(write=True) as session:
+            old = select(cls.model.id, *STATS_COLUMNS).where(cls.model.id == model_id).with_for_update().subquery("old")
+            query = (
+                update(cls.model)
+                .where(cls.model.id == old.c.id)
+                .values(**data)
+                .returning(old.c.project_id, old.c.status_id, old.c.due_date, *STATS_COLUMNS)
+            )
+            row = (await session.execute(query)).one_or_none()
+            if row is None:
+                return False
+            await ProjectStatsDAO.apply_changes(session, stats_changes([row[:3]], -1) + stats_changes([row[3:]], 1))
+            return True
+
     @classmethod
-    async def get_tasks_with_project(cls):
-        async with async_session_maker() as session:
-            query = select(cls.model).options(joinedload(cls.model.project))
+    async def delete(cls, model_id: int) -> bool:
+        """Удаление задачи и исключение ее из счетчиков проекта"""
+        async with cls._session(write=True) as session:
+            query = delete(cls.model).where(cls.model.id == model_id).returning(*STATS_COLUMNS)
+            rows = (await session.execute(query)).all()
+            await ProjectStatsDAO.apply_changes(session, stats_changes(rows, -1))
+            return bool(rows)
+
+    @classmethod
+    async def get_task_rows(
+        cls,
+        sort: str = "id",
+        cursor: str | None = None,
+        limit: int = 50,
+        status_id: int | None = None,
+        priority_id: int | None = None,
+        project_id: int | None = None,
+        assignee_id: int | None = None,
+        due_from: date | None = None,
+        due_to: date | None = None,
+    ) -> tuple[list[Row], str | None]:
+        """Страница строк задач с проектами по фильтрам и курсор следующей страницы"""
+        async with cls._session() as session:
+            query = task_rows_query(with_project=True)
+            if status_id is not None:
+                query = query.where(cls.model.status_id == status_id)
+            if priority_id is not None:
+                query = query.where(cls.model.priority_id == priority_id)
+            if project_id is not None:
+                query = query.where(cls.model.project_id == project_id)
+            if assignee_id is not None:
+                query = query.where(cls.model.id.in_(
+                    select(TaskAssignment.task_id).where(TaskAssignment.user_id == assignee_id)
+                ))
+            if due_from is not None:
+                query = query.where(cls.model.due_date >= due_from)
+            if due_to is not None:
+                query = query.where(cls.model.due_date <= due_to)
+            query = paginate(query, cls.sort_fields, cls.model.id, sort, cursor, limit)
             result = await session.execute(query)
-            return result.unique().scalars().all()
+            return split_page(result.all(), sort, limit)
+
+    @classmethod
+    async def get_user_task_rows(cls, user_id: int) -> list[Row]:
+        """Строки задач пользователя с проектами"""
+        async with cls._session() as session:
+            query = (
+                task_rows_query(with_project=True)
+                .join(TaskAssignment, TaskAssignment.task_id == cls.model.id)
+                .where(TaskAssignment.user_id == user_id)
+                .order_by(cls.model.id)
+            )
+            result = await session.execute(query)
+            return result.all()
+
+    @classmethod
+    async def get_project_task_rows(cls, project_id: int) -> list[Row]:
+        """Строки задач проекта"""
+        async with cls._session() as session:
+            query = task_rows_query().where(cls.model.project_id == project_id).order_by(cls.model.id)
+            result = await session.execute(query)
+            return result.all()
+
+    @classmethod
+    async def count_by_status_priority(cls, done_status_ids: list[int]) -> list[Row]:
+        """Число задач и просроченных задач по парам статус-приоритет одним GROUP BY"""
+        async with cls._session() as session:
+            query = (
+                select(
+                    cls.model.status_id,
+                    cls.model.priority_id,
+                    func.count().label("tasks"),
+                    func.count().filter(is_overdue(done_status_ids)).label("overdue"),
+                )
+                .group_by(cls.model.status_id, cls.model.priority_id)
+            )
+            result = await session.execute(query)
+            return result.all()
 
     @classmethod
     async def get_task_with_project(cls, task_id: int):
-        async with async_session_maker() as session:
-            query = select(cls.model).where(cls.model.id == task_id).options(joinedload(cls.model.project))
+        async with cls._session() as session:
+            query = select(cls.model).where(cls.model.id == task_id).options(*cls._load("with_project"))
             result = await session.execute(query)
             return result.unique().scalar_one_or_none()
-           
+
+
+    @classmethod
+    async def get_report_version(cls, task_id: int) -> str | None:
+        """Версия данных отчёта по задаче: задача, ее проект и исполнители; None, если задачи нет"""
+        async with cls._session() as session:
+            query = (
+                select(func.md5(func.concat_ws(
+                    "|",
+                    cls.model.updated_at,
+                    Project.updated_at,
+                    change_mark(
+                        TaskAssignment.id, User.updated_at,
+                        TaskAssignment.task_id == task_id, User.id == TaskAssignment.user_id,
+                    ),
+                )))
+                .outerjoin(Project, Project.id == cls.model.project_id)
+                .where(cls.model.id == task_id)
+            )
+            result = await session.execute(query)
+            return result.scalar_one_or_none()
+
+    @classmethod
+    async def stream_project_tasks(cls, project_id: int, batch_size: int = settings.REPORT_STREAM_BATCH_SIZE, primary: bool = False):
+        """Задачи проекта порциями из курсора БД"""
+        query = (
+            select(cls.model)
+            .where(cls.model.project_id == project_id)
+            .options(*cls._load("detail"))
+            .order_by(cls.model.id)
+        )
+        async for batch in cls._stream(query, batch_size, primary):
+            yield batch
+
+    @classmethod
+    async def stream_user_tasks(cls, user_id: int, batch_size: int = settings.REPORT_STREAM_BATCH_SIZE, primary: bool = False):
+        """Задачи, назначенные пользователю, порциями из курсора БД"""
+        query = (
+            select(cls.model)
+            .join(TaskAssignment, TaskAssignment.task_id == cls.model.id)
+            .where(TaskAssignment.user_id == user_id)
+            .options(*cls._load("detail"))
+            .order_by(cls.model.id)
+        )
+        async for batch in cls._stream(query, batch_size, primary):
+            yield batch
+
+
+    @classmethod
+    async def get_tasks_of_projects(cls, project_ids: list[int]):
+        """Задачи нескольких проектов одним запросом"""
+        async with cls._session() as session:
+            query = (
+                select(cls.model)
+                .where(cls.model.project_id.in_(project_ids))
+                .options(*cls._load("detail"))
+                .order_by(cls.model.id)
+            )
+            result = await session.execute(query)
+            return result.unique().scalars().all()
+
 
 class TaskStatusDAO(BaseDAO):
     model = TaskStatus
@@ -34,16 +276,88 @@ class TaskPriorityDAO(BaseDAO):
 class TaskAssignmentDAO(BaseDAO):
     model = TaskAssignment
 
+    load_profiles = {
+        # Исполнители задачи: пользователь с ролью и должностью
+        "users": (
+            joinedload(TaskAssignment.user, innerjoin=True).options(
+                joinedload(User.role),
+                joinedload(User.position),
+            ),
+        ),
+        # Задачи пользователей с проектами; задача берется из явного JOIN запроса
+        "tasks": (
+            contains_eager(TaskAssignment.task).options(
+                joinedload(Task.status),
+                joinedload(Task.priority),
+                joinedload(Task.project).joinedload(Project.status),
+            ),
+        ),
+    }
+
     @classmethod
     async def get_task_assignments(cls, task_id: int):
-        async with async_session_maker() as session:
-            query = select(cls.model).where(cls.model.task_id == task_id).options(joinedload(cls.model.user))
+        async with cls._session() as session:
+            query = select(cls.model).where(cls.model.task_id == task_id).options(*cls._load("users"))
             result = await session.execute(query)
             return result.unique().scalars().all()
 
     @classmethod
-    async def get_user_tasks(cls, user_id: int):
-        async with async_session_maker() as session:
-            query = select(cls.model).where(cls.model.user_id == user_id).options(joinedload(cls.model.task).joinedload(Task.project))
+    async def add_users(cls, task_id: int, user_ids: list[int]) -> list[int]:
+        """Назначение пользователей на задачу одним INSERT; уже назначенные пропускаются. Возврат назначенных"""
+        async with cls._session(write=True) as session:
+            query = (
+                pg_insert(cls.model)
+                .values([{"task_id": task_id, "user_id": user_id} for user_id in user_ids])
+                .on_conflict_do_nothing(constraint="uq_task_assignments_task_id_user_id")
+                .returning(cls.model.user_id)
+            )
+            result = await session.execute(query)
+            return result.scalars().all()
+
+    @classmethod
+    async def remove_users(cls, task_id: int, user_ids: list[int]) -> list[int]:
+        """Снятие пользователей с задачи одним DELETE. Возврат снятых"""
+        async with cls._session(write=True) as session:
+            query = (
+                delete(cls.model)
+                .where(cls.model.task_id == task_id, any_of(cls.model.user_id, user_ids))
+                .returning(cls.model.user_id)
+            )
+            result = await session.execute(query)
+            return result.scalars().all()
+
+    @classmethod
+    async def count_open_by_user(cls, done_status_ids: list[int]) -> list[Row]:
+        """Число незавершенных и просроченных задач по исполнителям одним GROUP BY"""
+        async with cls._session() as session:
+            query = (
+                select(
+                    User.id,
+                    User.first_name,
+                    User.last_name,
+                    func.count().label("open_tasks"),
+                    func.count().filter(Task.due_date < func.current_date()).label("overdue_tasks"),
+                )
+                .select_from(cls.model)
+                .join(Task, Task.id == cls.model.task_id)
+                .join(User, User.id == cls.model.user_id)
+                .where(not_(any_of(Task.status_id, done_status_ids)))
+                .group_by(User.id)
+                .order_by(func.count().desc(), User.id)
+            )
+            result = await session.execute(query)
+            return result.all()
+
+    @classmethod
+    async def get_tasks_of_users(cls, user_ids: list[int]):
+        """Задачи нескольких пользователей одним запросом"""
+        async with cls._session() as session:
+            query = (
+                select(cls.model)
+                .join(cls.model.task)
+                .where(cls.model.user_id.in_(user_ids))
+                .options(*cls._load("tasks"))
+                .order_by(cls.model.task_id)
+            )
             result = await session.execute(query)
             return result.unique().scalars().all()
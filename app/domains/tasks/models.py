@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Index, UniqueConstraint, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 
+from app.base.search import SEARCH_VECTOR
 from app.core.database import Base
 
 
@@ -27,6 +29,10 @@ class TaskStatus(Base):
     tasks = relationship("Task", back_populates="status")
 
 
+# Название статуса завершенной задачи (начальные данные app/base/data.py)
+TASK_STATUS_DONE = "Завершена"
+
+
 class Task(Base):
     __tablename__ = "tasks"
 
@@ -38,9 +44,9 @@ class Task(Base):
     due_date = Column(Date, nullable=True)
     
     # Внешние ключи
-    project_id = Column(Integer, ForeignKey('projects.id', ondelete="CASCADE"), nullable=True, default=None)
-    status_id = Column(Integer, ForeignKey('task_statuses.id'), nullable=False, default=1)
-    priority_id = Column(Integer, ForeignKey('task_priorities.id'), nullable=False, default=1)
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete="CASCADE", name="tasks_project_id_fkey"), nullable=True, default=None)
+    status_id = Column(Integer, ForeignKey('task_statuses.id', name="tasks_status_id_fkey"), nullable=False, default=1)
+    priority_id = Column(Integer, ForeignKey('task_priorities.id', name="tasks_priority_id_fkey"), nullable=False, default=1)
     
     # Связи
     project = relationship("Project", back_populates="tasks")
@@ -48,19 +54,38 @@ class Task(Base):
     priority = relationship("TaskPriority", back_populates="tasks", lazy="joined")
     assigned_users = relationship("TaskAssignment", back_populates="task")
     
+    # Документ полнотекстового поиска (app/base/search.py), поддерживается БД
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR, persisted=True), nullable=True))
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now(), nullable=False)
 
+    # Индексы фильтров и сортировок списка задач (keyset пагинация по id)
+    __table_args__ = (
+        Index("ix_tasks_status_id_id", "status_id", "id"),
+        Index("ix_tasks_priority_id_id", "priority_id", "id"),
+        Index("ix_tasks_project_id_id", "project_id", "id"),
+        Index("ix_tasks_due_date_id", "due_date", "id"),
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
 
 class TaskAssignment(Base):
     __tablename__ = "task_assignments"
 
     # Атрибуты
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete="CASCADE"), nullable=False)
-    task_id = Column(Integer, ForeignKey('tasks.id', ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete="CASCADE", name="task_assignments_user_id_fkey"), nullable=False)
+    task_id = Column(Integer, ForeignKey('tasks.id', ondelete="CASCADE", name="task_assignments_task_id_fkey"), nullable=False)
 
     # Внешние ключи
     user = relationship("User", back_populates="assigned_tasks")
     task = relationship("Task", back_populates="assigned_users")
+
+    # Уникальность назначения; индекс по task_id - первая колонка ограничения
+    __table_args__ = (
+        UniqueConstraint("task_id", "user_id", name="uq_task_assignments_task_id_user_id"),
+        Index("ix_task_assignments_user_id_task_id", "user_id", "task_id"),
+    )
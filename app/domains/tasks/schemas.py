@@ -1,5 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date
+from typing import Literal
+from app.base.schemas import PageParams
 from app.domains.projects.schemas import ProjectResponse
 
 
@@ -26,6 +28,27 @@ class TaskResponse(BaseModel):
 class TaskResponseWithProject(TaskResponse):
     project: ProjectResponse | None
 
+    @classmethod
+    def from_row(cls, row) -> "TaskResponseWithProject":
+        """Ответ из строки проекции задачи с проектом (колонки проекта с префиксом project_)"""
+        return cls(
+            id=row.id,
+            title=row.title,
+            description=row.description,
+            start_date=row.start_date,
+            due_date=row.due_date,
+            status=row.status,
+            priority=row.priority,
+            project=ProjectResponse(
+                id=row.project_id,
+                title=row.project_title,
+                description=row.project_description,
+                start_date=row.project_start_date,
+                due_date=row.project_due_date,
+                status=row.project_status,
+            ) if row.project_id is not None else None,
+        )
+
 
 class TaskCreate(BaseModel):
     title: str
@@ -34,6 +57,20 @@ class TaskCreate(BaseModel):
     due_date: date | None
 
 
+class TaskImportError(BaseModel):
+    """Ошибки строки файла импорта"""
+    row: int = Field(description="Номер строки файла (первая строка - заголовок)")
+    errors: list[str]
+
+
+class TaskImportResult(BaseModel):
+    """Результат импорта задач"""
+    created: int
+    failed: int
+    errors: list[TaskImportError]
+    errors_truncated: bool = Field(description="В errors попали не все строки с ошибками")
+
+
 class TaskUpdate(BaseModel):
     title: str
     description: str | None
@@ -42,3 +79,14 @@ class TaskUpdate(BaseModel):
     status_id: int
     priority_id: int
     project_id: int | None
+
+
+class TaskListParams(PageParams):
+    """Фильтры и сортировка списка задач"""
+    sort: Literal["id", "-id", "created_at", "-created_at", "due_date", "-due_date"] = "id"
+    status_id: int | None = None
+    priority_id: int | None = None
+    project_id: int | None = None
+    assignee_id: int | None = None
+    due_from: date | None = None
+    due_to: date | None = None
@@ -1,5 +1,7 @@
 from fastapi import HTTPException, status
 
+from app.base.reference import ReferenceCache, ReferenceEntry
+
 # DAOs
 from app.domains.tasks.dao import TaskStatusDAO, TaskPriorityDAO, TaskAssignmentDAO, TaskDAO
 
@@ -12,35 +14,17 @@ from app.base.schemas import MessageResponse
 
 class TaskService:
     @classmethod
-    async def get_all_statuses(cls):
-        return await TaskStatusDAO.find_all()
+    async def get_all_statuses(cls) -> ReferenceEntry:
+        return await ReferenceCache.get(TaskStatusDAO)
 
     @classmethod
-    async def get_all_priorities(cls):
-        return await TaskPriorityDAO.find_all()
+    async def get_all_priorities(cls) -> ReferenceEntry:
+        return await ReferenceCache.get(TaskPriorityDAO)
 
     @classmethod
     async def get_user_tasks(cls, current_user: UserDB):
-        tasks = await TaskAssignmentDAO.get_user_tasks(user_id=current_user.id)
-        return [
-            TaskResponseWithProject(
-                id=task.task.id,
-                title=task.task.title,
-                description=task.task.description,
-                status=task.task.status.name,
-                due_date=task.task.due_date,
-                priority=task.task.priority.name,
-                start_date=task.task.start_date,
-                project=ProjectResponse(
-                        id=task.task.project.id,
-                        title=task.task.project.title,
-                        description=task.task.project.description,
-                        start_date=task.task.project.start_date,
-                        due_date=task.task.project.due_date,
-                        status=task.task.project.status.name,
-                    ) if task.task.project else None,
-            ) for task in tasks
-        ]
+        tasks = await TaskDAO.get_user_task_rows(user_id=current_user.id)
+        return [TaskResponseWithProject.from_row(task) for task in tasks]
     
     @classmethod
     async def get_task(cls, task_id: int, current_user: UserDB):
@@ -109,7 +93,7 @@ class TaskService:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Вы не являетесь участником задачи"
             )
-        if not await TaskStatusDAO.find_by_id(status_id):
+        if not await ReferenceCache.exists(TaskStatusDAO, status_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Статус не найден"
@@ -1,10 +1,66 @@
-from app.base.dao import BaseDAO
+from sqlalchemy import select, func
+from sqlalchemy.orm import joinedload
+
+from app.base.dao import BaseDAO, change_mark
+from app.base.pagination import paginate, split_page
 from app.domains.users.models import User, Role, Position
+from app.domains.projects.models import Project, ProjectMember
+from app.domains.tasks.models import Task, TaskAssignment
 
 
 class UserDAO(BaseDAO):
     model = User
 
+    load_profiles = {
+        # Пользователь с ролью и должностью (списки пользователей)
+        "detail": (joinedload(User.role), joinedload(User.position)),
+    }
+
+    sort_fields = {
+        "id": User.id,
+        "last_name": User.last_name,
+        "created_at": User.created_at,
+    }
+
+    @classmethod
+    async def get_users(
+        cls,
+        sort: str = "id",
+        cursor: str | None = None,
+        limit: int = 50,
+        role_id: int | None = None,
+        position_id: int | None = None,
+    ) -> tuple[list[User], str | None]:
+        """Страница пользователей по фильтрам и курсор следующей страницы"""
+        async with cls._session() as session:
+            query = select(cls.model).options(*cls._load("detail"))
+            if role_id is not None:
+                query = query.where(cls.model.role_id == role_id)
+            if position_id is not None:
+                query = query.where(cls.model.position_id == position_id)
+            query = paginate(query, cls.sort_fields, cls.model.id, sort, cursor, limit)
+            result = await session.execute(query)
+            return split_page(result.unique().scalars().all(), sort, limit)
+
+    @classmethod
+    async def get_report_version(cls, user_id: int) -> str | None:
+        """Версия данных отчёта по пользователю: пользователь, его задачи и проекты; None, если его нет"""
+        async with cls._session() as session:
+            query = select(func.md5(func.concat_ws(
+                "|",
+                cls.model.updated_at,
+                change_mark(
+                    TaskAssignment.id, Task.updated_at,
+                    TaskAssignment.user_id == user_id, Task.id == TaskAssignment.task_id,
+                ),
+                change_mark(
+                    ProjectMember.id, Project.updated_at,
+                    ProjectMember.user_id == user_id, Project.id == ProjectMember.project_id,
+                ),
+            ))).where(cls.model.id == user_id)
+            result = await session.execute(query)
+            return result.scalar_one_or_none()
+
 class RoleDAO(BaseDAO):
     model = Role
 
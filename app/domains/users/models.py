@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -39,8 +39,8 @@ class User(Base):
     patronymic = Column(String, nullable=True)
     
     # Внешние ключи
-    role_id = Column(Integer, ForeignKey('roles.id'), nullable=False, default=1)
-    position_id = Column(Integer, ForeignKey('positions.id', ondelete="SET NULL"), nullable=True)
+    role_id = Column(Integer, ForeignKey('roles.id', name="users_role_id_fkey"), nullable=False, default=1)
+    position_id = Column(Integer, ForeignKey('positions.id', ondelete="SET NULL", name="users_position_id_fkey"), nullable=True)
     
     # Связи
     role = relationship("Role", back_populates="users", lazy="joined")
@@ -51,3 +51,11 @@ class User(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now(), nullable=False)
+
+    # Индексы фильтров и сортировок списка пользователей (keyset пагинация по id)
+    __table_args__ = (
+        Index("ix_users_role_id_id", "role_id", "id"),
+        Index("ix_users_position_id_id", "position_id", "id"),
+        Index("ix_users_last_name_id", "last_name", "id"),
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Literal
+from app.base.schemas import PageParams
 
 
 class RoleResponse(BaseModel):
@@ -53,3 +55,9 @@ class UserUpdate(BaseModel):
     position_id: int | None = None
     role_id: int = 1
 
+
+class UserListParams(PageParams):
+    """Фильтры и сортировка списка пользователей"""
+    sort: Literal["id", "-id", "last_name", "-last_name", "created_at", "-created_at"] = "id"
+    role_id: int | None = None
+    position_id: int | None = None
@@ -1,13 +1,14 @@
+from app.base.reference import ReferenceCache, ReferenceEntry
 from app.domains.users.dao import PositionDAO, RoleDAO
 
 
 
 class UserService:
     @staticmethod
-    async def get_all_positions():
-        return await PositionDAO.find_all()
+    async def get_all_positions() -> ReferenceEntry:
+        return await ReferenceCache.get(PositionDAO)
 
     @staticmethod
-    async def get_all_roles():
-        return await RoleDAO.find_all()
-        
\ No newline at end of file
+    async def get_all_roles() -> ReferenceEntry:
+        return await ReferenceCache.get(RoleDAO)
+        
@@ -1,9 +1,49 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.api.v1 import routers
+from app.api.v1.monitoring import metrics_router
+from app.base.reference import ReferenceCache
+from app.core.security import Security
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware
+from app.core.uow import UnitOfWork, ReadYourWritesMiddleware
+from app.domains.manager.reports.jobs import ReportJobs
+from app.domains.manager.reports.renderer import ReportRenderer
+from app.domains.projects.stats import run_overdue_refresh
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await ReferenceCache.load()
+    except (SQLAlchemyError, OSError):
+        # Справочники загрузятся при первом обращении
+        logger.warning("Не удалось загрузить справочники при старте", exc_info=True)
+    background_tasks = [
+        asyncio.create_task(Security.run_revocation_maintenance()),
+        asyncio.create_task(ReportJobs.run_cleanup()),
+        asyncio.create_task(run_overdue_refresh()),
+    ]
+    background_tasks += [
+        asyncio.create_task(ReportJobs.run_worker()) for _ in range(settings.REPORT_JOB_WORKERS)
+    ]
+    yield
+    for task in background_tasks:
+        task.cancel()
+    ReportRenderer.shutdown()
 
-app = FastAPI()
+
+# Ответы по схемам (аннотации эндпоинтов) сериализует pydantic-core, в байты JSON - orjson
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,5 +53,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Окно чтения из основной БД после записи передается клиенту с ответом
+app.add_middleware(ReadYourWritesMiddleware)
+
+if settings.METRICS_ENABLED:
+    # Внешний слой: время запроса включает CORS и сериализацию ответа
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
 for router in routers:
-    app.include_router(router, prefix="/api/v1")
+    # Одна сессия и одна транзакция БД на запрос
+    app.include_router(router, prefix="/api/v1", dependencies=[Depends(UnitOfWork.begin)])
@@ -0,0 +1,189 @@
+"""
+Нагрузочный прогон API по эндпоинтам.
+
+Реальные роутеры app/api/v1 вызываются через ASGI клиент: каждый сценарий выполняется
+--requests раз при --concurrency одновременных запросах, id задач, проектов и пользователей
+берутся случайно из БД (воспроизводимо при одинаковом --seed). Для каждого эндпоинта выводятся
+пропускная способность, p50/p95/p99 и среднее число SQL запросов на HTTP запрос
+(по метрикам MetricsMiddleware). Результат с коммитом и параметрами прогона - JSON, его можно
+сохранить в --output и сравнить со следующим прогоном через --baseline: при росте p95
+сильнее --max-regression скрипт завершается с кодом 1.
+БД наполняется заранее (python -m benchmarks.seed --reset).
+
+    python -m benchmarks.api_load --requests 500 --concurrency 20 --output before.json
+    python -m benchmarks.api_load --requests 500 --concurrency 20 --baseline before.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from app.core.database import async_session_maker
+from app.core.metrics import RequestMetrics
+from app.domains.projects.models import Project
+from app.domains.tasks.models import Task, TaskAssignment
+from app.domains.users.models import User
+
+from benchmarks.common import make_client, get_token, summarize, timed, dump
+from benchmarks.seed import MANAGER_USERNAME
+
+# Сценарий: имя -> (чей токен, шаблон маршрута, параметры пути из выборки id, query параметры)
+SCENARIOS = {
+    "auth_me": ("manager", "/api/v1/auth/me", {}, None),
+    "reference_statuses": ("manager", "/api/v1/references/task-statuses", {}, None),
+    "manager_tasks": ("manager", "/api/v1/manager/tasks", {}, {"limit": 50}),
+    "manager_tasks_filtered": ("manager", "/api/v1/manager/tasks", {}, {"limit": 50, "status_id": 2, "sort": "-due_date"}),
+    "manager_task": ("manager", "/api/v1/manager/tasks/{task_id}", {"task_id": "tasks"}, None),
+    "manager_task_assignments": ("manager", "/api/v1/manager/tasks/{task_id}/assignments", {"task_id": "tasks"}, None),
+    "manager_projects": ("manager", "/api/v1/manager/projects", {}, {"limit": 50}),
+    "manager_project_tasks": ("manager", "/api/v1/manager/projects/{project_id}/tasks", {"project_id": "projects"}, None),
+    "manager_users": ("manager", "/api/v1/manager/users", {}, {"limit": 50}),
+    "manager_user_tasks": ("manager", "/api/v1/manager/users/{user_id}/tasks", {"user_id": "users"}, None),
+    "manager_dashboard": ("manager", "/api/v1/manager/dashboard", {}, None),
+    "search": ("manager", "/api/v1/search", {}, {"q": "описание задачи", "limit": 50}),
+    "employee_tasks": ("employee", "/api/v1/tasks/", {}, None),
+    "employee_search": ("employee", "/api/v1/search", {}, {"q": "задача", "limit": 50}),
+    "employee_projects": ("employee", "/api/v1/projects/", {}, None),
+    "report_task": ("manager", "/api/v1/manager/reports/tasks/{task_id}", {"task_id": "tasks"}, None),
+    "report_project": ("manager", "/api/v1/manager/reports/projects/{project_id}", {"project_id": "projects"}, None),
+}
+
+
+async def sample_ids(size: int) -> dict:
+    """Случайные id задач, проектов и сотрудников и сотрудник с наибольшим числом задач"""
+    async with async_session_maker() as session:
+        samples = {}
+        for key, column in (("tasks", Task.id), ("projects", Project.id), ("users", User.id)):
+            result = await session.execute(select(column).order_by(func.random()).limit(size))
+            samples[key] = result.scalars().all()
+        result = await session.execute(
+            select(User.username)
+            .join(TaskAssignment, TaskAssignment.user_id == User.id)
+            .group_by(User.id)
+            .order_by(func.count().desc())
+            .limit(1)
+        )
+        samples["employee"] = result.scalar_one_or_none()
+        return samples
+
+
+async def run_scenario(client, name: str, headers: dict, samples: dict, rng: random.Random, args) -> dict:
+    """Прогон одного эндпоинта: задержки, ошибки и SQL запросы на запрос"""
+    _, template, path_params, query = SCENARIOS[name]
+    statements_before = RequestMetrics.statements.totals("GET", template)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, errors = [], 0
+
+    async def request():
+        nonlocal errors
+        path = template.format(**{key: rng.choice(samples[source]) for key, source in path_params.items()})
+        async with semaphore:
+            elapsed, response = await timed(client.get(path, params=query, headers=headers))
+        latencies.append(elapsed)
+        if response.status_code >= 400:
+            errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    count, total = RequestMetrics.statements.totals("GET", template)
+    count, total = count - statements_before[0], total - statements_before[1]
+    return {
+        **summarize(latencies, elapsed, errors),
+        "db_statements_per_request": round(total / count, 2) if count else None,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(result: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Изменение p95 и пропускной способности относительно прошлого прогона; список регрессий"""
+    regressions = []
+    for name, summary in result["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before or not before.get("p95_ms"):
+            continue
+        change = summary["p95_ms"] / before["p95_ms"] - 1
+        summary["p95_change"] = round(change, 3)
+        if before.get("throughput_rps"):
+            summary["throughput_change"] = round(summary["throughput_rps"] / before["throughput_rps"] - 1, 3)
+        if change > max_regression:
+            regressions.append(name)
+    result["baseline_commit"] = baseline.get("meta", {}).get("commit")
+    result["regressions"] = regressions
+    return regressions
+
+
+async def main(args) -> int:
+    names = args.only or list(SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Неизвестные сценарии: {', '.join(sorted(unknown))}")
+
+    rng = random.Random(args.seed)
+    samples = await sample_ids(args.sample)
+    async with make_client() as client:
+        tokens = {"manager": await get_token(client, args.username, args.password)}
+        if samples["employee"] and any(SCENARIOS[name][0] == "employee" for name in names):
+            tokens["employee"] = await get_token(client, samples["employee"], args.password)
+
+        endpoints = {}
+        for name in names:
+            role = SCENARIOS[name][0]
+            if role not in tokens:
+                continue
+            headers = {"Authorization": f"Bearer {tokens[role]}"}
+            # Прогрев: соединения пула, кэши справочников и пользователей
+            for _ in range(args.warmup):
+                await run_scenario(client, name, headers, samples, rng, argparse.Namespace(requests=1, concurrency=1))
+            endpoints[name] = await run_scenario(client, name, headers, samples, rng, args)
+
+    result = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": sys.version.split()[0],
+        },
+        "endpoints": endpoints,
+    }
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(result, json.load(file), args.max_regression)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, ensure_ascii=False, indent=2)
+    dump(result)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--username", default=MANAGER_USERNAME)
+    parser.add_argument("--password", default="bench")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--only", nargs="+", metavar="SCENARIO", help=f"Сценарии из: {', '.join(SCENARIOS)}")
+    parser.add_argument("--sample", type=int, default=200, help="Число случайных id каждого вида")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Допустимый рост p95, доля")
+    sys.exit(asyncio.run(main(parser.parse_args())))
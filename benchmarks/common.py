@@ -0,0 +1,57 @@
+"""Общие функции бенчмарков: ASGI клиент приложения и статистика задержек"""
+import json
+import statistics
+import time
+
+import httpx
+
+from app.main import app
+
+
+def make_client() -> httpx.AsyncClient:
+    """HTTP клиент, который вызывает приложение напрямую через ASGI"""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+
+
+async def get_token(client: httpx.AsyncClient, username: str, password: str) -> str:
+    """Получение токена для авторизованных запросов"""
+    response = await client.post("/api/v1/auth/login", data={"username": username, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Перцентиль q (0..100) методом ближайшего ранга"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: list[float], elapsed: float | None = None, errors: int = 0) -> dict:
+    """Сводка по задержкам в миллисекундах"""
+    summary = {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies, default=0) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+    }
+    if elapsed:
+        summary["throughput_rps"] = round(len(latencies) / elapsed, 2)
+    return summary
+
+
+async def timed(coro) -> tuple[float, object]:
+    """Выполнение запроса с замером времени"""
+    started = time.perf_counter()
+    result = await coro
+    return time.perf_counter() - started, result
+
+
+def dump(result: dict) -> None:
+    """Вывод результата в JSON"""
+    print(json.dumps(result, ensure_ascii=False, indent=2))
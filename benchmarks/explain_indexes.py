@@ -0,0 +1,121 @@
+"""
+Проверка планов запросов: предикаты DAO по внешним ключам должны обслуживаться индексами.
+
+Для каждого запроса выполняется EXPLAIN (FORMAT JSON) с enable_seqscan = off: если подходящий
+индекс есть, планировщик обязан его использовать. Проверка проходит, только если в плане есть
+ожидаемый индекс (Index Name узла) и нет Seq Scan по таблице: индекс первичного ключа с Filter
+вместо пропавшего составного индекса считается ошибкой. Код возврата 1, если хотя бы одна
+проверка не прошла.
+Нужна БД с примененными миграциями, данные не требуются.
+
+    python -m benchmarks.explain_indexes
+"""
+import asyncio
+import sys
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from app.core.database import engine
+from app.domains.auth.models import BlackListToken
+from app.domains.projects.models import Project, ProjectMember
+from app.domains.tasks.dao import task_rows_query
+from app.domains.tasks.models import Task, TaskAssignment
+from app.domains.users.models import User
+
+from benchmarks.common import dump
+
+# Запросы в том виде, в котором их строят DAO, таблица и индексы, один из которых должен быть в плане
+CHECKS = {
+    "TaskDAO.get_user_task_rows": (
+        task_rows_query(with_project=True)
+        .join(TaskAssignment, TaskAssignment.task_id == Task.id)
+        .where(TaskAssignment.user_id == 1)
+        .order_by(Task.id),
+        "task_assignments", ("ix_task_assignments_user_id_task_id",),
+    ),
+    "TaskAssignmentDAO.get_task_assignments": (
+        select(TaskAssignment).where(TaskAssignment.task_id == 1),
+        "task_assignments", ("uq_task_assignments_task_id_user_id",),
+    ),
+    "TaskAssignmentDAO.find_one_or_none(task_id, user_id)": (
+        select(TaskAssignment).filter_by(task_id=1, user_id=1),
+        "task_assignments", ("uq_task_assignments_task_id_user_id", "ix_task_assignments_user_id_task_id"),
+    ),
+    "ProjectMemberDAO.get_project_members": (
+        select(ProjectMember).where(ProjectMember.project_id == 1),
+        "project_members", ("uq_project_members_project_id_user_id",),
+    ),
+    "ProjectMemberDAO.get_user_projects": (
+        select(ProjectMember).where(ProjectMember.user_id == 1),
+        "project_members", ("ix_project_members_user_id_project_id",),
+    ),
+    "ProjectMemberDAO.find_one_or_none(project_id, user_id)": (
+        select(ProjectMember).filter_by(project_id=1, user_id=1),
+        "project_members", ("uq_project_members_project_id_user_id", "ix_project_members_user_id_project_id"),
+    ),
+    "TaskDAO.get_project_task_rows": (
+        task_rows_query().where(Task.project_id == 1).order_by(Task.id),
+        "tasks", ("ix_tasks_project_id_id",),
+    ),
+    "TaskDAO.get_task_rows(status_id)": (
+        task_rows_query(with_project=True).where(Task.status_id == 1).order_by(Task.id).limit(51),
+        "tasks", ("ix_tasks_status_id_id",),
+    ),
+    "TaskDAO.get_task_rows(priority_id)": (
+        task_rows_query(with_project=True).where(Task.priority_id == 1).order_by(Task.id).limit(51),
+        "tasks", ("ix_tasks_priority_id_id",),
+    ),
+    "ProjectDAO.get_projects(status_id)": (
+        select(Project).where(Project.status_id == 1).order_by(Project.id).limit(51),
+        "projects", ("ix_projects_status_id_id",),
+    ),
+    "UserDAO.get_users(position_id)": (
+        select(User).where(User.position_id == 1).order_by(User.id).limit(51),
+        "users", ("ix_users_position_id_id",),
+    ),
+    "BlackListTokenDAO.find_one_or_none(jti)": (
+        select(BlackListToken).filter_by(jti="0" * 32),
+        "blacklist_tokens", ("ix_blacklist_tokens_jti",),
+    ),
+}
+
+
+def scans(plan: dict):
+    """Все узлы плана: (тип узла, таблица, индекс)"""
+    yield plan.get("Node Type"), plan.get("Relation Name"), plan.get("Index Name")
+    for child in plan.get("Plans", []):
+        yield from scans(child)
+
+
+async def explain(connection, query) -> dict:
+    sql = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    result = await connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    return result.scalar_one()[0]["Plan"]
+
+
+async def main() -> int:
+    results, failed = {}, 0
+    async with engine.connect() as connection:
+        await connection.execute(text("SET enable_seqscan = off"))
+        for name, (query, table, expected) in CHECKS.items():
+            nodes = list(scans(await explain(connection, query)))
+            seq_scan = any(node == "Seq Scan" and relation == table for node, relation, _ in nodes)
+            # Индекс по первичному ключу с Filter тоже не Seq Scan: проверяется именно ожидаемый индекс
+            indexes = [index for _, _, index in nodes if index]
+            ok = not seq_scan and any(index in expected for index in indexes)
+            failed += not ok
+            results[name] = {
+                "table": table,
+                "ok": ok,
+                "expected": expected,
+                "indexes": indexes,
+                "nodes": [node for node, _, _ in nodes],
+            }
+    await engine.dispose()
+    dump({"failed": failed, "checks": results})
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,81 @@
+"""
+Задержка посторонних эндпоинтов во время волны логинов.
+
+Во время серии одновременных логинов (хеширование Argon2) последовательно опрашивается
+легкий эндпоинт, сравниваются перцентили его задержки без нагрузки и под нагрузкой.
+Требуется БД с пользователем, под которым выполняется вход.
+
+    python -m benchmarks.login_burst --username admin --password admin --logins 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import make_client, get_token, summarize, timed, dump
+
+
+async def probe(client, path: str, token: str, stop: asyncio.Event, latencies: list[float]) -> None:
+    """Последовательные запросы к эндпоинту до остановки"""
+    headers = {"Authorization": f"Bearer {token}"}
+    while not stop.is_set():
+        elapsed, _ = await timed(client.get(path, headers=headers))
+        latencies.append(elapsed)
+        await asyncio.sleep(0)
+
+
+async def login_storm(client, username: str, password: str, logins: int, concurrency: int) -> tuple[list[float], int]:
+    """Волна логинов с ограничением одновременных запросов"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def login():
+        nonlocal errors
+        async with semaphore:
+            elapsed, response = await timed(
+                client.post("/api/v1/auth/login", data={"username": username, "password": password})
+            )
+            latencies.append(elapsed)
+            if response.status_code != 200:
+                errors += 1
+
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return latencies, errors
+
+
+async def main(args) -> None:
+    async with make_client() as client:
+        token = await get_token(client, args.username, args.password)
+
+        # Без нагрузки
+        stop, baseline = asyncio.Event(), []
+        probe_task = asyncio.create_task(probe(client, args.probe, token, stop, baseline))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        await probe_task
+
+        # Во время волны логинов
+        stop, loaded = asyncio.Event(), []
+        probe_task = asyncio.create_task(probe(client, args.probe, token, stop, loaded))
+        started = time.perf_counter()
+        login_latencies, errors = await login_storm(client, args.username, args.password, args.logins, args.concurrency)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe_task
+
+    dump({
+        "probe": args.probe,
+        "probe_baseline": summarize(baseline),
+        "probe_during_logins": summarize(loaded),
+        "logins": summarize(login_latencies, elapsed, errors),
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--probe", default="/api/v1/auth/me")
+    parser.add_argument("--baseline-seconds", type=float, default=3.0)
+    asyncio.run(main(parser.parse_args()))
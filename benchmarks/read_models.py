@@ -0,0 +1,116 @@
+"""
+Списки задач: загрузка ORM объектов против проекций колонок.
+
+Для каждого сценария оба варианта выполняются --repeat раз: ORM - как эндпоинты читали задачи
+раньше (объекты Task/Project/справочники и ручное копирование в схемы ответа), проекция - текущие
+методы TaskDAO (строки с нужными колонками, сразу в схемы ответа). Выводятся задержки и пик
+памяти Python на один вызов (tracemalloc, отдельным прогоном).
+Нужна БД с большим числом задач и пользователем, назначенным на многие задачи.
+
+    python -m benchmarks.read_models --limit 500 --user-id 1 --repeat 20
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import select
+
+from app.base.pagination import paginate, split_page
+from app.core.database import async_session_maker, engine
+from app.domains.projects.schemas import ProjectResponse
+from app.domains.tasks.dao import TaskDAO, TaskAssignmentDAO
+from app.domains.tasks.models import Task, TaskAssignment
+from app.domains.tasks.schemas import TaskResponseWithProject
+
+from benchmarks.common import summarize, dump
+
+
+def orm_response(task: Task) -> TaskResponseWithProject:
+    return TaskResponseWithProject(
+        id=task.id,
+        title=task.title,
+        description=task.description,
+        start_date=task.start_date,
+        due_date=task.due_date,
+        priority=task.priority.name,
+        status=task.status.name,
+        project=ProjectResponse(
+            id=task.project.id,
+            title=task.project.title,
+            description=task.project.description,
+            start_date=task.project.start_date,
+            due_date=task.project.due_date,
+            status=task.project.status.name,
+        ) if task.project else None
+    )
+
+
+async def orm_page(limit: int) -> list:
+    async with async_session_maker() as session:
+        query = select(Task).options(*TaskDAO._load("with_project"))
+        query = paginate(query, TaskDAO.sort_fields, Task.id, "id", None, limit)
+        result = await session.execute(query)
+        tasks, _ = split_page(result.unique().scalars().all(), "id", limit)
+    return [orm_response(task) for task in tasks]
+
+
+async def projection_page(limit: int) -> list:
+    rows, _ = await TaskDAO.get_task_rows(limit=limit)
+    return [TaskResponseWithProject.from_row(row) for row in rows]
+
+
+async def orm_user_tasks(user_id: int) -> list:
+    async with async_session_maker() as session:
+        query = (
+            select(TaskAssignment)
+            .join(TaskAssignment.task)
+            .where(TaskAssignment.user_id == user_id)
+            .options(*TaskAssignmentDAO._load("tasks"))
+        )
+        result = await session.execute(query)
+        assignments = result.unique().scalars().all()
+    return [orm_response(assignment.task) for assignment in assignments]
+
+
+async def projection_user_tasks(user_id: int) -> list:
+    rows = await TaskDAO.get_user_task_rows(user_id)
+    return [TaskResponseWithProject.from_row(row) for row in rows]
+
+
+async def measure(call, repeat: int) -> dict:
+    """Задержки вызова, число записей и пик памяти одного вызова"""
+    await call()
+    latencies, items = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items = len(await call())
+        latencies.append(time.perf_counter() - started)
+    tracemalloc.start()
+    await call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"items": items, **summarize(latencies), "peak_kib": round(peak / 1024, 1)}
+
+
+async def main(args) -> None:
+    scenarios = {
+        "manager_tasks_page": (lambda: orm_page(args.limit), lambda: projection_page(args.limit)),
+        "user_tasks": (lambda: orm_user_tasks(args.user_id), lambda: projection_user_tasks(args.user_id)),
+    }
+    results = {}
+    for name, (orm, projection) in scenarios.items():
+        results[name] = {
+            "orm": await measure(orm, args.repeat),
+            "projection": await measure(projection, args.repeat),
+        }
+    await engine.dispose()
+    dump(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=500, help="Размер страницы списка задач")
+    parser.add_argument("--user-id", type=int, default=1, help="Пользователь для списка его задач")
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,89 @@
+"""
+Задержка посторонних эндпоинтов во время формирования отчётов.
+
+Запускается серия одновременных скачиваний отчёта и параллельно опрашивается легкий эндпоинт,
+сравниваются перцентили его задержки без нагрузки и во время формирования отчётов.
+В конце выводится состояние очереди отчётов (/monitoring/reports).
+Требуется БД с менеджером и проектом с большим числом задач.
+
+    python -m benchmarks.report_load --username admin --password admin \
+        --report /api/v1/manager/reports/projects/1 --reports 8 --concurrency 4
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import make_client, get_token, summarize, timed, dump
+from benchmarks.login_burst import probe
+
+
+async def download(client, path: str, token: str) -> int:
+    """Скачивание отчёта целиком, размер в байтах"""
+    size = 0
+    async with client.stream("GET", path, headers={"Authorization": f"Bearer {token}"}) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+    return size
+
+
+async def report_storm(client, path: str, token: str, reports: int, concurrency: int) -> tuple[list[float], int, int]:
+    """Серия скачиваний отчёта с ограничением одновременных запросов"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors, size = [], 0, 0
+
+    async def run():
+        nonlocal errors, size
+        async with semaphore:
+            try:
+                elapsed, size = await timed(download(client, path, token))
+                latencies.append(elapsed)
+            except Exception:
+                errors += 1
+
+    await asyncio.gather(*(run() for _ in range(reports)))
+    return latencies, errors, size
+
+
+async def main(args) -> None:
+    async with make_client() as client:
+        token = await get_token(client, args.username, args.password)
+
+        # Без нагрузки
+        stop, baseline = asyncio.Event(), []
+        probe_task = asyncio.create_task(probe(client, args.probe, token, stop, baseline))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        await probe_task
+
+        # Во время формирования отчётов
+        stop, loaded = asyncio.Event(), []
+        probe_task = asyncio.create_task(probe(client, args.probe, token, stop, loaded))
+        started = time.perf_counter()
+        report_latencies, errors, size = await report_storm(client, args.report, token, args.reports, args.concurrency)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe_task
+
+        response = await client.get("/api/v1/monitoring/reports", headers={"Authorization": f"Bearer {token}"})
+        report_stats = response.json()
+
+    dump({
+        "probe": args.probe,
+        "probe_baseline": summarize(baseline),
+        "probe_during_reports": summarize(loaded),
+        "reports": {**summarize(report_latencies, elapsed, errors), "report_bytes": size},
+        "report_queue": report_stats,
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--report", required=True)
+    parser.add_argument("--reports", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--probe", default="/api/v1/auth/me")
+    parser.add_argument("--baseline-seconds", type=float, default=3.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,167 @@
+"""
+Наполнение БД данными для бенчмарков.
+
+Справочники создаются app.base.data.init_data (если их еще нет), затем менеджер bench_manager,
+сотрудники bench_user_N, проекты, задачи, назначения и участники проектов. Объемы задаются
+аргументами, распределение воспроизводимо при одинаковом --seed. Строки вставляются
+порциями многострочных INSERT; у всех пользователей один хеш пароля (Argon2 считается один раз).
+С --reset таблицы данных предварительно очищаются (TRUNCATE ... RESTART IDENTITY).
+Выводит объемы и учетные данные для benchmarks.api_load и остальных бенчмарков.
+
+    python -m benchmarks.seed --reset --users 1000 --projects 200 --tasks 50000 \
+        --assignments-per-task 2 --members-per-project 10
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import insert, select, text
+
+from app.base.data import init_data
+from app.core.database import async_session_maker
+from app.core.security import Security
+from app.domains.projects.dao import ProjectStatsDAO
+from app.domains.projects.models import Project, ProjectMember, ProjectStatus
+from app.domains.tasks.models import Task, TaskAssignment, TaskPriority, TaskStatus
+from app.domains.users.models import Position, Role, User
+
+from benchmarks.common import dump
+
+# Таблицы данных в порядке зависимостей; справочники не очищаются
+DATA_TABLES = ("task_assignments", "project_members", "tasks", "project_stats", "projects", "blacklist_tokens", "users")
+MANAGER_USERNAME = "bench_manager"
+USERNAME_TEMPLATE = "bench_user_{}"
+
+
+async def reference_ids(session, model) -> list[int]:
+    result = await session.execute(select(model.id).order_by(model.id))
+    return result.scalars().all()
+
+
+async def insert_rows(session, model, rows: list[dict], batch_size: int) -> list[int]:
+    """Вставка порциями, id созданных строк в порядке вставки"""
+    ids = []
+    for start in range(0, len(rows), batch_size):
+        result = await session.execute(
+            insert(model).values(rows[start:start + batch_size]).returning(model.id)
+        )
+        ids += result.scalars().all()
+    return ids
+
+
+def pick_pairs(rng: random.Random, owners: list[int], users: list[int], per_owner: int) -> list[tuple[int, int]]:
+    """Различные пользователи для каждой записи-владельца (задачи или проекта)"""
+    per_owner = min(per_owner, len(users))
+    return [(owner, user) for owner in owners for user in rng.sample(users, per_owner)]
+
+
+async def main(args) -> None:
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+
+    async with async_session_maker() as session:
+        if args.reset:
+            await session.execute(text(f"TRUNCATE {', '.join(DATA_TABLES)} RESTART IDENTITY CASCADE"))
+            await session.commit()
+        if not await reference_ids(session, Role):
+            await init_data()
+
+        roles = {role.name: role.id for role in (await session.execute(select(Role))).scalars()}
+        positions = await reference_ids(session, Position)
+        project_statuses = await reference_ids(session, ProjectStatus)
+        task_statuses = await reference_ids(session, TaskStatus)
+        task_priorities = await reference_ids(session, TaskPriority)
+
+        hashed_password = await Security.get_hashed_password(args.password)
+        suffix = (await session.execute(select(User.id).order_by(User.id.desc()).limit(1))).scalar() or 0
+        users = [{
+            "username": MANAGER_USERNAME if not suffix else f"{MANAGER_USERNAME}_{suffix}",
+            "hashed_password": hashed_password,
+            "first_name": "Менеджер",
+            "last_name": "Бенчмарк",
+            "role_id": roles["Менеджер"],
+            "position_id": None,
+        }]
+        users += [{
+            "username": USERNAME_TEMPLATE.format(suffix + number),
+            "hashed_password": hashed_password,
+            "first_name": f"Сотрудник {number}",
+            "last_name": "Бенчмарк",
+            "role_id": roles["Сотрудник"],
+            "position_id": rng.choice(positions),
+        } for number in range(1, args.users + 1)]
+        user_ids = await insert_rows(session, User, users, args.batch_size)
+        manager_id, employee_ids = user_ids[0], user_ids[1:]
+
+        today = date.today()
+        projects = []
+        for number in range(1, args.projects + 1):
+            start = today - timedelta(days=rng.randint(0, 365))
+            projects.append({
+                "title": f"Проект {number}",
+                "description": f"Описание проекта {number}",
+                "start_date": start,
+                "due_date": start + timedelta(days=rng.randint(30, 365)),
+                "status_id": rng.choice(project_statuses),
+            })
+        project_ids = await insert_rows(session, Project, projects, args.batch_size)
+
+        tasks = []
+        for number in range(1, args.tasks + 1):
+            start = today - timedelta(days=rng.randint(0, 180))
+            tasks.append({
+                "title": f"Задача {number}",
+                "description": f"Описание задачи {number}",
+                "start_date": start,
+                "due_date": start + timedelta(days=rng.randint(1, 90)),
+                # Часть задач вне проектов
+                "project_id": rng.choice(project_ids) if project_ids and rng.random() < 0.9 else None,
+                "status_id": rng.choice(task_statuses),
+                "priority_id": rng.choice(task_priorities),
+            })
+        task_ids = await insert_rows(session, Task, tasks, args.batch_size)
+
+        assignments = pick_pairs(rng, task_ids, employee_ids, args.assignments_per_task)
+        await insert_rows(
+            session, TaskAssignment,
+            [{"task_id": task_id, "user_id": user_id} for task_id, user_id in assignments],
+            args.batch_size,
+        )
+        members = pick_pairs(rng, project_ids, employee_ids, args.members_per_project)
+        await insert_rows(
+            session, ProjectMember,
+            [{"project_id": project_id, "user_id": user_id} for project_id, user_id in members],
+            args.batch_size,
+        )
+        await session.commit()
+        # Задачи вставлены в обход TaskDAO: счетчики проектов - пересчетом
+        await ProjectStatsDAO.rebuild()
+        await session.execute(text(f"ANALYZE {', '.join(DATA_TABLES)}"))
+        await session.commit()
+
+    dump({
+        "seconds": round(time.perf_counter() - started, 2),
+        "manager": {"id": manager_id, "username": users[0]["username"], "password": args.password},
+        "employee": {"id": employee_ids[0], "username": users[1]["username"]} if employee_ids else None,
+        "users": len(employee_ids),
+        "projects": len(project_ids),
+        "tasks": len(task_ids),
+        "assignments": len(assignments),
+        "project_members": len(members),
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reset", action="store_true")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=50000)
+    parser.add_argument("--assignments-per-task", type=int, default=2)
+    parser.add_argument("--members-per-project", type=int, default=10)
+    parser.add_argument("--password", default="bench")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,102 @@
+"""
+Сериализация большого списка задач: прежний путь ответа против текущего.
+
+Список из --tasks задач с проектами (Page[TaskResponseWithProject]) отдается тремя эндпоинтами
+тестового приложения, запросы идут через ASGI без сети и БД:
+  - legacy: эндпоинт без модели ответа, jsonable_encoder и стандартный json (как было раньше);
+  - response_model: модель ответа из аннотации, JSON ответ стандартным json;
+  - orjson: модель ответа из аннотации и ORJSONResponse (текущие настройки приложения).
+Для каждого варианта выводятся задержки и процессорное время на запрос.
+
+    python -m benchmarks.serialization --tasks 10000 --repeat 20
+"""
+import argparse
+import asyncio
+import time
+from datetime import date
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.base.schemas import Page
+from app.domains.projects.schemas import ProjectResponse
+from app.domains.tasks.schemas import TaskResponseWithProject
+
+from benchmarks.common import summarize, dump
+
+TaskPage = Page[TaskResponseWithProject]
+
+
+def make_page(tasks: int) -> TaskPage:
+    projects = [
+        ProjectResponse(
+            id=number,
+            title=f"Проект {number}",
+            description="Описание проекта",
+            start_date=date(2024, 1, 1),
+            due_date=date(2024, 12, 31),
+            status="Активен",
+        )
+        for number in range(1, 51)
+    ]
+    items = [
+        TaskResponseWithProject(
+            id=number,
+            title=f"Задача {number}",
+            description="Описание задачи " * 4,
+            start_date=date(2024, 1, 1),
+            due_date=None,
+            status="Новая",
+            priority="Высокий",
+            project=projects[number % len(projects)] if number % 10 else None,
+        )
+        for number in range(1, tasks + 1)
+    ]
+    return TaskPage(items=items, next_cursor="cursor")
+
+
+def make_app(page: TaskPage) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/legacy", response_class=JSONResponse)
+    async def legacy():
+        return page
+
+    @app.get("/response_model", response_class=JSONResponse)
+    async def response_model() -> TaskPage:
+        return page
+
+    @app.get("/orjson", response_class=ORJSONResponse)
+    async def orjson() -> TaskPage:
+        return page
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, repeat: int) -> dict:
+    response = await client.get(path)
+    response.raise_for_status()
+    latencies, cpu_started = [], time.process_time()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await client.get(path)
+        latencies.append(time.perf_counter() - started)
+    cpu = (time.process_time() - cpu_started) / repeat
+    return {"bytes": len(response.content), **summarize(latencies), "cpu_ms": round(cpu * 1000, 2)}
+
+
+async def main(args) -> None:
+    app = make_app(make_page(args.tasks))
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        for variant in ("legacy", "response_model", "orjson"):
+            results[variant] = await measure(client, f"/{variant}", args.repeat)
+    dump(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000, help="Число задач в списке")
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -9,7 +9,7 @@ from app.core.database import Base, DB_URL
 
 from app.domains.auth.models import BlackListToken
 from app.domains.users.models import Role, Position, User
-from app.domains.projects.models import ProjectStatus, Project, ProjectMember
+from app.domains.projects.models import ProjectStatus, Project, ProjectMember, ProjectTaskStats
 from app.domains.tasks.models import TaskPriority, TaskStatus, Task, TaskAssignment
 
 
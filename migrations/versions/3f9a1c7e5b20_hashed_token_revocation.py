@@ -0,0 +1,39 @@
+"""Hashed token revocation
+
+Revision ID: 3f9a1c7e5b20
+Revises: 726b9d85e32b
+Create Date: 2026-10-17 10:12:41.503318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c7e5b20'
+down_revision: Union[str, None] = '726b9d85e32b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('blacklist_tokens', sa.Column('jti', sa.String(length=64), nullable=True))
+    # Токены, выданные до появления jti, отзываются по sha256 от самого токена
+    op.execute("UPDATE blacklist_tokens SET jti = encode(sha256(convert_to(token, 'UTF8')), 'hex')")
+    op.execute("DELETE FROM blacklist_tokens a USING blacklist_tokens b WHERE a.jti = b.jti AND a.id > b.id")
+    op.alter_column('blacklist_tokens', 'jti', nullable=False)
+    op.create_index(op.f('ix_blacklist_tokens_jti'), 'blacklist_tokens', ['jti'], unique=True)
+    op.create_index(op.f('ix_blacklist_tokens_expires_at'), 'blacklist_tokens', ['expires_at'], unique=False)
+    op.drop_column('blacklist_tokens', 'token')
+
+
+def downgrade() -> None:
+    # Исходные токены не восстанавливаются: записи BlackList теряют силу
+    op.add_column('blacklist_tokens', sa.Column('token', sa.String(), nullable=True))
+    op.execute("UPDATE blacklist_tokens SET token = jti")
+    op.alter_column('blacklist_tokens', 'token', nullable=False)
+    op.drop_index(op.f('ix_blacklist_tokens_expires_at'), table_name='blacklist_tokens')
+    op.drop_index(op.f('ix_blacklist_tokens_jti'), table_name='blacklist_tokens')
+    op.drop_column('blacklist_tokens', 'jti')